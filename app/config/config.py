@@ -1,4 +1,5 @@
-from pydantic import AnyUrl
+from typing import Optional
+from pydantic import AnyUrl, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -8,8 +9,84 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     GROQ_API_KEY: str
 
+    # Password hashing: bcrypt work factor, and a dedicated worker pool so login
+    # bursts can't starve the shared threadpool. Requests beyond workers + queue
+    # are rejected with 503. Stored hashes are upgraded on login if ROUNDS changes.
+    BCRYPT_ROUNDS: int = 12
+    BCRYPT_WORKERS: int = 2
+    BCRYPT_MAX_QUEUE: int = 64
+
+    # Compute /tasks/suggestions with GROUP BY / CASE in the database instead of
+    # loading every open task into Python (same tip either way)
+    SUGGESTIONS_IN_SQL: bool = True
+
+    # Max items accepted by POST /tasks/bulk in one request
+    BULK_MAX_ITEMS: int = 500
+    # Rows fetched per round trip by the server-side cursor behind GET /tasks/export
+    EXPORT_CHUNK_SIZE: int = 1000
+    # Rows inserted (and committed) per batch by POST /tasks/import
+    IMPORT_BATCH_SIZE: int = 500
+    # Longest record (characters) POST /tasks/import will hold; longer ones fail and are skipped
+    IMPORT_MAX_RECORD_SIZE: int = 1_000_000
+
+    # Serve the DB-heavy routers from async handlers on an AsyncSession
+    # (asyncpg for Postgres, aiosqlite for SQLite) instead of the threadpool
+    DB_ASYNC: bool = False
+
+    # Responses smaller than this (bytes) are sent uncompressed; routes can
+    # override it with @compression() (see middleware/compression_middleware.py)
+    COMPRESSION_MINIMUM_SIZE: int = 1000
+
+    # Raise instead of logging when a route exceeds its @query_budget (tests)
+    QUERY_BUDGET_ENFORCE: bool = False
+
+    # Statements slower than this (ms) go to the slow-query log (GET /admin/slow-queries),
+    # which keeps the last SLOW_QUERY_LOG_SIZE of them. With SLOW_QUERY_EXPLAIN the plan
+    # of each new statement is captured on a side connection; _ANALYZE (Postgres only)
+    # re-runs read-only statements under EXPLAIN ANALYZE.
+    SLOW_QUERY_MS: int = 200
+    SLOW_QUERY_LOG_SIZE: int = 500
+    SLOW_QUERY_EXPLAIN: bool = False
+    SLOW_QUERY_EXPLAIN_ANALYZE: bool = False
+
+    # Shared secret for the /admin routes (sent as X-Admin-Token); unset disables them
+    ADMIN_TOKEN: Optional[str] = None
+
+    # Sample-profile requests that send "X-Profile: speedscope|pstats" (or ?profile=...),
+    # see middleware/profiling_middleware.py. Off: the middleware isn't installed at all.
+    # With PROFILE_DIR profiles are written there instead of replacing the response.
+    PROFILING_ENABLED: bool = False
+    PROFILE_DIR: Optional[str] = None
+    PROFILE_INTERVAL_MS: float = 1.0
+
+    # tracemalloc snapshots kept by /admin/memory (oldest dropped first), and the
+    # fraction of requests whose peak allocation is recorded while tracing
+    MEMORY_MAX_SNAPSHOTS: int = 10
+    MEMORY_SAMPLE_RATE: float = 0.05
+
+    # Write-invalidated cache of GET /tasks/, /tasks/{id} and /groups/ responses
+    # (0 disables). Off by default: the local backend only sees writes made by its
+    # own process, so with several workers or serverless instances another one's
+    # write leaves it serving stale pages for up to the TTL. Turn it on for a
+    # single-process deployment, or install a shared backend with use_backend().
+    READ_CACHE_MAX_SIZE: int = 0
+    READ_CACHE_TTL_SECONDS: int = 300
+
+    # Authenticated user snapshots cached by get_current_user (0 disables)
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 10000
+    # Verified JWT payloads, each kept until its own "exp" claim
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+
     model_config = SettingsConfigDict(env_file=".env")
 
+    @model_validator(mode="after")
+    def profiling_needs_admin_token(self):
+        # Profiles expose stack samples with server file paths: never to anonymous clients
+        if self.PROFILING_ENABLED and not self.ADMIN_TOKEN:
+            raise ValueError("PROFILING_ENABLED requires ADMIN_TOKEN to be set")
+        return self
+
     @property
     def database_url_str(self) -> str:
         return str(self.DATABASE_URL)
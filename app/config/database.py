@@ -1,24 +1,36 @@
 import os
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.engine import URL, make_url
 from .config import settings
+from ..utils import metrics, query_stats, slow_queries
 
 # 1. Get the URL from settings
 SQLALCHEMY_DATABASE_URL = settings.database_url_str
 
+# Pool limits, shared by both engines (and reported by /db-status)
+POOL_SIZE = 10
+POOL_MAX_OVERFLOW = 20
+
 # 2. Create the Engine
 # Note: Since you are using Neon (Serverless), it's often good to add 
 # pool_pre_ping=True to handle connection drops automatically.
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, 
     pool_pre_ping=True,
-    pool_size=10,  # Maximum number of connections in the pool
-    max_overflow=20,  # Maximum number of connections to overflow beyond pool_size
+    poolclass=metrics.InstrumentedQueuePool,  # a QueuePool that times checkouts for /metrics
+    pool_size=POOL_SIZE,  # Maximum number of connections in the pool
+    max_overflow=POOL_MAX_OVERFLOW,  # Maximum number of connections to overflow beyond pool_size
     pool_timeout=30,  # Maximum time to wait for a connection
     pool_recycle=1800  # Recycle connections after 30 minutes
 )
 
+# Per-request query count / DB time (X-DB-Queries, Server-Timing)
+query_stats.instrument_engine(engine)
+# Statements over SLOW_QUERY_MS, for GET /admin/slow-queries
+slow_queries.instrument_engine(engine)
+
 # 3. Setup the Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -38,6 +50,52 @@ def get_db():
     finally:
         db.close()
 
+# 7. Async engine (only when DB_ASYNC is enabled)
+# The async drivers need their own URL scheme; libpq-only query options
+# (sslmode, channel_binding) are not understood by asyncpg and become connect_args.
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+def make_async_url(url: str):
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+
+    connect_args = {}
+    query = dict(url.query)
+    if backend == "postgresql":
+        sslmode = query.pop("sslmode", None)
+        query.pop("channel_binding", None)
+        if sslmode and sslmode not in ("disable", "allow"):
+            connect_args["ssl"] = "require"
+    return url.set(drivername=ASYNC_DRIVERS[backend], query=query), connect_args
+
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    async_url, async_connect_args = make_async_url(SQLALCHEMY_DATABASE_URL)
+    async_engine = create_async_engine(
+        async_url,
+        connect_args=async_connect_args,
+        pool_pre_ping=True,
+        poolclass=metrics.InstrumentedAsyncQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=POOL_MAX_OVERFLOW,
+        pool_timeout=30,
+        pool_recycle=1800
+    )
+    query_stats.instrument_engine(async_engine.sync_engine)
+    slow_queries.instrument_engine(async_engine.sync_engine)
+    # expire_on_commit=False: async code can't lazy-load expired attributes
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+metrics.pool_gauges({"sync": engine, "async": async_engine})
+
+# 8. Async dependency, used by the *_async routers
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Optional: Immediate connection test on startup (helpful for debugging)
 try:
     with engine.connect() as conn:
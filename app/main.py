@@ -1,5 +1,6 @@
 from importlib import import_module
-from fastapi import FastAPI, Request
+from fastapi import APIRouter, FastAPI, Request
+from .config.config import settings
 from .config.database import engine, Base
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -9,7 +10,11 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 from app.middleware.logging_middleware import LoggingMiddleware
 from app.middleware.authentication_middleware import AuthenticationMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
+from app.middleware.compression_middleware import CompressionMiddleware
+from app.middleware.metrics_middleware import MetricsMiddleware
+from app.middleware.query_stats_middleware import QueryStatsMiddleware
+from app.middleware.profiling_middleware import ProfilingMiddleware
+from app.middleware.memory_middleware import MemoryMiddleware
 import logging
 import os
 
@@ -42,14 +47,44 @@ if os.getenv("ENV", "development") != "production":
     app.add_middleware(LoggingMiddleware)
 app.add_middleware(AuthenticationMiddleware)
 
-# Add GZip middleware
-app.add_middleware(GZipMiddleware, minimum_size=10000)
+# Compress responses with zstd, brotli or gzip, as negotiated
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+# SQL statements per request (X-DB-Queries, Server-Timing) and @query_budget checks
+app.add_middleware(QueryStatsMiddleware, enforce_budgets=settings.QUERY_BUDGET_ENFORCE)
+
+# Per-route peak allocation of sampled requests, while tracemalloc runs (/admin/memory)
+app.add_middleware(MemoryMiddleware)
+
+# On-demand request profiling of everything below MetricsMiddleware
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, profile_dir=settings.PROFILE_DIR, interval=settings.PROFILE_INTERVAL_MS / 1000)
+
+# Added last, so it runs outermost: latency covers every other middleware (exposed at /metrics)
+app.add_middleware(MetricsMiddleware)
 
 # Dynamically include routers
-ROUTER_MODULES = ["auth", "groups", "tasks", "health"]
-for module_name in ROUTER_MODULES:
-    module = import_module(f".routers.{module_name}", package="app")
-    app.include_router(module.router)
+ROUTER_MODULES = ["auth", "groups", "tasks", "health", "metrics", "admin"]
+# Async ports of the DB-heavy routers, used when DB_ASYNC is enabled
+ASYNC_ROUTER_MODULES = {"auth": "auth_async", "groups": "groups_async", "tasks": "tasks_async"}
+
+def with_async_routes(sync_router: APIRouter, async_router: APIRouter) -> APIRouter:
+    # Swap each sync route for its async twin *in place*, so route order (e.g.
+    # /tasks/suggestions before /tasks/{id}) is kept and routes that only exist
+    # in the sync router keep working.
+    async_routes = {(route.path, frozenset(route.methods)): route for route in async_router.routes}
+    routes = [async_routes.pop((route.path, frozenset(route.methods)), route) for route in sync_router.routes]
+    return APIRouter(routes=routes + list(async_routes.values()))
+
+def include_routers(app: FastAPI, async_db: bool = False):
+    for module_name in ROUTER_MODULES:
+        router = import_module(f".routers.{module_name}", package="app").router
+        if async_db and module_name in ASYNC_ROUTER_MODULES:
+            async_module = import_module(f".routers.{ASYNC_ROUTER_MODULES[module_name]}", package="app")
+            router = with_async_routes(router, async_module.router)
+        app.include_router(router)
+
+include_routers(app, async_db=settings.DB_ASYNC)
 
 @app.get("/")
 @limiter.limit("5/minute")
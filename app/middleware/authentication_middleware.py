@@ -1,15 +1,37 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
 from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-class AuthenticationMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # Exclude specific paths from authentication
-        excluded_paths = ["/auth/register", "/auth/login", "/db-status","/","/docs","/redoc","/openapi.json"]
-        if request.url.path in excluded_paths:
-            return await call_next(request)
-
-        # Check for an Authorization header
-        if "Authorization" not in request.headers:
-            return Response("Unauthorized", status_code=401)
-        return await call_next(request)
\ No newline at end of file
+# Paths that can be reached without an Authorization header. Built once at
+# import time; membership is a single hash lookup per request.
+EXCLUDED_PATHS = frozenset({"/auth/register", "/auth/login", "/db-status", "/metrics", "/admin", "/", "/docs", "/redoc", "/openapi.json"})
+# Whole subtrees excluded from the header check (str.startswith accepts a tuple).
+# /admin routes, like /metrics, check X-Admin-Token instead (auth.require_admin).
+# Keep the trailing slash: "/admin" alone would also match /administrators.
+EXCLUDED_PREFIXES: tuple = ("/admin/",)
+
+class AuthenticationMiddleware:
+    """Pure ASGI middleware: rejects requests without an Authorization header.
+
+    Works on the raw scope, so unlike BaseHTTPMiddleware it adds no extra task
+    or memory stream per request and streams response bodies through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, excluded_paths=EXCLUDED_PATHS, excluded_prefixes=EXCLUDED_PREFIXES):
+        self.app = app
+        self.excluded_paths = frozenset(excluded_paths)
+        self.excluded_prefixes = tuple(excluded_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or self.is_excluded(scope["path"]):
+            return await self.app(scope, receive, send)
+
+        # Check for an Authorization header (ASGI header names are lowercase bytes)
+        for name, _ in scope["headers"]:
+            if name == b"authorization":
+                return await self.app(scope, receive, send)
+
+        response = Response("Unauthorized", status_code=401)
+        await response(scope, receive, send)
+
+    def is_excluded(self, path: str) -> bool:
+        return path in self.excluded_paths or (bool(self.excluded_prefixes) and path.startswith(self.excluded_prefixes))
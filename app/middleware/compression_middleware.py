@@ -0,0 +1,282 @@
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# zstd and brotli are optional (pip install zstandard brotli); gzip always works
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# --- Negotiated Response Compression ---
+# Replaces GZipMiddleware. The codec is picked from Accept-Encoding (zstd,
+# then br, then gzip, unless the client's q-values say otherwise). Bodies that
+# are already encoded, not text-like, partial (206) or below the route's
+# minimum size go out untouched, and a buffered body is sent as-is when
+# compressing didn't make it smaller. Streaming responses are compressed
+# chunk by chunk, flushing after each one so the client isn't kept waiting.
+
+
+class Codec(ABC):
+    """One Content-Encoding: a one-shot compress() and a stream() factory.
+
+    A stream has compress(chunk) -> bytes, flush() -> bytes (emit everything
+    so far) and finish() -> bytes (end the encoded stream).
+    """
+    name: str = ""
+    default_level: int = 0
+    max_level: int = 0
+
+    def compress(self, data: bytes, level: int) -> bytes:
+        stream = self.stream(level)
+        return stream.compress(data) + stream.finish()
+
+    @abstractmethod
+    def stream(self, level: int):
+        ...
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._deflate = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._deflate.compress(data)
+
+    def flush(self) -> bytes:
+        return self._deflate.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._deflate.flush()
+
+
+class GzipCodec(Codec):
+    name, default_level, max_level = "gzip", 6, 9
+
+    def stream(self, level):
+        return _GzipStream(level)
+
+
+class _BrotliStream:
+    def __init__(self, level: int):
+        self._brotli = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.process(data)
+
+    def flush(self) -> bytes:
+        return self._brotli.flush()
+
+    def finish(self) -> bytes:
+        return self._brotli.finish()
+
+
+class BrotliCodec(Codec):
+    # Brotli's own default (11) is meant for static assets; 4 is close to gzip's speed
+    name, default_level, max_level = "br", 4, 11
+
+    def compress(self, data, level):
+        return brotli.compress(data, quality=level)
+
+    def stream(self, level):
+        return _BrotliStream(level)
+
+
+@lru_cache(maxsize=None)
+def _zstd_compressor(level: int):
+    # Shared by one-shot compress() calls only: they run to completion on the
+    # event loop thread, so no two ever use it at once
+    return zstandard.ZstdCompressor(level=level)
+
+
+class _ZstdStream:
+    def __init__(self, level: int):
+        # A compressobj keeps state in its compressor, so each stream gets its own
+        self._zstd = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._zstd.compress(data)
+
+    def flush(self) -> bytes:
+        return self._zstd.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._zstd.flush()
+
+
+class ZstdCodec(Codec):
+    name, default_level, max_level = "zstd", 3, 19
+
+    def compress(self, data, level):
+        return _zstd_compressor(level).compress(data)
+
+    def stream(self, level):
+        return _ZstdStream(level)
+
+
+# Preference order when the client accepts several codecs with the same q-value
+CODECS: Dict[str, Codec] = {
+    codec.name: codec for codec, available in [
+        (ZstdCodec(), zstandard is not None),
+        (BrotliCodec(), brotli is not None),
+        (GzipCodec(), True),
+    ] if available
+}
+
+# Content types worth compressing; anything else (images, archives...) is
+# usually compressed already
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", "application/javascript",
+                      "application/xml", "image/svg+xml")
+COMPRESSIBLE_SUFFIXES = ("+json", "+xml")
+
+
+@dataclass(frozen=True)
+class CompressionOptions:
+    """Per-route overrides, attached to an endpoint with @compression()."""
+    enabled: bool = True
+    minimum_size: Optional[int] = None
+    # Codec name -> level, e.g. {"zstd": 1, "gzip": 1}; other codecs keep their default
+    levels: Dict[str, int] = field(default_factory=dict)
+
+
+ENDPOINT_ATTRIBUTE = "__compression__"
+
+def compression(enabled: bool = True, minimum_size: Optional[int] = None, levels: Optional[Dict[str, int]] = None) -> Callable:
+    """Decorator setting the compression options of one route.
+
+    Put it below the @router.get(...) line so the router registers the
+    decorated function.
+    """
+    options = CompressionOptions(enabled, minimum_size, dict(levels or {}))
+
+    def decorator(endpoint):
+        setattr(endpoint, ENDPOINT_ATTRIBUTE, options)
+        return endpoint
+    return decorator
+
+def negotiate(accept_encoding: str, codecs=CODECS) -> Optional[Codec]:
+    """The codec to use for an Accept-Encoding header, or None for identity."""
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name, q = name.strip().lower(), 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            weights[name] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name, codec in codecs.items():  # preference order breaks ties
+        q = weights.get(name, wildcard)
+        if q > best_q:
+            best, best_q = codec, q
+    return best
+
+def is_compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) or content_type.endswith(COMPRESSIBLE_SUFFIXES)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing responses with the negotiated codec.
+
+    minimum_size and levels are the defaults; a route can override them (or
+    opt out) with the @compression() decorator, read from scope["endpoint"]
+    once routing has happened.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1000, levels: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {name: codec.default_level for name, codec in CODECS.items()}
+        self.levels.update(levels or {})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        codec = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        responder = CompressionResponder(self, scope, send, codec)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    """Holds back http.response.start until the first body message shows
+    whether the response is small, whole or streamed."""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, send: Send, codec: Optional[Codec]):
+        self.middleware = middleware
+        self.scope = scope
+        self.downstream = send
+        self.codec = codec
+        self.start: Optional[Message] = None
+        self.passthrough = False
+        self.stream = None
+
+    def options(self) -> CompressionOptions:
+        return getattr(self.scope.get("endpoint"), ENDPOINT_ATTRIBUTE, None) or CompressionOptions()
+
+    async def send(self, message: Message):
+        if self.passthrough:
+            return await self.downstream(message)
+
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            options = self.options()
+            if (not options.enabled or self.scope["method"] == "HEAD" or message["status"] in (204, 206, 304)
+                    or "content-encoding" in headers or not is_compressible(headers)):
+                self.passthrough = True
+                return await self.downstream(message)
+            # Whether we compress or not, the body now depends on Accept-Encoding
+            MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+            self.minimum_size = self.middleware.minimum_size if options.minimum_size is None else options.minimum_size
+            content_length = headers.get("content-length")
+            if self.codec is None or (content_length is not None and int(content_length) < self.minimum_size):
+                self.passthrough = True
+                return await self.downstream(message)
+            self.level = min(options.levels.get(self.codec.name, self.middleware.levels[self.codec.name]), self.codec.max_level)
+            self.start = message
+            return
+
+        if message["type"] != "http.response.body":
+            return await self.downstream(message)
+
+        body, more_body = message.get("body", b""), message.get("more_body", False)
+        if self.stream is None and not more_body:
+            # The whole body in one message
+            return await self.send_whole(body)
+
+        if self.stream is None:
+            self.stream = self.codec.stream(self.level)
+            headers = MutableHeaders(raw=self.start["headers"])
+            headers["Content-Encoding"] = self.codec.name
+            del headers["Content-Length"]
+            await self.downstream(self.start)
+        data = self.stream.compress(body) + (self.stream.flush() if more_body else self.stream.finish())
+        if data or not more_body:
+            await self.downstream({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def send_whole(self, body: bytes):
+        headers = MutableHeaders(raw=self.start["headers"])
+        if len(body) >= self.minimum_size:
+            compressed = self.codec.compress(body, self.level)
+            # Incompressible content (or a payload just over the threshold)
+            # can come out bigger: then identity is the better answer
+            if len(compressed) < len(body):
+                body = compressed
+                headers["Content-Encoding"] = self.codec.name
+        headers["Content-Length"] = str(len(body))
+        await self.downstream(self.start)
+        await self.downstream({"type": "http.response.body", "body": body})
@@ -1,14 +1,30 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import URL
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("middleware")
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        logger.info(f"Request: {request.method} {request.url}")
-        response = await call_next(request)
-        logger.info(f"Response: {response.status_code}")
-        return response
\ No newline at end of file
+class LoggingMiddleware:
+    """Pure ASGI middleware logging each request line and response status.
+
+    The status is read from the http.response.start message as it passes by;
+    body messages are forwarded as-is, so streaming responses stay streaming.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not logger.isEnabledFor(logging.INFO):
+            return await self.app(scope, receive, send)
+
+        logger.info(f"Request: {scope['method']} {URL(scope=scope)}")
+
+        async def send_with_logging(message: Message):
+            if message["type"] == "http.response.start":
+                logger.info(f"Response: {message['status']}")
+            await send(message)
+
+        await self.app(scope, receive, send_with_logging)
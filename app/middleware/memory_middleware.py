@@ -0,0 +1,28 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.utils import memory
+
+# Same label as /metrics for requests that never reached a route
+UNMATCHED = "<unmatched>"
+
+class MemoryMiddleware:
+    """Pure ASGI middleware recording the peak allocation of sampled requests.
+
+    Does nothing unless tracemalloc has been started (POST /admin/memory/start);
+    then MEMORY_SAMPLE_RATE of the requests are measured, one at a time, until
+    their last body chunk is sent, so response buffers count too.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        baseline = memory.begin_sample()
+        if baseline is None:
+            return await self.app(scope, receive, send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = scope.get("route")
+            memory.end_sample(f"{scope['method']} {getattr(route, 'path', UNMATCHED)}", baseline)
@@ -0,0 +1,41 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils import metrics
+
+# Requests that never reached a route (404s, 401s from AuthenticationMiddleware)
+# share one label instead of one series per raw path
+UNMATCHED = "<unmatched>"
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request latency and in-flight requests.
+
+    Latency is labelled with the route *template* (/tasks/{id}, not /tasks/42),
+    read from scope["route"] once the router has matched, so the number of
+    series stays bounded. A request is done when its last body chunk is sent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        status = "500"  # if the app raises before responding
+        metrics.in_flight[""] += 1
+
+        async def send_with_metrics(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            metrics.in_flight[""] -= 1
+            route = scope.get("route")
+            metrics.request_duration.observe(
+                time.perf_counter() - start, scope["method"], getattr(route, "path", UNMATCHED), status
+            )
@@ -0,0 +1,119 @@
+import json
+import logging
+import os
+import re
+import time
+from typing import Optional
+from urllib.parse import parse_qs
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils import auth, profiling
+
+logger = logging.getLogger("middleware")
+
+FORMATS = {
+    "speedscope": ("application/json", ".speedscope.json"),
+    "pstats": ("application/octet-stream", ".prof"),
+}
+DEFAULT_FORMAT = "speedscope"
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware running flagged requests under the sampling profiler.
+
+    Only installed when PROFILING_ENABLED is set. A request opts in with an
+    "X-Profile: speedscope|pstats" header or "?profile=speedscope|pstats",
+    and must carry X-Admin-Token (settings refuse PROFILING_ENABLED without
+    ADMIN_TOKEN); other requests are served normally. The profile covers
+    the middleware inside it (all but MetricsMiddleware), dependencies, the
+    handler and serialization.
+    With a profile_dir it is written there and the normal response goes out
+    with an X-Profile-File header; otherwise the profile *is* the response,
+    as a download, and the original status is in X-Profile-Status.
+    """
+
+    def __init__(self, app: ASGIApp, profile_dir: Optional[str] = None, interval: float = 0.001):
+        self.app = app
+        self.profile_dir = profile_dir
+        self.interval = interval
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        profile_format = self.requested_format(scope)
+        if profile_format is None:
+            return await self.app(scope, receive, send)
+
+        sampler = profiling.try_start(self.interval)
+        if sampler is None:
+            logger.warning(f"Profile of {scope['method']} {scope['path']} skipped: another request is being profiled")
+            return await self.app(scope, receive, send)
+
+        status = 500
+        to_file = bool(self.profile_dir)
+
+        async def send_or_hold(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            if to_file:
+                # Written to disk: the client still gets its normal response
+                if message["type"] == "http.response.start":
+                    message["headers"] = list(message["headers"]) + [(b"x-profile-file", self.path_for(scope, profile_format).encode())]
+                await send(message)
+            # Otherwise the original response is dropped for the profile
+
+        try:
+            await self.app(scope, receive, send_or_hold)
+        finally:
+            profiling.finish(sampler)
+
+        body = self.render(sampler, scope, profile_format)
+        if to_file:
+            with open(self.path_for(scope, profile_format), "wb") as f:
+                f.write(body)
+            return
+        media_type, suffix = FORMATS[profile_format]
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", media_type.encode()),
+                (b"content-length", str(len(body)).encode()),
+                (b"content-disposition", f'attachment; filename="{self.file_name(scope, suffix)}"'.encode()),
+                (b"x-profile-status", str(status).encode()),
+                (b"x-profile-duration-ms", f"{sampler.duration * 1000:.1f}".encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    def requested_format(self, scope: Scope):
+        headers = Headers(scope=scope)
+        value = headers.get("x-profile")
+        if value is None and b"profile=" in scope.get("query_string", b""):
+            value = parse_qs(scope["query_string"].decode("latin-1")).get("profile", [None])[0]
+        if value is None:
+            return None
+        if not auth.is_admin_token(headers.get("x-admin-token")):
+            return None
+        return value if value in FORMATS else DEFAULT_FORMAT
+
+    def render(self, sampler: profiling.Sampler, scope: Scope, profile_format: str) -> bytes:
+        if profile_format == "pstats":
+            return profiling.to_pstats(sampler)
+        return json.dumps(profiling.to_speedscope(sampler, self.label(scope))).encode()
+
+    def label(self, scope: Scope) -> str:
+        route = scope.get("route")
+        return f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+
+    def file_name(self, scope: Scope, suffix: str) -> str:
+        # Stable per request: the stamp is fixed the first time it's asked for
+        if "profile.stamp" not in scope:
+            scope["profile.stamp"] = time.strftime("%Y%m%d-%H%M%S") + f"-{time.time_ns() % 1_000_000:06d}"
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", self.label(scope)).strip("-").lower()
+        return f"{scope['profile.stamp']}-{slug}{suffix}"
+
+    def path_for(self, scope: Scope, profile_format: str) -> str:
+        return os.path.join(self.profile_dir, self.file_name(scope, FORMATS[profile_format][1]))
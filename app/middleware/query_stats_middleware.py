@@ -0,0 +1,48 @@
+import logging
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils import query_stats
+
+logger = logging.getLogger("middleware")
+
+class QueryStatsMiddleware:
+    """Pure ASGI middleware reporting each request's SQL statements.
+
+    Adds X-DB-Queries and a Server-Timing "db" entry (shown in the browser's
+    network panel) to the response. The numbers cover everything up to the
+    response headers; a streamed body's queries happen after them. Routes with
+    a @query_budget are checked at the same point.
+    """
+
+    def __init__(self, app: ASGIApp, enforce_budgets: bool = False):
+        self.app = app
+        self.enforce_budgets = enforce_budgets
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats, token = query_stats.start(scope)
+
+        async def send_with_stats(message: Message):
+            if message["type"] == "http.response.start":
+                self.check_budget(scope, stats)
+                headers = MutableHeaders(raw=message["headers"])
+                headers["X-DB-Queries"] = str(stats.count)
+                queries = "query" if stats.count == 1 else "queries"
+                headers.append("Server-Timing", f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} {queries}"')
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            query_stats.stop(token)
+
+    def check_budget(self, scope: Scope, stats: query_stats.QueryStats):
+        budget = query_stats.budget_for(scope.get("endpoint"))
+        if budget is None or stats.count <= budget:
+            return
+        message = f"{scope['method']} {scope['path']} issued {stats.count} SQL queries (budget {budget})"
+        if self.enforce_budgets:
+            raise query_stats.QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -1,10 +1,11 @@
 from sqlalchemy import (
     Column, Integer, String, Boolean, ForeignKey, 
-    DateTime, Text, UniqueConstraint, event
+    DateTime, Text, UniqueConstraint, Index, event
 )
 from sqlalchemy.orm import relationship, Query, Session
 from sqlalchemy.sql import func, expression
 from ..config.database import Base
+from ..utils import sql  # noqa: F401 (millisecond func.now() on SQLite)
 
 
 class User(Base):
@@ -32,8 +33,15 @@ class Group(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # CONFLICT REMOVED: Name is only unique FOR THE OWNER.
+    # Access path: every listing filters by owner, so index user_id for live rows.
+    # Partial (deleted_at IS NULL) on Postgres/SQLite; a plain index elsewhere.
     __table_args__ = (
         UniqueConstraint('name', 'user_id', name='_user_group_uc'),
+        Index(
+            'ix_groups_user_id_live', 'user_id',
+            postgresql_where=deleted_at.is_(None),
+            sqlite_where=deleted_at.is_(None),
+        ),
     )
 
     owner = relationship("User", back_populates="groups")
@@ -62,8 +70,20 @@ class Task(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Proper Indexing: Title is unique only within a specific group for that user
+    # Access paths: (user, status) for listings/suggestions and (user, group) for
+    # group views. Trailing id keeps keyset pagination an index range scan.
     __table_args__ = (
         UniqueConstraint('title', 'group_id', 'user_id', name='_user_task_group_uc'),
+        Index(
+            'ix_tasks_user_completed_id', 'user_id', 'is_completed', 'id',
+            postgresql_where=deleted_at.is_(None),
+            sqlite_where=deleted_at.is_(None),
+        ),
+        Index(
+            'ix_tasks_user_group_id', 'user_id', 'group_id', 'id',
+            postgresql_where=deleted_at.is_(None),
+            sqlite_where=deleted_at.is_(None),
+        ),
     )
 
     owner = relationship("User", back_populates="tasks")
@@ -0,0 +1,70 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from ..config.config import settings
+from ..utils import auth, memory, slow_queries
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(auth.require_admin)])
+
+@router.get("/slow-queries")
+async def get_slow_queries(limit: int = Query(50, ge=1, le=1000)):
+    return {
+        "threshold_ms": settings.SLOW_QUERY_MS,
+        "by_fingerprint": slow_queries.by_fingerprint(),
+        "recent": slow_queries.recent(limit),
+    }
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries():
+    slow_queries.clear()
+
+# --- Memory (tracemalloc) ---
+# Snapshots and diffs walk every traced allocation, so these are sync routes:
+# the work happens on a threadpool worker, not on the event loop.
+
+def require_tracing():
+    if not memory.is_tracing():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="tracemalloc is not running; POST /admin/memory/start first")
+
+def snapshot_or_404(name: str):
+    snapshot = memory.get_snapshot(name)
+    if snapshot is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No snapshot named '{name}'")
+    return snapshot
+
+@router.get("/memory")
+def memory_status():
+    return memory.status()
+
+@router.post("/memory/start")
+def start_tracing(frames: int = Query(1, ge=1, le=50)):
+    # More frames give fuller tracebacks (group_by=traceback) at a higher cost per allocation
+    memory.start(frames)
+    return memory.status()
+
+@router.post("/memory/stop")
+def stop_tracing():
+    memory.stop()
+    return memory.status()
+
+@router.post("/memory/snapshots/{name}", status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_tracing)])
+def take_snapshot(name: str):
+    return memory.take_snapshot(name)
+
+@router.get("/memory/diff", dependencies=[Depends(require_tracing)])
+def diff_snapshots(
+    base: str,
+    target: Optional[str] = Query(None, description="Snapshot name; omitted compares against a snapshot taken now"),
+    top: int = Query(20, ge=1, le=500),
+    group_by: str = Query("lineno", pattern="^(" + "|".join(memory.GROUP_BY) + ")$"),
+):
+    base_snapshot = snapshot_or_404(base)
+    if target is None:
+        # Not stored: it mustn't replace a snapshot named "now" or push out an older one
+        target_snapshot = memory.current_snapshot()
+    else:
+        target_snapshot = snapshot_or_404(target)
+    return {"base": base, "target": target or "now", **memory.diff(base_snapshot, target_snapshot, top, group_by)}
+
+@router.get("/memory/endpoints")
+def endpoint_peaks():
+    return {"sample_rate": settings.MEMORY_SAMPLE_RATE, "endpoints": memory.endpoint_peaks()}
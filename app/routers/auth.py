@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
@@ -9,36 +10,59 @@ from ..schemas import users as schemas
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Both routes are async so bcrypt can be awaited on its dedicated pool
+# (auth.run_in_hash_pool); the short sync DB calls still use the threadpool.
+# The DB connection is handed back before hashing, so logins queued behind
+# bcrypt don't pin pool connections.
 @router.post("/register", response_model=schemas.User)
-def register(user: schemas.UserCreate, db: Session = Depends(database.get_db)):
+async def register(user: schemas.UserCreate, db: Session = Depends(database.get_db)):
     # VALIDATION: Check for existing email or username
-    if db.query(models.User).filter(models.User.email == user.email).first():
+    def email_taken():
+        existing = db.query(models.User.id).filter(models.User.email == user.email).first()
+        db.rollback()
+        return existing is not None
+    if await run_in_threadpool(email_taken):
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_pwd = auth.get_password_hash(user.password)
+    hashed_pwd = await auth.get_password_hash_async(user.password)
     new_user = models.User(
         username=user.username, 
         email=user.email, 
         password_hash=hashed_pwd
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+
+    def save():
+        db.add(new_user)
+        db.commit()
+        db.refresh(new_user)
+    await run_in_threadpool(save)
     return new_user
 
 @router.post("/login", response_model=schemas.Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
     # FIX: Search by username instead of email, OR check both
-    user = db.query(models.User).filter(
-        (models.User.username == form_data.username) | (models.User.email == form_data.username)
-    ).first()
+    def find_user():
+        row = db.query(models.User.id, models.User.username, models.User.password_hash).filter(
+            (models.User.username == form_data.username) | (models.User.email == form_data.username)
+        ).first()
+        db.rollback()
+        return row
+    user = await run_in_threadpool(find_user)
     
-    if not user or not auth.verify_password(form_data.password, user.password_hash):
+    if not user or not await auth.verify_password_async(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username/email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    # Transparently upgrade the stored hash when BCRYPT_ROUNDS has changed
+    if auth.needs_rehash(user.password_hash):
+        new_hash = await auth.get_password_hash_async(form_data.password)
+        def save_hash():
+            db.query(models.User).filter(models.User.id == user.id).update({"password_hash": new_hash})
+            db.commit()
+        await run_in_threadpool(save_hash)
     
     access_token_expires = timedelta(minutes=config.settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
@@ -48,4 +72,4 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
         data={"sub": user.username}, 
         expires_delta=access_token_expires
     )
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer"}
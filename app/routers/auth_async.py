@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import timedelta
+from ..config import database, config
+from ..utils import auth
+from ..models import model as models
+from ..schemas import users as schemas
+
+# Async port of routers/auth.py, served when DB_ASYNC is enabled.
+router = APIRouter(prefix="/auth", tags=["Authentication"])
+
+@router.post("/register", response_model=schemas.User)
+async def register(user: schemas.UserCreate, db: AsyncSession = Depends(database.get_async_db)):
+    # VALIDATION: Check for existing email or username
+    result = await db.execute(select(models.User.id).where(models.User.email == user.email))
+    existing = result.first()
+    await db.rollback()  # hand the connection back before hashing
+    if existing:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    hashed_pwd = await auth.get_password_hash_async(user.password)
+    new_user = models.User(
+        username=user.username,
+        email=user.email,
+        password_hash=hashed_pwd
+    )
+    db.add(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    return new_user
+
+@router.post("/login", response_model=schemas.Token)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(database.get_async_db)):
+    result = await db.execute(
+        select(models.User.id, models.User.username, models.User.password_hash).where(
+            (models.User.username == form_data.username) | (models.User.email == form_data.username)
+        )
+    )
+    user = result.first()
+    await db.rollback()  # hand the connection back before the bcrypt check
+
+    if not user or not await auth.verify_password_async(form_data.password, user.password_hash):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username/email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # Transparently upgrade the stored hash when BCRYPT_ROUNDS has changed
+    if auth.needs_rehash(user.password_hash):
+        new_hash = await auth.get_password_hash_async(form_data.password)
+        await db.execute(
+            update(models.User).where(models.User.id == user.id).values(password_hash=new_hash)
+        )
+        await db.commit()
+
+    access_token_expires = timedelta(minutes=config.settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = auth.create_access_token(
+        data={"sub": user.username},
+        expires_delta=access_token_expires
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
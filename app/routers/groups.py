@@ -1,28 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from typing import List
 from ..config import database
-from ..utils import auth
+from ..utils import auth, etag, query_stats, read_cache, serialization
 from ..models import model as models
 from ..schemas import groups as schemas
 
 router = APIRouter(prefix="/groups", tags=["Groups"])
 
 @router.post("/", response_model=schemas.Group)
-def create_group(group: schemas.GroupCreate, db: Session = Depends(database.get_db), current_user: models.User = Depends(auth.get_current_user)):
+def create_group(group: schemas.GroupCreate, db: Session = Depends(database.get_db), current_user: auth.CurrentUser = Depends(auth.get_current_user)):
     new_group = models.Group(**group.model_dump(), user_id=current_user.id)
     db.add(new_group)
     db.commit()
     db.refresh(new_group)
     return new_group
 
+def group_rows_query(user_id: int):
+    # Plain rows for the fast read path (see utils/serialization.py)
+    return select(
+        models.Group.name, models.Group.id, models.Group.user_id, models.Group.created_at, models.Group.updated_at
+    ).where(models.Group.user_id == user_id, models.Group.deleted_at.is_(None))
+
+def groups_version_query(user_id: int):
+    return select(
+        func.count(models.Group.id), etag.last_modified(models.Group), func.max(models.Group.id)
+    ).where(models.Group.user_id == user_id, models.Group.deleted_at.is_(None))
+
 @router.get("/", response_model=List[schemas.Group])
-def list_groups(db: Session = Depends(database.get_db), current_user: models.User = Depends(auth.get_current_user)):
+@query_stats.query_budget(3)  # user (on a user-cache miss) + version + rows
+def list_groups(request: Request, db: Session = Depends(database.get_db), current_user: auth.CurrentUser = Depends(auth.get_current_user)):
+    # Cached response, unless the user's groups changed since
+    key = read_cache.page_key(read_cache.GROUPS, current_user.id, "list")
+    if (page := read_cache.lookup(key)) is not None:
+        return read_cache.respond(request, page)
+
+    # Conditional GET: answer 304 before loading the groups
+    tag = etag.weak_etag("groups", current_user.id, *db.execute(groups_version_query(current_user.id)).one())
+    if etag.matches(request, tag):
+        return etag.not_modified(tag)
+
     # ACCESS CONTROL: Users only see their own groups
-    return db.query(models.Group).filter(models.Group.user_id == current_user.id).all()
+    groups = [serialization.row_dict(schemas.Group, row._mapping) for row in db.execute(group_rows_query(current_user.id))]
+    return read_cache.store(key, request, tag, serialization.dump_json(schemas.Group, groups, many=True))
 
 @router.put("/{id}", response_model=schemas.Group)
-def update_group(id: int, group: schemas.GroupCreate, db: Session = Depends(database.get_db), current_user: models.User = Depends(auth.get_current_user)):
+def update_group(id: int, group: schemas.GroupCreate, db: Session = Depends(database.get_db), current_user: auth.CurrentUser = Depends(auth.get_current_user)):
     db_group = db.query(models.Group).filter(models.Group.id == id, models.Group.user_id == current_user.id).first()
     if not db_group:
         raise HTTPException(status_code=404, detail="Group not found")
@@ -33,7 +57,7 @@ def update_group(id: int, group: schemas.GroupCreate, db: Session = Depends(data
     return db_group
 
 @router.delete("/{id}")
-def delete_group(id: int, db: Session = Depends(database.get_db), current_user: models.User = Depends(auth.get_current_user)):
+def delete_group(id: int, db: Session = Depends(database.get_db), current_user: auth.CurrentUser = Depends(auth.get_current_user)):
     group = db.query(models.Group).filter(models.Group.id == id, models.Group.user_id == current_user.id).first()
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
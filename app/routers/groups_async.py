@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from ..config import database
+from ..utils import auth, etag, query_stats, read_cache, serialization
+from ..models import model as models
+from ..schemas import groups as schemas
+from .groups import group_rows_query, groups_version_query
+from .tasks_async import load_group
+
+# Async port of routers/groups.py, served when DB_ASYNC is enabled.
+router = APIRouter(prefix="/groups", tags=["Groups"])
+
+@router.post("/", response_model=schemas.Group)
+async def create_group(group: schemas.GroupCreate, db: AsyncSession = Depends(database.get_async_db), current_user: auth.CurrentUser = Depends(auth.get_current_user_async)):
+    new_group = models.Group(**group.model_dump(), user_id=current_user.id)
+    db.add(new_group)
+    await db.commit()
+    await db.refresh(new_group)
+    return new_group
+
+@router.get("/", response_model=List[schemas.Group])
+@query_stats.query_budget(3)
+async def list_groups(request: Request, db: AsyncSession = Depends(database.get_async_db), current_user: auth.CurrentUser = Depends(auth.get_current_user_async)):
+    key = read_cache.page_key(read_cache.GROUPS, current_user.id, "list")
+    if (page := read_cache.lookup(key)) is not None:
+        return read_cache.respond(request, page)
+
+    version = (await db.execute(groups_version_query(current_user.id))).one()
+    tag = etag.weak_etag("groups", current_user.id, *version)
+    if etag.matches(request, tag):
+        return etag.not_modified(tag)
+
+    # ACCESS CONTROL: Users only see their own groups
+    result = await db.execute(group_rows_query(current_user.id))
+    groups = [serialization.row_dict(schemas.Group, row._mapping) for row in result]
+    return read_cache.store(key, request, tag, serialization.dump_json(schemas.Group, groups, many=True))
+
+@router.put("/{id}", response_model=schemas.Group)
+async def update_group(id: int, group: schemas.GroupCreate, db: AsyncSession = Depends(database.get_async_db), current_user: auth.CurrentUser = Depends(auth.get_current_user_async)):
+    db_group = await load_group(db, id, current_user.id)
+    if not db_group:
+        raise HTTPException(status_code=404, detail="Group not found")
+
+    db_group.name = group.name
+    await db.commit()
+    await db.refresh(db_group)
+    return db_group
+
+@router.delete("/{id}")
+async def delete_group(id: int, db: AsyncSession = Depends(database.get_async_db), current_user: auth.CurrentUser = Depends(auth.get_current_user_async)):
+    group = await load_group(db, id, current_user.id)
+    if not group:
+        raise HTTPException(status_code=404, detail="Group not found")
+
+    await db.delete(group)
+    await db.commit()
+    return {"message": "Group deleted successfully"}
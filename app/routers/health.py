@@ -1,15 +1,40 @@
 from sqlalchemy import text
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from ..config.database import get_db
+from ..config.database import POOL_MAX_OVERFLOW, engine, get_db
+from ..utils import auth, metrics, read_cache
 
 router = APIRouter()
 
+def cache_stats() -> dict:
+    # Hit ratio / evictions of the in-process caches, for dashboards and tuning
+    return {
+        "reads": read_cache.stats(),
+        "users": auth.user_cache.stats(),
+        "tokens": auth.token_cache.stats(),
+    }
+
+def pool_stats() -> dict:
+    # Saturation of the SQLAlchemy pool, as the db_pool_* gauges see it. This
+    # request's own session holds one of the checked-out connections.
+    usage = metrics.pool_usage(engine)
+    if usage is None:
+        return {"class": type(engine.pool).__name__}
+    return {"class": type(engine.pool).__name__, **usage, "max_overflow": POOL_MAX_OVERFLOW}
+
+async def threadpool_stats() -> dict:
+    # Async dependency, so it runs on the event loop where the limiter lives.
+    # Sync routes and dependencies each borrow a token while they run.
+    return metrics.threadpool_usage()
+
 @router.get("/db-status")
-def check_db_status(db: Session = Depends(get_db)):
+def check_db_status(db: Session = Depends(get_db), threadpool: dict = Depends(threadpool_stats)):
     try:
         # Perform a simple query to verify the connection
         db.execute(text("SELECT 1"))
-        return {"status": "connected", "database": "Neon PostgreSQL"}
+        return {
+            "status": "connected", "database": "Neon PostgreSQL", "caches": cache_stats(),
+            "pool": pool_stats(), "threadpool": threadpool,
+        }
     except Exception as e:
         return {"status": "disconnected", "error": str(e)}
\ No newline at end of file
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+from ..utils import auth, metrics
+
+# Route templates, latencies and pool state are operator data: same X-Admin-Token
+# as /admin (Prometheus sends it via the scrape config's http_headers)
+router = APIRouter(dependencies=[Depends(auth.require_admin)])
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    # Async on purpose: the threadpool gauges are read from the event loop, and
+    # a scrape shouldn't itself wait for a threadpool worker
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
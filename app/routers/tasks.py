@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from functools import lru_cache
+from pydantic import ValidationError, create_model
+from sqlalchemy import case, func, or_, select
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
+import re
 from ..config import database, config
-from ..utils import auth
+from ..utils import auth, etag, pagination, query_stats, read_cache, serialization, sql, transfer
+from ..middleware.compression_middleware import compression
 from ..models import model as models
 from ..schemas import tasks as schemas
 
@@ -10,79 +17,142 @@ from ..schemas import tasks as schemas
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
 # --- CATEGORY-BASED HEURISTIC ENGINE ---
+# 1. Scoring Logic
+HIGH_PRIORITY_KEYWORDS = ["finish", "submit", "deadline", "urgent", "important", "review", "bill"]
+# One precompiled alternation scans the text once instead of once per keyword
+HIGH_PRIORITY_PATTERN = re.compile("|".join(map(re.escape, HIGH_PRIORITY_KEYWORDS)))
+# Work/Learning often have higher priority
+PRIORITY_CATEGORIES = frozenset({"Work", "Learning"})
+
+# 2. Category Advice (Based on Seed Data Groups)
+CATEGORY_TIPS = {
+    "Work": "Focus on deep work sessions for your professional projects.",
+    "Personal": "Don't forget to balance your productivity with self-care.",
+    "Fitness": "Physical activity boosts mental clarity. Keep moving!",
+    "Learning": "Consistency is key to mastering new skills. Spend 15 minutes on this today.",
+    "Shopping": "Try to batch your errands to save time and energy."
+}
+
+NO_TASKS_TIP = "Your schedule is clear! It's a great time to start a new project in your 'Learning' group."
+
+def format_suggestion(category_counts: dict, top_title: str) -> str:
+    # Find most crowded category (ties go to the category seen first)
+    dominant_cat = max(category_counts, key=category_counts.get)
+    cat_tip = CATEGORY_TIPS.get(dominant_cat, "Keep up the great work!")
+
+    # Generate the "AI" response
+    return (
+        f"AI Suggestion: Based on your {dominant_cat} focus, {cat_tip} "
+        f"I recommend starting with '{top_title}' as it appears most critical."
+    )
+
 def analyze_tasks_heuristically(tasks: List[models.Task]) -> str:
     if not tasks:
-        return "Your schedule is clear! It's a great time to start a new project in your 'Learning' group."
+        return NO_TASKS_TIP
 
-    # 1. Scoring Logic
-    HIGH_PRIORITY_KEYWORDS = ["finish", "submit", "deadline", "urgent", "important", "review", "bill"]
-    
-    # 2. Category Advice (Based on Seed Data Groups)
-    CATEGORY_TIPS = {
-        "Work": "Focus on deep work sessions for your professional projects.",
-        "Personal": "Don't forget to balance your productivity with self-care.",
-        "Fitness": "Physical activity boosts mental clarity. Keep moving!",
-        "Learning": "Consistency is key to mastering new skills. Spend 15 minutes on this today.",
-        "Shopping": "Try to batch your errands to save time and energy."
-    }
-
-    scored_tasks = []
+    search = HIGH_PRIORITY_PATTERN.search
     category_counts = {}
+    top_title, top_score = None, -1
 
+    # Single pass: score each task and keep a running max instead of sorting
     for task in tasks:
         score = 0
-        # Title/Description weight
-        content = (task.title + " " + (task.description or "")).lower()
-        if any(word in content for word in HIGH_PRIORITY_KEYWORDS):
+        # Title/Description weight. Keywords contain no spaces, so searching
+        # both parts separately matches exactly what "title + ' ' + description" would.
+        if search(task.title.lower()) or (task.description and search(task.description.lower())):
             score += 5
         
-        # Category weight (Work/Learning often have higher priority)
+        # Category weight
         group_name = task.group.name if task.group else "General"
-        if group_name in ["Work", "Learning"]:
+        if group_name in PRIORITY_CATEGORIES:
             score += 2
         
         # Count categories to find dominant focus
         category_counts[group_name] = category_counts.get(group_name, 0) + 1
-        
-        scored_tasks.append({"score": score, "title": task.title, "group": group_name})
 
-    # Sort to find the highest priority task
-    scored_tasks.sort(key=lambda x: x["score"], reverse=True)
-    top_item = scored_tasks[0]
-    
-    # Find most crowded category
-    dominant_cat = max(category_counts, key=category_counts.get)
-    cat_tip = CATEGORY_TIPS.get(dominant_cat, "Keep up the great work!")
+        # Strictly greater keeps the first of equally scored tasks (as the stable sort did)
+        if score > top_score:
+            top_title, top_score = task.title, score
 
-    # Generate the "AI" response
-    return (
-        f"AI Suggestion: Based on your {dominant_cat} focus, {cat_tip} "
-        f"I recommend starting with '{top_item['title']}' as it appears most critical."
+    return format_suggestion(category_counts, top_title)
+
+# --- SQL VERSION OF THE SAME HEURISTIC ---
+# Same scoring, evaluated by the database: only the per-category counts and the
+# single best title come back, instead of every open task with its group.
+def suggestion_queries(user_id: int):
+    open_tasks = (
+        models.Task.user_id == user_id,
+        models.Task.is_completed == False,
+        models.Task.deleted_at.is_(None)
     )
 
+    # Ordered by first task id so ties resolve like the Python version's dict order
+    counts = (
+        select(models.Group.name, func.count(models.Task.id).label("task_count"))
+        .select_from(models.Task)
+        .outerjoin(models.Group, models.Task.group_id == models.Group.id)
+        .where(*open_tasks)
+        .group_by(models.Group.name)
+        .order_by(func.min(models.Task.id))
+    )
+
+    keyword_hit = or_(*(
+        func.lower(column).contains(word, autoescape=True)
+        for column in (models.Task.title, models.Task.description)
+        for word in HIGH_PRIORITY_KEYWORDS
+    ))
+    score = (
+        case((keyword_hit, 5), else_=0)
+        + case((func.coalesce(models.Group.name, "General").in_(PRIORITY_CATEGORIES), 2), else_=0)
+    )
+    top = (
+        select(models.Task.title)
+        .select_from(models.Task)
+        .outerjoin(models.Group, models.Task.group_id == models.Group.id)
+        .where(*open_tasks)
+        .order_by(score.desc(), models.Task.id)
+        .limit(1)
+    )
+    return counts, top
+
+def suggestion_from_rows(count_rows, top_title: Optional[str]):
+    # Returns (tip, active task count) from the suggestion_queries results
+    category_counts = {}
+    for name, task_count in count_rows:
+        name = name or "General"
+        category_counts[name] = category_counts.get(name, 0) + task_count
+    if not category_counts:
+        return NO_TASKS_TIP, 0
+    return format_suggestion(category_counts, top_title), sum(category_counts.values())
+
 @router.get("/suggestions")
-async def get_ai_suggestions(
+@query_stats.query_budget(3)  # user (on a user-cache miss) + counts + top candidates
+def get_ai_suggestions(
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user)
+    current_user: auth.CurrentUser = Depends(auth.get_current_user)
 ):
-    # Requirement: Use JOINs to fetch tasks with group details for the heuristic
-    tasks = db.query(models.Task).options(joinedload(models.Task.group)).filter(
-        models.Task.user_id == current_user.id,
-        models.Task.is_completed == False
-    ).all()
-
-    tip = analyze_tasks_heuristically(tasks)
+    if config.settings.SUGGESTIONS_IN_SQL:
+        counts_query, top_query = suggestion_queries(current_user.id)
+        tip, active_tasks = suggestion_from_rows(db.execute(counts_query).all(), db.execute(top_query).scalar())
+    else:
+        # Requirement: Use JOINs to fetch tasks with group details for the heuristic
+        tasks = db.query(models.Task).options(joinedload(models.Task.group)).filter(
+            models.Task.user_id == current_user.id,
+            models.Task.is_completed == False,
+            models.Task.deleted_at.is_(None)
+        ).order_by(models.Task.id).all()  # ties go to the lowest id, as in the SQL path
+        tip, active_tasks = analyze_tasks_heuristically(tasks), len(tasks)
 
     return {
         "tip": tip,
         "user": current_user.username,
-        "active_tasks": len(tasks),
+        "active_tasks": active_tasks,
         "engine": "Category-Aware Heuristic Stub v2.0"
     }
 
 
 @router.post("/", response_model=schemas.Task, status_code=201)
-def create_task(task: schemas.TaskCreate, db: Session = Depends(database.get_db), current_user: models.User = Depends(auth.get_current_user)):
+def create_task(task: schemas.TaskCreate, db: Session = Depends(database.get_db), current_user: auth.CurrentUser = Depends(auth.get_current_user)):
     # ACCESS CONTROL: Verify the target group actually belongs to the logged-in user
     group = db.query(models.Group).filter(
         models.Group.id == task.group_id, 
@@ -98,42 +168,370 @@ def create_task(task: schemas.TaskCreate, db: Session = Depends(database.get_db)
     db.refresh(new_task)
     return new_task
 
+def require_upserts(db: Session = Depends(database.get_db)):
+    # /bulk and /import write with ON CONFLICT; on another database only they are
+    # unavailable, checked before anything is read or written
+    if not sql.supports_upsert(db):
+        raise HTTPException(
+            status_code=501,
+            detail=f"Bulk writes are not supported on '{db.get_bind().dialect.name}' databases",
+        )
+
+@router.post("/bulk", response_model=schemas.TaskBulkResult, dependencies=[Depends(require_upserts)])
+@query_stats.query_budget(5)  # the same for 1 item or BULK_MAX_ITEMS
+def bulk_create_tasks(payload: schemas.TaskBulkCreate, db: Session = Depends(database.get_db), current_user: auth.CurrentUser = Depends(auth.get_current_user)):
+    errors = []
+
+    # 1. Validate every item on its own so one bad row doesn't reject the batch
+    valid = []
+    for index, item in enumerate(payload.items):
+        try:
+            valid.append((index, schemas.TaskCreate.model_validate(item)))
+        except ValidationError as e:
+            error = e.errors()[0]
+            location = ".".join(str(part) for part in error["loc"])
+            errors.append(schemas.TaskBulkError(index=index, detail=f"{location}: {error['msg']}" if location else error["msg"]))
+
+    # 2. ACCESS CONTROL: one query for every referenced group. Loading the Group
+    # rows also lets each returned task resolve .group from the identity map.
+    group_ids = {task.group_id for _, task in valid}
+    owned = set(db.scalars(select(models.Group).where(
+        models.Group.id.in_(group_ids),
+        models.Group.user_id == current_user.id
+    )))
+    owned_ids = {group.id for group in owned}
+
+    rows, positions = [], {}
+    for index, task in valid:
+        key = (task.title, task.group_id)
+        if task.group_id not in owned_ids:
+            errors.append(schemas.TaskBulkError(index=index, detail="Group not found or access denied"))
+        elif key in positions:
+            # ON CONFLICT can't touch the same row twice in one statement
+            errors.append(schemas.TaskBulkError(index=index, detail=f"Duplicate of item {positions[key]} in this request"))
+        else:
+            positions[key] = index
+            rows.append({**task.model_dump(), "user_id": current_user.id})
+
+    # 3. One multi-row INSERT ... ON CONFLICT ... RETURNING for the whole batch
+    written = []
+    if rows:
+        insert = sql.upsert_insert(db, models.Task).values(rows)
+        conflict_target = [models.Task.title, models.Task.group_id, models.Task.user_id]  # _user_task_group_uc
+        if payload.upsert:
+            insert = insert.on_conflict_do_update(
+                index_elements=conflict_target,
+                set_={
+                    "description": insert.excluded.description,
+                    "is_completed": insert.excluded.is_completed,
+                    "updated_at": func.now(),
+                }
+            )
+        else:
+            insert = insert.on_conflict_do_nothing(index_elements=conflict_target)
+        written = db.scalars(
+            insert.returning(models.Task),
+            execution_options={"populate_existing": True, "invalidate_user": current_user.id}
+        ).all()
+        # Render before committing: the commit expires every returned task, and
+        # reading them back afterwards would cost a SELECT per task
+        written = [schemas.Task.model_validate(task) for task in written]
+        db.commit()
+
+    # Rows skipped by ON CONFLICT DO NOTHING are simply missing from RETURNING
+    by_key = {(task.title, task.group_id): task for task in written}
+    for key, index in positions.items():
+        if key not in by_key:
+            errors.append(schemas.TaskBulkError(index=index, detail="A task with this title already exists in the group"))
+
+    return {
+        "tasks": [by_key[key] for key in sorted(by_key, key=positions.get)],
+        "errors": sorted(errors, key=lambda error: error.index),
+    }
+
+# --- STREAMING IMPORT ---
+DEFAULT_IMPORT_GROUP = "Inbox"
+IMPORT_ERROR_LIMIT = 100  # Failed records reported back in detail
+
+def resolve_import_groups(db: Session, user_id: int, names: set, groups: dict):
+    # Create the groups we haven't seen yet; ON CONFLICT (_user_group_uc) keeps
+    # existing ones, then one SELECT maps every name to its id
+    missing = names - groups.keys()
+    if not missing:
+        return
+    db.execute(
+        sql.upsert_insert(db, models.Group)
+        .values([{"name": name, "user_id": user_id} for name in missing])
+        .on_conflict_do_nothing(index_elements=[models.Group.name, models.Group.user_id]),
+        execution_options={"invalidate_user": user_id}
+    )
+    groups.update(db.execute(
+        select(models.Group.name, models.Group.id).where(
+            models.Group.user_id == user_id,
+            models.Group.name.in_(missing)
+        )
+    ).all())
+
+def import_batch(db: Session, user_id: int, batch: list, groups: dict, result: schemas.TaskImportResult):
+    def fail(index, detail):
+        result.failed += 1
+        if len(result.errors) < IMPORT_ERROR_LIMIT:
+            result.errors.append(schemas.TaskBulkError(index=index, detail=detail))
+
+    named = []
+    for index, record, error in batch:
+        if error:
+            fail(index, error)
+            continue
+        name = str(record.get("group") or DEFAULT_IMPORT_GROUP).strip()
+        if not 0 < len(name) <= 100:
+            fail(index, "group: Group name must be 1-100 characters")
+            continue
+        named.append((index, record, name))
+    resolve_import_groups(db, user_id, {name for _, _, name in named}, groups)
+
+    rows = []
+    for index, record, name in named:
+        # Ids from another account (e.g. an export's group_id) are ignored
+        try:
+            task = schemas.TaskCreate.model_validate({**record, "group_id": groups[name]})
+        except ValidationError as e:
+            error = e.errors()[0]
+            fail(index, f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}")
+            continue
+        rows.append({**task.model_dump(), "user_id": user_id})
+
+    if rows:
+        # Existing titles (and repeats within the batch) are skipped, not errors
+        inserted = db.execute(
+            sql.upsert_insert(db, models.Task).values(rows)
+            .on_conflict_do_nothing(index_elements=[models.Task.title, models.Task.group_id, models.Task.user_id])
+            .returning(models.Task.id),
+            execution_options={"invalidate_user": user_id}
+        ).all()
+        result.inserted += len(inserted)
+        result.skipped += len(rows) - len(inserted)
+    db.commit()
+
+@router.post("/import", response_model=schemas.TaskImportResult, dependencies=[Depends(require_upserts)])
+async def import_tasks(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$", description="ndjson or csv (defaults from Content-Type)"),
+    db: Session = Depends(database.get_db),
+    current_user: auth.CurrentUser = Depends(auth.get_current_user)
+):
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+
+    # The body is parsed as it arrives and written in fixed-size batches, one
+    # commit each, so neither the body nor the rows are ever held in full
+    reader = transfer.RecordReader(format, max_record_size=config.settings.IMPORT_MAX_RECORD_SIZE)
+    result = schemas.TaskImportResult()
+    groups, batch = {}, []
+    batch_size = config.settings.IMPORT_BATCH_SIZE
+    try:
+        async for chunk in request.stream():
+            batch += reader.feed(chunk)
+            while len(batch) >= batch_size:
+                await run_in_threadpool(import_batch, db, current_user.id, batch[:batch_size], groups, result)
+                batch = batch[batch_size:]
+        batch += reader.feed(b"", final=True)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Request body must be UTF-8 encoded")
+    if batch:
+        await run_in_threadpool(import_batch, db, current_user.id, batch, groups, result)
+    return result
+
+# --- CONDITIONAL GET ---
+def task_filters(user_id: int, group_id: Optional[int] = None, completed: Optional[bool] = None) -> list:
+    # Shared by the listing and its version query so both see the same rows
+    criteria = [models.Task.user_id == user_id, models.Task.deleted_at.is_(None)]
+    if group_id:
+        criteria.append(models.Task.group_id == group_id)
+    if completed is not None:
+        criteria.append(models.Task.is_completed == completed)
+    return criteria
+
+def tasks_version_query(user_id: int, criteria: list):
+    # Listed tasks embed their group's name, so a group rename is a change too
+    groups_modified = select(etag.last_modified(models.Group)).where(
+        models.Group.user_id == user_id
+    ).scalar_subquery()
+    return select(
+        func.count(models.Task.id), etag.last_modified(models.Task), func.max(models.Task.id), groups_modified
+    ).where(*criteria)
+
+def task_version_query(id: int, user_id: int):
+    return select(
+        models.Task.created_at, models.Task.updated_at, models.Group.updated_at
+    ).join(models.Task.group).where(models.Task.id == id, models.Task.user_id == user_id)
+
+# --- SPARSE FIELDSETS ---
+# ?fields=id,title,is_completed selects only those columns and ?include=group
+# embeds the group (the only relation, and the only join). Without ?fields
+# every field is returned, group included, as before.
+TASK_FIELDS = tuple(schemas.Task.model_fields)
+TASK_INCLUDES = ("group",)
+TASK_COLUMN_FIELDS = tuple(name for name in TASK_FIELDS if name not in TASK_INCLUDES)
+
+def split_names(value: str, allowed: tuple, param: str) -> set:
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = names.difference(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown {param}: {', '.join(sorted(unknown))} (allowed: {', '.join(allowed)})"
+        )
+    return names
+
+def task_fieldset(
+    fields: Optional[str] = Query(None, description="Comma-separated task fields to return, e.g. id,title,is_completed"),
+    include: Optional[str] = Query(None, description="Related objects to embed: group")
+) -> tuple:
+    # Field names in schema order, so equal fieldsets share one schema and cache key
+    selected = set(TASK_FIELDS) if fields is None else split_names(fields, TASK_FIELDS, "fields")
+    if include is not None:
+        selected |= split_names(include, TASK_INCLUDES, "include")
+    if not selected:
+        # ?fields= (or only commas) would return a list of empty objects
+        raise HTTPException(status_code=400, detail=f"fields must name at least one of: {', '.join(TASK_FIELDS)}")
+    return tuple(name for name in TASK_FIELDS if name in selected)
+
+@lru_cache(maxsize=None)
+def task_schema(fieldset: tuple) -> type:
+    # Trimmed copy of schemas.Task with just these fields, built once per fieldset
+    if fieldset == TASK_FIELDS:
+        return schemas.Task
+    return create_model(
+        f"Task[{','.join(fieldset)}]",
+        **{name: (schemas.Task.model_fields[name].annotation, schemas.Task.model_fields[name]) for name in fieldset}
+    )
+
+# --- FAST READ PATH (see utils/serialization.py) ---
+def task_rows_query(criteria: list, fieldset: tuple = TASK_FIELDS):
+    # Only the requested columns, as plain rows: no ORM identity map, no lazy
+    # loads. id is always selected for the keyset cursor; the group join only
+    # happens when the group is wanted (every task has one, so an inner join).
+    columns = [getattr(models.Task, name) for name in fieldset if name in TASK_COLUMN_FIELDS]
+    if "id" not in fieldset:
+        columns.append(models.Task.id)
+    stmt = select(*columns).where(*criteria)
+    if "group" in fieldset:
+        stmt = stmt.add_columns(models.Group.name.label("group_name")).join(models.Task.group)
+    return stmt
+
+def task_from_row(row, schema: type = schemas.Task) -> dict:
+    # No validation: the values were validated on the way in
+    if "group" in schema.model_fields:
+        return serialization.row_dict(schema, row._mapping, group={"name": row.group_name})
+    return serialization.row_dict(schema, row._mapping)
+
 @router.get("/", response_model=List[schemas.Task])
+@query_stats.query_budget(3)  # user (on a user-cache miss) + version + one page, whatever its size
 def get_tasks(
+    request: Request,
+    response: Response,
     # Pagination parameters with defaults
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(10, ge=1, le=100, description="Max number of items to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's Link / X-Next-Cursor header"),
     group_id: Optional[int] = None, 
     completed: Optional[bool] = None,
+    fieldset: tuple = Depends(task_fieldset),
     db: Session = Depends(database.get_db), 
-    current_user: models.User = Depends(auth.get_current_user)
+    current_user: auth.CurrentUser = Depends(auth.get_current_user)
 ):
-    # 1. Start the query with joins
-    query = db.query(models.Task).options(joinedload(models.Task.group)).filter(models.Task.user_id == current_user.id)
-    
-    # 2. Apply Filters
-    if group_id:
-        query = query.filter(models.Task.group_id == group_id)
-    if completed is not None:
-        query = query.filter(models.Task.is_completed == completed)
-    
-    # 3. Apply Pagination and Execute
-    # .offset() skips the first X rows, .limit() takes the next Y rows
-    tasks = query.offset(skip).limit(limit).all()
+    if cursor is not None and skip:
+        raise HTTPException(status_code=400, detail="Use either 'skip' or 'cursor', not both")
+
+    # 1. Cached response for this exact URL, unless the user's tasks changed since
+    # (the Link header embeds the URL, so key on all of it)
+    key = read_cache.page_key(read_cache.TASKS, current_user.id, "list", str(request.url))
+    if (page := read_cache.lookup(key)) is not None:
+        return read_cache.respond(request, page)
+
+    # 2. Conditional GET: compare the listing's version before loading any rows
+    criteria = task_filters(current_user.id, group_id, completed)
+    version = db.execute(tasks_version_query(current_user.id, criteria)).one()
+    tag = etag.weak_etag("tasks", current_user.id, *version, group_id, completed, skip, limit, cursor, fieldset)
+    if etag.matches(request, tag):
+        return etag.not_modified(tag)
+
+    # 3. Select the requested task columns (joined with the group name only if
+    # it is included), with the filters
+    # (live rows only, matching the partial per-user indexes)
+    stmt = task_rows_query(criteria, fieldset)
     
-    return tasks
+    # 4. Apply Pagination and Execute
+    # A stable order (by id) is required for both modes. In cursor mode we seek
+    # past the last seen id instead of skipping rows, so deep pages stay as cheap
+    # as the first one. We fetch one extra row to know if another page exists.
+    stmt = stmt.order_by(models.Task.id)
+    if cursor is not None:
+        stmt = stmt.where(models.Task.id > pagination.decode_cursor(cursor))
+    else:
+        stmt = stmt.offset(skip)
+    rows = pagination.finish_page(db.execute(stmt.limit(limit + 1)).all(), limit, request, response)
+
+    schema = task_schema(fieldset)
+    body = serialization.dump_json(schema, [task_from_row(row, schema) for row in rows], many=True)
+    return read_cache.store(key, request, tag, body, pagination.page_headers(response))
+
+# Exports run to many MB and are compressed chunk by chunk on the event loop,
+# so they use each codec's fastest level
+EXPORT_COMPRESSION_LEVELS = {"zstd": 1, "br": 1, "gzip": 1}
+
+@router.get("/export")
+@compression(levels=EXPORT_COMPRESSION_LEVELS)
+@query_stats.query_budget(2)
+def export_tasks(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    db: Session = Depends(database.get_db),
+    current_user: auth.CurrentUser = Depends(auth.get_current_user)
+):
+    # Plain columns, no ORM objects or schema validation per row. yield_per turns
+    # on stream_results (a server-side cursor on Postgres), so only one chunk of
+    # rows is held in memory at a time however many tasks the user has.
+    stmt = select(
+        models.Task.id, models.Task.title, models.Task.description, models.Task.is_completed,
+        models.Group.name, models.Task.group_id, models.Task.created_at, models.Task.updated_at
+    ).join(models.Task.group).where(
+        models.Task.user_id == current_user.id,
+        models.Task.deleted_at.is_(None)
+    ).order_by(models.Task.id).execution_options(yield_per=config.settings.EXPORT_CHUNK_SIZE)
+    result = db.execute(stmt)
+
+    # The session stays open until the response has been sent (yield dependency)
+    return StreamingResponse(
+        transfer.stream_export(result.partitions(), format),
+        media_type=transfer.EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'}
+    )
 
 @router.get("/{id}", response_model=schemas.Task)
-def get_task(id: int, db: Session = Depends(database.get_db), current_user: models.User = Depends(auth.get_current_user)):
-    task = db.query(models.Task).filter(models.Task.id == id, models.Task.user_id == current_user.id).first()
-    if not task:
+@query_stats.query_budget(3)
+def get_task(id: int, request: Request, fieldset: tuple = Depends(task_fieldset), db: Session = Depends(database.get_db), current_user: auth.CurrentUser = Depends(auth.get_current_user)):
+    key = read_cache.page_key(read_cache.TASKS, current_user.id, "item", id, fieldset)
+    if (page := read_cache.lookup(key)) is not None:
+        return read_cache.respond(request, page)
+
+    version = db.execute(task_version_query(id, current_user.id)).first()
+    if not version:
+        raise HTTPException(status_code=404, detail="Task not found")
+    tag = etag.weak_etag("task", current_user.id, id, *version, fieldset)
+    if etag.matches(request, tag):
+        return etag.not_modified(tag)
+
+    row = db.execute(task_rows_query([models.Task.id == id, models.Task.user_id == current_user.id], fieldset)).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task
+    schema = task_schema(fieldset)
+    return read_cache.store(key, request, tag, serialization.dump_json(schema, task_from_row(row, schema)))
 
 
 
 @router.put("/{id}", response_model=schemas.Task)
-def update_task(id: int, task: schemas.TaskUpdate, db: Session = Depends(database.get_db), current_user: models.User = Depends(auth.get_current_user)):
+def update_task(id: int, task: schemas.TaskUpdate, db: Session = Depends(database.get_db), current_user: auth.CurrentUser = Depends(auth.get_current_user)):
     db_task = db.query(models.Task).filter(models.Task.id == id, models.Task.user_id == current_user.id).first()
     if not db_task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -152,7 +550,7 @@ def update_task(id: int, task: schemas.TaskUpdate, db: Session = Depends(databas
     return db_task
 
 @router.delete("/{id}")
-def delete_task(id: int, db: Session = Depends(database.get_db), current_user: models.User = Depends(auth.get_current_user)):
+def delete_task(id: int, db: Session = Depends(database.get_db), current_user: auth.CurrentUser = Depends(auth.get_current_user)):
     task = db.query(models.Task).filter(models.Task.id == id, models.Task.user_id == current_user.id).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
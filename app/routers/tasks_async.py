@@ -0,0 +1,160 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import List, Optional
+from ..config import database, config
+from ..utils import auth, etag, pagination, query_stats, read_cache, serialization
+from ..models import model as models
+from ..schemas import tasks as schemas
+from .tasks import (
+    analyze_tasks_heuristically, suggestion_queries, suggestion_from_rows,
+    task_filters, tasks_version_query, task_version_query,
+    task_fieldset, task_schema, task_rows_query, task_from_row
+)
+
+# Async port of routers/tasks.py, served when DB_ASYNC is enabled.
+# Routes here replace their sync twins in place (see main.with_async_routes).
+router = APIRouter(prefix="/tasks", tags=["Tasks"])
+
+async def load_task(db: AsyncSession, id: int, user_id: int) -> Optional[models.Task]:
+    # Eager-load the group: lazy loads are not possible on an AsyncSession
+    result = await db.execute(
+        select(models.Task)
+        .options(joinedload(models.Task.group))
+        .where(models.Task.id == id, models.Task.user_id == user_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+async def load_group(db: AsyncSession, id: int, user_id: int) -> Optional[models.Group]:
+    result = await db.execute(
+        select(models.Group).where(models.Group.id == id, models.Group.user_id == user_id)
+    )
+    return result.scalars().first()
+
+@router.get("/suggestions")
+@query_stats.query_budget(3)
+async def get_ai_suggestions(
+    db: AsyncSession = Depends(database.get_async_db),
+    current_user: auth.CurrentUser = Depends(auth.get_current_user_async)
+):
+    if config.settings.SUGGESTIONS_IN_SQL:
+        counts_query, top_query = suggestion_queries(current_user.id)
+        count_rows = (await db.execute(counts_query)).all()
+        top_title = (await db.execute(top_query)).scalar()
+        tip, active_tasks = suggestion_from_rows(count_rows, top_title)
+    else:
+        result = await db.execute(
+            select(models.Task).options(joinedload(models.Task.group)).where(
+                models.Task.user_id == current_user.id,
+                models.Task.is_completed == False,
+                models.Task.deleted_at.is_(None)
+            ).order_by(models.Task.id)  # ties go to the lowest id, as in the SQL path
+        )
+        tasks = result.scalars().all()
+        tip, active_tasks = analyze_tasks_heuristically(tasks), len(tasks)
+
+    return {
+        "tip": tip,
+        "user": current_user.username,
+        "active_tasks": active_tasks,
+        "engine": "Category-Aware Heuristic Stub v2.0"
+    }
+
+
+@router.post("/", response_model=schemas.Task, status_code=201)
+async def create_task(task: schemas.TaskCreate, db: AsyncSession = Depends(database.get_async_db), current_user: auth.CurrentUser = Depends(auth.get_current_user_async)):
+    # ACCESS CONTROL: Verify the target group actually belongs to the logged-in user
+    if not await load_group(db, task.group_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Group not found or access denied")
+
+    new_task = models.Task(**task.model_dump(), user_id=current_user.id)
+    db.add(new_task)
+    await db.commit()
+    return await load_task(db, new_task.id, current_user.id)
+
+@router.get("/", response_model=List[schemas.Task])
+@query_stats.query_budget(3)
+async def get_tasks(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0, description="Number of items to skip"),
+    limit: int = Query(10, ge=1, le=100, description="Max number of items to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's Link / X-Next-Cursor header"),
+    group_id: Optional[int] = None,
+    completed: Optional[bool] = None,
+    fieldset: tuple = Depends(task_fieldset),
+    db: AsyncSession = Depends(database.get_async_db),
+    current_user: auth.CurrentUser = Depends(auth.get_current_user_async)
+):
+    if cursor is not None and skip:
+        raise HTTPException(status_code=400, detail="Use either 'skip' or 'cursor', not both")
+
+    key = read_cache.page_key(read_cache.TASKS, current_user.id, "list", str(request.url))
+    if (page := read_cache.lookup(key)) is not None:
+        return read_cache.respond(request, page)
+
+    criteria = task_filters(current_user.id, group_id, completed)
+    version = (await db.execute(tasks_version_query(current_user.id, criteria))).one()
+    tag = etag.weak_etag("tasks", current_user.id, *version, group_id, completed, skip, limit, cursor, fieldset)
+    if etag.matches(request, tag):
+        return etag.not_modified(tag)
+
+    stmt = task_rows_query(criteria, fieldset).order_by(models.Task.id)
+    if cursor is not None:
+        stmt = stmt.where(models.Task.id > pagination.decode_cursor(cursor))
+    else:
+        stmt = stmt.offset(skip)
+    result = await db.execute(stmt.limit(limit + 1))
+    rows = pagination.finish_page(result.all(), limit, request, response)
+
+    schema = task_schema(fieldset)
+    body = serialization.dump_json(schema, [task_from_row(row, schema) for row in rows], many=True)
+    return read_cache.store(key, request, tag, body, pagination.page_headers(response))
+
+@router.get("/{id}", response_model=schemas.Task)
+@query_stats.query_budget(3)
+async def get_task(id: int, request: Request, fieldset: tuple = Depends(task_fieldset), db: AsyncSession = Depends(database.get_async_db), current_user: auth.CurrentUser = Depends(auth.get_current_user_async)):
+    key = read_cache.page_key(read_cache.TASKS, current_user.id, "item", id, fieldset)
+    if (page := read_cache.lookup(key)) is not None:
+        return read_cache.respond(request, page)
+
+    version = (await db.execute(task_version_query(id, current_user.id))).first()
+    if not version:
+        raise HTTPException(status_code=404, detail="Task not found")
+    tag = etag.weak_etag("task", current_user.id, id, *version, fieldset)
+    if etag.matches(request, tag):
+        return etag.not_modified(tag)
+
+    result = await db.execute(task_rows_query([models.Task.id == id, models.Task.user_id == current_user.id], fieldset))
+    row = result.first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Task not found")
+    schema = task_schema(fieldset)
+    return read_cache.store(key, request, tag, serialization.dump_json(schema, task_from_row(row, schema)))
+
+@router.put("/{id}", response_model=schemas.Task)
+async def update_task(id: int, task: schemas.TaskUpdate, db: AsyncSession = Depends(database.get_async_db), current_user: auth.CurrentUser = Depends(auth.get_current_user_async)):
+    db_task = await load_task(db, id, current_user.id)
+    if not db_task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    # Check group ownership if changing groups
+    if task.group_id and not await load_group(db, task.group_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Target group not found")
+
+    for key, value in task.model_dump(exclude_unset=True).items():
+        setattr(db_task, key, value)
+
+    await db.commit()
+    return await load_task(db, id, current_user.id)
+
+@router.delete("/{id}")
+async def delete_task(id: int, db: AsyncSession = Depends(database.get_async_db), current_user: auth.CurrentUser = Depends(auth.get_current_user_async)):
+    task = await load_task(db, id, current_user.id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    await db.delete(task)
+    await db.commit()
+    return {"message": "Task deleted successfully"}
@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field, ConfigDict, field_validator
-from typing import Optional, List
+from typing import Any, Optional, List
 from datetime import datetime
 import re
+from ..config.config import settings
 
 # Assuming GroupBase is defined in the same file or imported
 # If in same file, ensure GroupBase is defined ABOVE TaskBase
@@ -76,3 +77,29 @@ class Task(TaskBase):
     # Pydantic V2 style config
     model_config = ConfigDict(from_attributes=True)
 
+# --- BULK SCHEMAS ---
+
+class TaskBulkCreate(BaseModel):
+    """Schema for POST /tasks/bulk. Items are validated one by one (as TaskCreate)
+    so a bad item is reported in `errors` instead of failing the whole batch."""
+    items: List[Any] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    upsert: bool = Field(
+        default=False,
+        description="Update description/is_completed of tasks whose title already exists in the group"
+    )
+
+class TaskBulkError(BaseModel):
+    index: int
+    detail: str
+
+class TaskBulkResult(BaseModel):
+    """Written tasks (in request order) and the items that were rejected"""
+    tasks: List[Task]
+    errors: List[TaskBulkError]
+
+class TaskImportResult(BaseModel):
+    """Summary of POST /tasks/import. `errors` lists the first failed records only."""
+    inserted: int = 0
+    skipped: int = Field(default=0, description="Tasks whose title already exists in the group")
+    failed: int = 0
+    errors: List[TaskBulkError] = []
@@ -1,13 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import asyncio
+import hashlib
+import secrets
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event, inspect, select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..config import database
 from ..models import model as models
 from ..config.config import settings
+from .cache import TTLCache
 import bcrypt
 
 # Configuration (Matches .env)
@@ -27,12 +37,43 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     )
 
 def get_password_hash(password: str) -> str:
-    # Hash the password with a generated salt
+    # Hash the password with a generated salt at the configured work factor
     pwd_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(pwd_bytes, salt)
     return hashed.decode('utf-8')
 
+def needs_rehash(hashed_password: str) -> bool:
+    # bcrypt hashes look like $2b$<cost>$<salt+digest>
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+# bcrypt is pure CPU work (~250ms at cost 12). It runs on its own bounded pool
+# rather than Starlette's shared threadpool, so a burst of logins queues here
+# instead of stalling every other sync route behind it.
+hash_pool = ThreadPoolExecutor(max_workers=settings.BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+hash_slots = threading.BoundedSemaphore(settings.BCRYPT_WORKERS + settings.BCRYPT_MAX_QUEUE)
+
+async def run_in_hash_pool(func, *args):
+    if not hash_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in requests, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        return await asyncio.get_running_loop().run_in_executor(hash_pool, func, *args)
+    finally:
+        hash_slots.release()
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await run_in_hash_pool(get_password_hash, password)
+
 # --- JWT Utils ---
 from datetime import datetime, timedelta, UTC # Import UTC
 
@@ -49,6 +90,19 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 # --- Utility Functions ---
+def is_admin_token(token: Optional[str]) -> bool:
+    # Operator diagnostics (/admin routes, request profiling) use a shared secret,
+    # ADMIN_TOKEN, rather than a user's JWT. Constant-time comparison.
+    return bool(settings.ADMIN_TOKEN) and token is not None and secrets.compare_digest(token, settings.ADMIN_TOKEN)
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    # Dependency for /admin and /metrics. Async: no threadpool worker for a header check.
+    # Without ADMIN_TOKEN configured the routes don't exist as far as clients can tell.
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
 def raise_unauthorized_exception(detail: str = "Could not validate credentials") -> HTTPException:
     return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -56,29 +110,80 @@ def raise_unauthorized_exception(detail: str = "Could not validate credentials")
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+# Verified payloads keyed by a digest of the raw token. Clients resend the same
+# token for its whole lifetime, so the HMAC check and JSON parsing only run once.
+token_cache = TTLCache(max_size=settings.TOKEN_CACHE_MAX_SIZE, ttl=0)
+
 def decode_jwt_token(token: str) -> dict:
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return dict(payload)
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         raise raise_unauthorized_exception()
 
+    # Entries expire exactly when the token does; tokens without exp aren't cached
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(key, payload, ttl=exp - time.time())
+    return dict(payload)
+
+# --- Authenticated User Cache ---
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
+    """Detached snapshot of the columns routes need from the logged-in user.
+
+    Unlike a models.User it is not bound to a Session, so it can be shared
+    between requests through user_cache.
+    """
+    id: int
+    username: str
+    email: str
+
+# Keyed by token subject (username). Hit/miss counters: user_cache.stats()
+user_cache = TTLCache(max_size=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def invalidate_cached_user(mapper, connection, target):
+    # Drop both the current and any previous username (renames)
+    history = inspect(target).attrs.username.history
+    for username in {target.username, *history.deleted}:
+        user_cache.pop(username)
+
+def subject_from_token(token: str) -> str:
+    # The token's "sub" claim is the username (see routers/auth.login)
+    username: Optional[str] = decode_jwt_token(token).get("sub")
+    if username is None:
+        raise raise_unauthorized_exception()
+    return username
+
+def remember_user(user: Optional[models.User]) -> CurrentUser:
+    if user is None:
+        raise raise_unauthorized_exception()
+    snapshot = CurrentUser(id=user.id, username=user.username, email=user.email)
+    user_cache.set(user.username, snapshot)
+    return snapshot
+
 # --- Dependency to get current user ---
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)) -> models.User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-        
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)) -> CurrentUser:
+    username = subject_from_token(token)
+    cached = user_cache.get(username)
+    if cached is not None:
+        return cached
+
     user = db.query(models.User).filter(models.User.username == username).first()
-    if user is None:
-        raise credentials_exception
-    return user
\ No newline at end of file
+    return remember_user(user)
+
+# Same as get_current_user, for the async routers (DB_ASYNC=true)
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(database.get_async_db)) -> CurrentUser:
+    username = subject_from_token(token)
+    cached = user_cache.get(username)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(select(models.User).where(models.User.username == username))
+    return remember_user(result.scalars().first())
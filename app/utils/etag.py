@@ -0,0 +1,40 @@
+import hashlib
+from fastapi import Request, Response
+from sqlalchemy import func
+
+# --- Conditional GET (ETag / If-None-Match) ---
+# A listing's version is a handful of aggregates (row count, newest
+# created/updated timestamp, highest id) computed by one cheap index-backed
+# query. Clients that already hold that version get a 304 before the rows are
+# loaded, validated or serialized.
+
+# Responses are per user and must be revalidated on every use
+CACHE_CONTROL = "private, no-cache"
+
+def last_modified(model):
+    # Newest write time across the rows (created_at for never-updated rows)
+    return func.max(func.coalesce(model.updated_at, model.created_at))
+
+def weak_etag(*parts) -> str:
+    # Weak: equal tags mean equivalent JSON, not byte-identical encodings
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+def matches(request: Request, etag: str) -> bool:
+    # Weak comparison (RFC 9110 13.1.2): ignore the W/ prefix on both sides
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+def set_headers(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_headers(response, etag)
+    return response
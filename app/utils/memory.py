@@ -0,0 +1,167 @@
+import linecache
+import random
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from ..config.config import settings
+
+# --- Memory Profiling (tracemalloc) ---
+# Driven from the /admin/memory routes: start tracing, take named snapshots
+# (say, before and after a few minutes of list/suggestions traffic), and diff
+# them grouped by file/line to see what is holding on to memory. tracemalloc
+# costs CPU and memory on every allocation while it runs, so it is off until
+# started and should be stopped afterwards.
+#
+# While tracing, a sampled fraction of requests (MEMORY_SAMPLE_RATE) also get
+# their peak allocation recorded per route by MemoryMiddleware. The peak is a
+# process-wide counter, so one request is measured at a time and allocations
+# by concurrent requests count towards it.
+
+# Allocations made by the bookkeeping itself
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+GROUP_BY = ("lineno", "filename", "traceback")
+
+@dataclass
+class NamedSnapshot:
+    snapshot: tracemalloc.Snapshot
+    traced_bytes: int
+    taken_at: float = field(default_factory=time.time)
+
+
+_snapshots: "OrderedDict[str, NamedSnapshot]" = OrderedDict()
+_lock = threading.Lock()
+
+def is_tracing() -> bool:
+    return tracemalloc.is_tracing()
+
+def start(frames: int = 1):
+    """Start tracing, keeping `frames` frames of traceback per allocation."""
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    tracemalloc.start(frames)
+    reset()
+
+def stop():
+    tracemalloc.stop()
+    reset()
+
+def reset():
+    with _lock:
+        _snapshots.clear()
+        _endpoints.clear()
+
+def status() -> dict:
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "tracing": tracemalloc.is_tracing(),
+        "frames": tracemalloc.get_traceback_limit(),
+        "traced_bytes": current,
+        "peak_bytes": peak,
+        "overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+        "snapshots": list_snapshots(),
+    }
+
+def current_snapshot() -> tracemalloc.Snapshot:
+    """The traced allocations right now, without keeping the snapshot."""
+    return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+def take_snapshot(name: str) -> dict:
+    """Snapshot the traced allocations under `name` (replacing one of the same name)."""
+    snapshot = current_snapshot()
+    entry = NamedSnapshot(snapshot, sum(stat.size for stat in snapshot.statistics("filename")))
+    with _lock:
+        _snapshots.pop(name, None)
+        _snapshots[name] = entry
+        while len(_snapshots) > settings.MEMORY_MAX_SNAPSHOTS:
+            _snapshots.popitem(last=False)
+    return {"name": name, "traced_bytes": entry.traced_bytes, "taken_at": entry.taken_at}
+
+def list_snapshots() -> List[dict]:
+    with _lock:
+        items = list(_snapshots.items())
+    return [{"name": name, "traced_bytes": entry.traced_bytes, "taken_at": entry.taken_at} for name, entry in items]
+
+def get_snapshot(name: str) -> Optional[tracemalloc.Snapshot]:
+    with _lock:
+        entry = _snapshots.get(name)
+    return entry.snapshot if entry else None
+
+def describe(stat, group_by: str) -> dict:
+    frame = stat.traceback[0]
+    entry = {"file": frame.filename}
+    if group_by != "filename":
+        entry["line"] = frame.lineno
+    if group_by == "traceback":
+        entry["traceback"] = [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback]
+    return entry
+
+def diff(base: tracemalloc.Snapshot, target: tracemalloc.Snapshot, top: int = 20, group_by: str = "lineno") -> dict:
+    """Top allocation changes from base to target, largest growth first."""
+    stats = target.compare_to(base, group_by)  # sorted by abs(size_diff)
+    growth = sum(stat.size_diff for stat in stats)
+    return {
+        "group_by": group_by,
+        "size_diff": growth,
+        "top": [
+            {
+                **describe(stat, group_by),
+                "size_diff": stat.size_diff, "size": stat.size,
+                "count_diff": stat.count_diff, "count": stat.count,
+            }
+            for stat in stats[:top]
+        ],
+    }
+
+# --- Per-endpoint peaks ---
+
+@dataclass
+class EndpointPeaks:
+    samples: int = 0
+    total_bytes: int = 0
+    max_bytes: int = 0
+
+
+_endpoints: Dict[str, EndpointPeaks] = {}
+_sampling = False  # only touched from the event loop thread
+
+def begin_sample() -> Optional[int]:
+    """Start measuring this request if it's sampled; returns the baseline for end_sample()."""
+    global _sampling
+    if _sampling or not tracemalloc.is_tracing() or random.random() >= settings.MEMORY_SAMPLE_RATE:
+        return None
+    _sampling = True
+    tracemalloc.reset_peak()
+    return tracemalloc.get_traced_memory()[0]
+
+def end_sample(route: str, baseline: int):
+    global _sampling
+    _sampling = False
+    if not tracemalloc.is_tracing():  # stopped mid-request
+        return
+    peak = max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+    with _lock:
+        entry = _endpoints.setdefault(route, EndpointPeaks())
+        entry.samples += 1
+        entry.total_bytes += peak
+        entry.max_bytes = max(entry.max_bytes, peak)
+
+def endpoint_peaks() -> List[dict]:
+    """Sampled peak allocation per route, largest maximum first."""
+    with _lock:
+        items = [(route, EndpointPeaks(entry.samples, entry.total_bytes, entry.max_bytes)) for route, entry in _endpoints.items()]
+    return sorted(
+        (
+            {"route": route, "samples": entry.samples, "mean_peak_bytes": entry.total_bytes // entry.samples, "max_peak_bytes": entry.max_bytes}
+            for route, entry in items
+        ),
+        key=lambda entry: entry["max_peak_bytes"], reverse=True,
+    )
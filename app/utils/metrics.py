@@ -0,0 +1,292 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from anyio import to_thread
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# --- Runtime Metrics (Prometheus text format) ---
+# Recording has to cost microseconds, so there are no locks on the hot path:
+# every thread writes to its own shard (a plain dict reached through a
+# threading.local), and only a scrape walks the shards and adds them up.
+# Under the GIL, copying a dict another thread is writing to is safe.
+
+LabelValues = Tuple[str, ...]
+
+# Request latencies: 5 ms .. 10 s
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Pool checkout waits are usually ~0 and only grow under saturation
+WAIT_BUCKETS = (0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class Sharded:
+    """Per-thread dicts of label values -> accumulated value."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._lock = threading.Lock()  # only taken the first time a thread records
+
+    def shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def snapshots(self) -> List[dict]:
+        with self._lock:
+            shards = list(self._shards)
+        return [dict(shard) for shard in shards]
+
+    def reset(self):
+        with self._lock:
+            for shard in self._shards:
+                shard.clear()
+
+
+class Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def format_labels(self, values: LabelValues, extra: str = "") -> str:
+        pairs = [f'{name}="{escape(value)}"' for name, value in zip(self.labels, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    @abstractmethod
+    def collect(self) -> List[str]:
+        ...
+
+    def reset(self):
+        pass
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labels=()):
+        super().__init__(name, documentation, labels)
+        self._values = Sharded()
+
+    def inc(self, *values: str, amount: float = 1):
+        shard = self._values.shard()
+        shard[values] = shard.get(values, 0) + amount
+
+    def totals(self) -> Dict[LabelValues, float]:
+        totals = {}
+        for shard in self._values.snapshots():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def collect(self):
+        return self.header() + [f"{self.name}{self.format_labels(key)} {value}" for key, value in sorted(self.totals().items())]
+
+    def reset(self):
+        self._values.reset()
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        self._values = Sharded()
+
+    def observe(self, value: float, *values: str):
+        # Per label set: [count per bucket (+Inf last)..., sum]
+        shard = self._values.shard()
+        cells = shard.get(values)
+        if cells is None:
+            cells = shard[values] = [0] * (len(self.buckets) + 1) + [0.0]
+        cells[bisect_left(self.buckets, value)] += 1
+        cells[-1] += value
+
+    def totals(self) -> Dict[LabelValues, list]:
+        totals = {}
+        for shard in self._values.snapshots():
+            for key, cells in shard.items():
+                cells = list(cells)
+                if key in totals:
+                    totals[key] = [a + b for a, b in zip(totals[key], cells)]
+                else:
+                    totals[key] = cells
+        return totals
+
+    def collect(self):
+        lines = self.header()
+        for key, cells in sorted(self.totals().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), cells):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{self.format_labels(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self.format_labels(key)} {cells[-1]}")
+            lines.append(f"{self.name}_count{self.format_labels(key)} {cumulative}")
+        return lines
+
+    def reset(self):
+        self._values.reset()
+
+
+class Gauge(Metric):
+    """A value read at scrape time from a callback returning {label values: value}."""
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labels=(), read: Optional[Callable[[], Dict[LabelValues, float]]] = None):
+        super().__init__(name, documentation, labels)
+        self.read = read
+
+    def collect(self):
+        values = self.read() if self.read else {}
+        return self.header() + [f"{self.name}{self.format_labels(key)} {value}" for key, value in sorted(values.items())]
+
+
+def escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        for metric in self.metrics.values():
+            metric.reset()
+
+
+registry = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# --- HTTP ---
+
+request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Time to send the full response, by route template.",
+    ("method", "route", "status")
+))
+
+# Only touched from the event loop thread, where requests start and finish
+in_flight = {"": 0}
+registry.register(Gauge(
+    "http_requests_in_flight", "Requests currently being handled.", read=lambda: {(): in_flight[""]}
+))
+
+# --- DB pool ---
+
+pool_checkout_wait = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.", ("engine",), WAIT_BUCKETS
+))
+pool_checkout_timeouts = registry.register(Counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after pool_timeout.", ("engine",)
+))
+
+
+class CheckoutTiming:
+    """Pool mixin timing each checkout, including the wait for a free connection."""
+
+    metrics_label = ""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_checkout_timeouts.inc(self.metrics_label)
+            raise
+        finally:
+            pool_checkout_wait.observe(time.perf_counter() - start, self.metrics_label)
+
+
+class InstrumentedQueuePool(CheckoutTiming, QueuePool):
+    metrics_label = "sync"
+
+
+class InstrumentedAsyncQueuePool(CheckoutTiming, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+def pool_usage(engine) -> Optional[Dict[str, int]]:
+    """Size / checked-out / idle / overflow of an engine's pool; None if it has no queue.
+
+    Also shown by /db-status, so both read the same numbers.
+    """
+    pool = getattr(engine, "pool", None)
+    if engine is None or not hasattr(pool, "checkedout"):
+        return None
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),  # negative until pool_size connections exist
+    }
+
+def pool_gauges(engines: Dict[str, object]) -> None:
+    """Register checked-out / overflow / size gauges for these engines' pools."""
+
+    def read(stat: str):
+        def values():
+            result = {}
+            for label, engine in engines.items():
+                usage = pool_usage(engine)
+                if usage is not None:
+                    result[(label,)] = usage[stat]
+            return result
+        return values
+
+    for stat, name, documentation in [
+        ("size", "db_pool_size", "Configured pool_size."),
+        ("checked_out", "db_pool_checked_out", "Connections currently checked out."),
+        ("checked_in", "db_pool_checked_in", "Idle connections in the pool."),
+        ("overflow", "db_pool_overflow", "Connections open beyond pool_size."),
+    ]:
+        registry.register(Gauge(name, documentation, ("engine",), read(stat)))
+
+# --- Threadpool ---
+# Sync routes and dependencies each borrow a token from anyio's default
+# limiter (40 threads). The limiter belongs to the event loop, which is where
+# render() runs (from the async /metrics route).
+
+def threadpool_usage() -> dict:
+    """Limiter tokens: total, busy (borrowed) and calls waiting. Also shown by /db-status."""
+    limiter = to_thread.current_default_thread_limiter()
+    return {
+        "total": limiter.total_tokens,
+        "busy": limiter.borrowed_tokens,
+        "waiting": limiter.statistics().tasks_waiting,
+    }
+
+def threadpool_values(stat: str):
+    def values():
+        return {(): threadpool_usage()[stat]}
+    return values
+
+for stat, documentation in [
+    ("total", "Threadpool size (anyio default limiter tokens)."),
+    ("busy", "Threadpool workers running sync code."),
+    ("waiting", "Calls queued for a threadpool worker."),
+]:
+    registry.register(Gauge(f"threadpool_{stat}", documentation, read=threadpool_values(stat)))
@@ -0,0 +1,51 @@
+import base64
+import json
+from typing import Optional
+from fastapi import HTTPException, status
+
+# --- Keyset (Cursor) Pagination Utils ---
+# A cursor is an opaque, URL-safe token holding the sort key of the last row
+# a client has already seen. The next page is fetched with "WHERE key > last"
+# instead of OFFSET, so the database never scans the rows it would throw away.
+
+# Ids are BIGINT-sized at most; anything outside would fail in the driver (a 500)
+MAX_ID = 2**63 - 1
+
+def encode_cursor(last_id: int) -> str:
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        # Restore the padding stripped in encode_cursor
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        last_id = payload["id"]
+        if not isinstance(last_id, int) or isinstance(last_id, bool):
+            raise ValueError("Cursor id must be an integer")
+        if not 0 < last_id <= MAX_ID:
+            raise ValueError("Cursor id out of range")
+        return last_id
+    except (ValueError, KeyError, TypeError, UnicodeEncodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+def next_page_link(url, next_cursor: Optional[str]) -> Optional[str]:
+    # RFC 8288 Link header pointing at the next page, or None on the last page
+    if next_cursor is None:
+        return None
+    next_url = url.remove_query_params("skip").include_query_params(cursor=next_cursor)
+    return f'<{next_url}>; rel="next"'
+
+def page_headers(response) -> dict:
+    # The headers finish_page set, e.g. to replay them from a cached response
+    return {name: response.headers[name] for name in ("X-Next-Cursor", "Link") if name in response.headers}
+
+def finish_page(rows: list, limit: int, request, response) -> list:
+    # Rows were fetched with limit + 1; the extra row only signals a next page
+    if len(rows) <= limit:
+        return rows
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1].id)
+    response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["Link"] = next_page_link(request.url, next_cursor)
+    return rows
@@ -0,0 +1,150 @@
+import marshal
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# --- Request Profiling ---
+# A sampling profiler: a background thread reads every thread's stack with
+# sys._current_frames() every PROFILE_INTERVAL_MS. cProfile can't be used here
+# because it only sees the thread that enabled it, while get_db,
+# get_current_user and sync handlers run on threadpool workers. Samples are
+# taken from the event loop thread (the one serving the request) and from any
+# thread that is executing code of this app, which also picks up concurrent
+# requests' workers: profile on an otherwise quiet instance.
+
+FrameKey = Tuple[str, int, str]  # (file, first line, function), the pstats key
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# One profile at a time; the sampler already sees every thread
+_busy = threading.Lock()
+
+
+class Sampler:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.loop_thread = threading.get_ident()
+        # thread id -> list of (root..leaf stack, seconds it stands for)
+        self.samples: Dict[int, List[Tuple[Tuple[FrameKey, ...], float]]] = {}
+        self.thread_names: Dict[int, str] = {}
+        self._keys: Dict[object, FrameKey] = {}  # code object -> key
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self.run, name="profiler", daemon=True)
+        self._switch_interval = sys.getswitchinterval()
+        self.duration = 0.0
+
+    def start(self):
+        # A CPU-bound thread holds the GIL for up to the switch interval (5 ms),
+        # which would make the sampler late; hand it over more often meanwhile
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+        self.duration = time.perf_counter() - self.started
+
+    def run(self):
+        me = threading.get_ident()
+        last = time.perf_counter()
+        while True:
+            now = time.perf_counter()
+            # Weighted by real elapsed time, so a late sample still counts fully
+            self.sample(me, now - last)
+            last = now
+            if self._stop.wait(self.interval):
+                break
+
+    def sample(self, me: int, weight: float):
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            stack = []
+            in_app = ident == self.loop_thread
+            while frame is not None:
+                code = frame.f_code
+                key = self._keys.get(code)
+                if key is None:
+                    key = self._keys[code] = (code.co_filename, code.co_firstlineno, code.co_name)
+                in_app = in_app or key[0].startswith(APP_DIR)
+                stack.append(key)
+                frame = frame.f_back
+            if in_app:
+                stack.reverse()
+                self.samples.setdefault(ident, []).append((tuple(stack), weight))
+        if len(self.thread_names) < len(self.samples):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident in self.samples:
+                self.thread_names.setdefault(ident, names.get(ident, str(ident)))
+
+
+def try_start(interval: float) -> Optional[Sampler]:
+    """A started Sampler, or None while another request is being profiled."""
+    if not _busy.acquire(blocking=False):
+        return None
+    sampler = Sampler(interval)
+    try:
+        sampler.start()
+    except BaseException:
+        _busy.release()
+        raise
+    return sampler
+
+def finish(sampler: Sampler):
+    try:
+        sampler.stop()
+    finally:
+        _busy.release()
+
+# --- Output formats ---
+
+def to_speedscope(sampler: Sampler, name: str) -> dict:
+    """speedscope.app "sampled" profiles, one per thread, weights in milliseconds."""
+    frames: List[dict] = []
+    index: Dict[FrameKey, int] = {}
+    profiles = []
+    for ident, samples in sampler.samples.items():
+        stacks, weights = [], []
+        for stack, weight in samples:
+            row = []
+            for key in stack:
+                if key not in index:
+                    index[key] = len(frames)
+                    frames.append({"name": key[2], "file": key[0], "line": key[1]})
+                row.append(index[key])
+            stacks.append(row)
+            weights.append(round(weight * 1000, 3))
+        profiles.append({
+            "type": "sampled", "name": sampler.thread_names.get(ident, str(ident)), "unit": "milliseconds",
+            "startValue": 0, "endValue": round(sum(weights), 3), "samples": stacks, "weights": weights,
+        })
+    # The thread that served the request first; speedscope opens on it
+    profiles.sort(key=lambda profile: profile["name"] != sampler.thread_names.get(sampler.loop_thread))
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name, "exporter": "todo-api", "activeProfileIndex": 0,
+        "shared": {"frames": frames}, "profiles": profiles,
+    }
+
+def to_pstats(sampler: Sampler) -> bytes:
+    """The marshalled dict pstats.Stats / snakeviz load; "calls" are sample counts."""
+    stats: Dict[FrameKey, list] = {}
+    for samples in sampler.samples.values():
+        for stack, weight in samples:
+            seen = set()
+            for depth, key in enumerate(stack):
+                entry = stats.setdefault(key, [0, 0, 0.0, 0.0, {}])
+                if key in seen:  # recursion: count a function once per sample
+                    continue
+                seen.add(key)
+                entry[0] += 1
+                entry[1] += 1
+                entry[3] += weight
+                if depth:
+                    caller = entry[4].get(stack[depth - 1], (0, 0, 0.0, 0.0))
+                    entry[4][stack[depth - 1]] = (caller[0] + 1, caller[1] + 1, caller[2], caller[3] + weight)
+            stats[stack[-1]][2] += weight
+    return marshal.dumps({key: (cc, nc, tt, ct, callers) for key, (cc, nc, tt, ct, callers) in stats.items()})
@@ -0,0 +1,67 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# --- Per-Request Query Stats ---
+# Cursor events on the engine add every statement's count and time to the
+# QueryStats of the request being served. It lives in a contextvar set by
+# QueryStatsMiddleware; sync routes see the same object from the threadpool,
+# because run_in_threadpool copies the context (the reference, not the stats).
+
+@dataclass(slots=True)
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    scope: Optional[dict] = None  # the request's ASGI scope, for the route (see slow_queries)
+
+
+current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_stats_start = time.perf_counter()
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current.get()
+    if stats is not None and context is not None:
+        stats.count += 1
+        stats.seconds += time.perf_counter() - context._query_stats_start
+
+def instrument_engine(engine: Engine):
+    """Count this engine's statements (pass async_engine.sync_engine for an AsyncEngine)."""
+    if not event.contains(engine, "before_cursor_execute", before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+def start(scope: Optional[dict] = None) -> tuple:
+    """Begin counting for the current context; returns (stats, token for stop())."""
+    stats = QueryStats(scope=scope)
+    return stats, current.set(stats)
+
+def stop(token):
+    current.reset(token)
+
+# --- Query Budgets ---
+# A route declares how many statements it may issue with @query_budget(n).
+# The count must not depend on the data: a list endpoint that goes N+1 (say,
+# lazy-loading each task's group) blows its budget as soon as the page has
+# more rows than the budget. Over-budget requests are logged, or raise when
+# QUERY_BUDGET_ENFORCE is set (the test suite does), failing the test.
+
+BUDGET_ATTRIBUTE = "__query_budget__"
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+def query_budget(max_queries: int) -> Callable:
+    """Decorator; put it below the @router.get(...) line, like @compression()."""
+    def decorator(endpoint):
+        setattr(endpoint, BUDGET_ATTRIBUTE, max_queries)
+        return endpoint
+    return decorator
+
+def budget_for(endpoint) -> Optional[int]:
+    return getattr(endpoint, BUDGET_ATTRIBUTE, None)
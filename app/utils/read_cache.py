@@ -0,0 +1,188 @@
+import itertools
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Optional
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from ..config.config import settings
+from . import etag, serialization
+from .cache import TTLCache
+
+# --- Write-Invalidated Read Cache ---
+# Rendered responses of GET /tasks/, /tasks/{id} and /groups/ are cached per
+# user and per query. Every key embeds a generation counter for its
+# (resource, user); committing a change to that user's tasks or groups bumps
+# the counter, so stale entries are never read again and just age out of the
+# LRU. The counters are bumped from Session events, not from the routes, so a
+# new write path can't forget to invalidate.
+
+TASKS = "tasks"
+GROUPS = "groups"
+# Table written -> cached resources it affects. Tasks embed their group's
+# name, so group writes invalidate task reads as well.
+AFFECTED = {"tasks": (TASKS,), "groups": (GROUPS, TASKS)}
+# Bumped by bulk DML that doesn't say which user it touched: invalidates everyone
+ALL_USERS = "*"
+
+@dataclass(frozen=True, slots=True)
+class CachedPage:
+    etag: str
+    body: bytes
+    headers: dict = field(default_factory=dict)
+
+
+class CacheBackend(ABC):
+    """Where cached pages and generation counters live.
+
+    The local backend is per process. A shared one (e.g. Redis with GET/SETEX
+    for pages and INCR for generations) makes each worker's invalidations
+    visible to the others; install it with use_backend().
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedPage]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, page: CachedPage, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def generation(self, name: str) -> int:
+        ...
+
+    @abstractmethod
+    def bump(self, name: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def stats(self) -> dict:
+        return {}
+
+
+class LocalBackend(CacheBackend):
+    """In-process LRU (see TTLCache) of pages plus one of generation counters.
+
+    The counters are bounded like the pages, so a user who wrote once doesn't
+    keep an entry forever. A dropped counter must not restart at a value its
+    old pages were stored under, so every value, whether a counter's first one
+    or a bump, comes from one process-wide sequence and is never reused. Losing
+    a counter then only costs a miss.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.pages = TTLCache(max_size, ttl)
+        self.generations = TTLCache(max_size, ttl)
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self.pages.get(key)
+
+    def set(self, key, page, ttl):
+        self.pages.set(key, page, ttl)
+
+    def generation(self, name):
+        value = self.generations.get(name)
+        if value is None:
+            with self._lock:
+                value = self.generations.get(name)
+                if value is None:
+                    value = next(self._sequence)
+                    self.generations.set(name, value)
+        return value
+
+    def bump(self, name):
+        with self._lock:
+            self.generations.set(name, next(self._sequence))
+
+    def clear(self):
+        # The sequence keeps counting: values handed out before stay unused
+        with self._lock:
+            self.pages.clear()
+            self.generations.clear()
+
+    def stats(self):
+        return self.pages.stats()
+
+
+# Per process: only safe on its own with a single worker (see READ_CACHE_MAX_SIZE)
+backend: CacheBackend = LocalBackend(settings.READ_CACHE_MAX_SIZE, settings.READ_CACHE_TTL_SECONDS)
+
+def use_backend(new_backend: CacheBackend):
+    global backend
+    backend = new_backend
+
+def clear():
+    backend.clear()
+
+def stats() -> dict:
+    return backend.stats()
+
+# --- Reads ---
+
+def page_key(resource: str, user_id: int, *params) -> str:
+    # Must be built BEFORE querying: a commit that lands while we query bumps
+    # the generation, so what we then store under the old key is never served
+    generations = f"{backend.generation(f'{resource}:{user_id}')}.{backend.generation(ALL_USERS)}"
+    return f"{resource}:{user_id}:{generations}:{params!r}"
+
+def lookup(key: str) -> Optional[CachedPage]:
+    return backend.get(key)
+
+def respond(request: Request, page: CachedPage) -> Response:
+    if etag.matches(request, page.etag):
+        return etag.not_modified(page.etag)
+    response = serialization.RawJSONResponse(page.body, headers=page.headers)
+    etag.set_headers(response, page.etag)
+    return response
+
+def store(key: str, request: Request, tag: str, body: bytes, headers: Optional[dict] = None) -> Response:
+    """Cache an encoded JSON body with its ETag and headers, and return the response."""
+    page = CachedPage(etag=tag, body=body, headers=headers or {})
+    backend.set(key, page, settings.READ_CACHE_TTL_SECONDS)
+    return respond(request, page)
+
+# --- Invalidation ---
+# after_flush/do_orm_execute record which users' data a transaction touched;
+# only after_commit bumps their generations, and a rollback forgets them.
+
+PENDING = "read_cache_pending"
+
+def mark(session: Session, table: str, user_id: Optional[int]):
+    pending = session.info.setdefault(PENDING, set())
+    for resource in AFFECTED.get(table, ()):
+        pending.add(ALL_USERS if user_id is None else f"{resource}:{user_id}")
+
+@event.listens_for(Session, "after_flush")
+def collect_flushed(session, flush_context):
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table in AFFECTED:
+            # Read from __dict__: an expired attribute must not trigger a load here
+            mark(session, table, vars(obj).get("user_id"))
+
+@event.listens_for(Session, "do_orm_execute")
+def collect_bulk_dml(orm_execute_state):
+    # Bulk INSERT/UPDATE/DELETE statements never go through the flush. Callers
+    # name the user with execution_options(invalidate_user=...); otherwise
+    # every user is invalidated to stay correct.
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement.table, "name", None)
+        if table in AFFECTED:
+            mark(orm_execute_state.session, table, orm_execute_state.execution_options.get("invalidate_user"))
+
+@event.listens_for(Session, "after_commit")
+def invalidate_committed(session):
+    for name in session.info.pop(PENDING, ()):
+        backend.bump(name)
+
+@event.listens_for(Session, "after_rollback")
+def forget_rolled_back(session):
+    session.info.pop(PENDING, None)
@@ -0,0 +1,176 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from ..config.config import settings
+from . import query_stats
+
+logger = logging.getLogger("slow_queries")
+
+# --- Slow-Query Log ---
+# Statements slower than SLOW_QUERY_MS land in a bounded ring buffer with
+# their normalized SQL, the shape (not the values) of their parameters, and
+# the route that issued them. Optionally the plan of each new statement
+# fingerprint is captured with EXPLAIN on a side connection, off the request
+# path. GET /admin/slow-queries shows the buffer grouped by fingerprint.
+
+@dataclass
+class SlowQuery:
+    fingerprint: str
+    statement: str
+    parameters: str
+    duration_ms: float
+    route: str
+    at: float = field(default_factory=time.time)
+
+
+_entries: deque = deque(maxlen=settings.SLOW_QUERY_LOG_SIZE)
+# fingerprint -> plan text, for the most recent fingerprints
+_plans: "OrderedDict[str, str]" = OrderedDict()
+_lock = threading.Lock()
+# One thread: EXPLAINs queue up behind each other instead of piling onto the DB
+_explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explain")
+
+# --- Normalization ---
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|\$\d+|:\w+|%s|\?")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROWS = re.compile(r"(\(\?(?:, \?)*\))(?:\s*,\s*\1)+")
+_SPACE = re.compile(r"\s+")
+
+def normalize(statement: str) -> str:
+    """SQL with literals and placeholders as ?, IN lists and VALUES rows collapsed."""
+    sql = _SPACE.sub(" ", statement).strip()
+    sql = _STRING.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _ROWS.sub(r"\1, ...", sql)  # multi-row INSERT ... VALUES (?, ?), (?, ?)
+    return _LIST.sub("(...)", sql)    # IN (?, ?, ?)
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest()
+
+def parameter_shape(parameters, executemany: bool = False) -> str:
+    # Types only: values can be personal data and don't belong in a log
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+# --- Recording ---
+
+def current_route() -> str:
+    stats = query_stats.current.get()
+    scope = stats.scope if stats is not None else None
+    if not scope:
+        return "<no request>"
+    route = scope.get("route")
+    return f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._slow_query_start = time.perf_counter()
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is None:
+        return
+    duration_ms = (time.perf_counter() - context._slow_query_start) * 1000
+    if duration_ms < settings.SLOW_QUERY_MS:
+        return
+    normalized = normalize(statement)
+    entry = SlowQuery(
+        fingerprint=fingerprint(normalized), statement=normalized,
+        parameters=parameter_shape(parameters, executemany), duration_ms=round(duration_ms, 2),
+        route=current_route(),
+    )
+    with _lock:
+        _entries.append(entry)
+        new_fingerprint = entry.fingerprint not in _plans
+        if new_fingerprint:
+            _plans[entry.fingerprint] = None  # reserved, so only one EXPLAIN is queued per fingerprint
+            while len(_plans) > settings.SLOW_QUERY_LOG_SIZE:
+                _plans.popitem(last=False)
+    logger.warning(f"Slow query ({duration_ms:.0f} ms) from {entry.route}: {normalized[:200]}")
+    if new_fingerprint and settings.SLOW_QUERY_EXPLAIN and not executemany and not conn.dialect.is_async:
+        _explainer.submit(explain, conn.engine, entry.fingerprint, statement, parameters)
+
+def instrument_engine(engine: Engine):
+    """Log this engine's slow statements (pass async_engine.sync_engine for an AsyncEngine)."""
+    if not event.contains(engine, "before_cursor_execute", before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+# --- EXPLAIN ---
+
+# EXPLAIN ANALYZE runs the statement again, so only plain reads qualify
+_READ_ONLY = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_WRITES = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|FOR UPDATE|FOR SHARE|NEXTVAL|SETVAL)\b", re.IGNORECASE)
+
+def explain_prefix(dialect_name: str, statement: str) -> Optional[str]:
+    if dialect_name == "postgresql":
+        analyze = settings.SLOW_QUERY_EXPLAIN_ANALYZE and _READ_ONLY.match(statement) and not _WRITES.search(statement)
+        return "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+    if dialect_name == "sqlite":
+        return "EXPLAIN QUERY PLAN "
+    return None
+
+def explain(engine: Engine, key: str, statement: str, parameters):
+    prefix = explain_prefix(engine.dialect.name, statement)
+    if prefix is None:
+        return
+    try:
+        # A connection of its own, rolled back afterwards (EXPLAIN ANALYZE executes)
+        with engine.connect() as conn:
+            rows = conn.exec_driver_sql(prefix + statement, parameters).all()
+            conn.rollback()
+        plan = "\n".join(" | ".join(str(value) for value in row) for row in rows)
+    except Exception as e:  # the plan is best effort; never let it break anything
+        plan = f"EXPLAIN failed: {e}"
+    with _lock:
+        if key in _plans:
+            _plans[key] = plan
+
+# --- Reading ---
+
+def recent(limit: int = 50) -> list:
+    with _lock:
+        entries = list(_entries)[-limit:]
+    return [asdict(entry) for entry in reversed(entries)]
+
+def by_fingerprint() -> list:
+    """The buffer grouped by statement, slowest in total first."""
+    with _lock:
+        entries = list(_entries)
+        plans = dict(_plans)
+    groups = {}
+    for entry in entries:
+        group = groups.setdefault(entry.fingerprint, {
+            "fingerprint": entry.fingerprint, "statement": entry.statement, "count": 0,
+            "total_ms": 0.0, "max_ms": 0.0, "routes": {}, "parameters": entry.parameters,
+        })
+        group["count"] += 1
+        group["total_ms"] += entry.duration_ms
+        group["max_ms"] = max(group["max_ms"], entry.duration_ms)
+        group["routes"][entry.route] = group["routes"].get(entry.route, 0) + 1
+    for group in groups.values():
+        group["total_ms"] = round(group["total_ms"], 2)
+        group["mean_ms"] = round(group["total_ms"] / group["count"], 2)
+        group["plan"] = plans.get(group["fingerprint"])
+    return sorted(groups.values(), key=lambda group: group["total_ms"], reverse=True)
+
+def clear():
+    with _lock:
+        _entries.clear()
+        _plans.clear()
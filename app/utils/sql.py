@@ -0,0 +1,27 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import functions
+
+# --- Dialect-Specific SQL Helpers ---
+
+# INSERT constructs that support ON CONFLICT (upserts) per dialect
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def supports_upsert(db: Session) -> bool:
+    # Postgres and SQLite share the same ON CONFLICT API in SQLAlchemy
+    return db.get_bind().dialect.name in UPSERT_INSERTS
+
+def upsert_insert(db: Session, table):
+    """Return an INSERT for table with .on_conflict_do_update / _do_nothing.
+
+    Only call it where supports_upsert() holds (see tasks.require_upserts).
+    """
+    return UPSERT_INSERTS[db.get_bind().dialect.name](table)
+
+# SQLite renders func.now() as CURRENT_TIMESTAMP, which only has second
+# resolution. created_at/updated_at feed the ETags, so two writes in the same
+# second must still produce different timestamps: use milliseconds instead.
+@compiles(functions.now, "sqlite")
+def sqlite_now(element, compiler, **kw):
+    return "strftime('%Y-%m-%d %H:%M:%f', 'now')"
@@ -0,0 +1,159 @@
+import codecs
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# --- Task Import/Export Formats ---
+# Exports are written, and imports parsed, one chunk of rows at a time, so
+# memory stays flat no matter how many tasks a user has. Both formats share
+# the same column set, so an export can be imported back as-is.
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+EXPORT_COLUMNS = ("id", "title", "description", "is_completed", "group", "group_id", "created_at", "updated_at")
+
+def _jsonable(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def encode_ndjson(rows: Iterable[Sequence]) -> str:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, map(_jsonable, row))), ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+def encode_csv(rows: Iterable[Sequence], header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    writer.writerows([_jsonable(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+def stream_export(partitions: Iterable[Sequence[Sequence]], format: str) -> Iterator[bytes]:
+    """Encode row partitions from a streamed result into response chunks."""
+    if format == "csv":
+        yield encode_csv((), header=True).encode("utf-8")
+    for rows in partitions:
+        text = encode_csv(rows) if format == "csv" else encode_ndjson(rows)
+        yield text.encode("utf-8")
+
+# (record index, parsed record or None, error message or None)
+ParsedRecord = Tuple[int, Optional[dict], Optional[str]]
+
+class RecordReader:
+    """Incremental NDJSON/CSV parser for request bodies that arrive in chunks.
+
+    feed() returns every record completed by the new bytes; a line split across
+    chunks (or a quoted CSV field spanning lines) is held until it is complete.
+    Records are numbered from 0 in body order, not counting the CSV header.
+    Line endings may be \n, \r\n or a bare \r. A record longer than
+    max_record_size characters is reported as failed and skipped, so what is
+    held stays bounded whatever the body looks like.
+    """
+
+    def __init__(self, format: str, max_record_size: int = 1_000_000):
+        self.format = format
+        self.max_record_size = max_record_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.carriage_return = False  # chunk ended in \r; a \n may follow in the next one
+        self.tail = ""        # Last, possibly incomplete, line
+        self.skipping = False # Discarding the rest of an oversized line
+        self.pending = []     # CSV lines of a record with an open quoted field
+        self.pending_size = 0
+        self.pending_quotes = 0
+        self.header = None
+        self.index = 0
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[ParsedRecord]:
+        # Raises UnicodeDecodeError on a body that isn't UTF-8
+        text = self.decoder.decode(chunk, final=final)
+        if self.carriage_return:
+            text = "\r" + text
+        self.carriage_return = text.endswith("\r") and not final
+        if self.carriage_return:
+            text = text[:-1]
+        lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+
+        records = []
+        if self.skipping:
+            if len(lines) == 1 and not final:
+                return records  # still inside the oversized line
+            lines.pop(0)
+            self.skipping = False
+        else:
+            lines[0] = self.tail + lines[0]
+        self.tail = "" if final or not lines else lines.pop()
+
+        for line in lines:
+            if len(line) > self.max_record_size:
+                records.append(self._too_large())
+                continue
+            record = self._parse_csv(line) if self.format == "csv" else self._parse_ndjson(line)
+            if record is not None:
+                records.append(record)
+        if len(self.tail) + self.pending_size > self.max_record_size:
+            self.tail = ""
+            self.skipping = True
+            records.append(self._too_large())
+        if final and self.pending:
+            self._reset_pending()
+            records.append(self._numbered(None, "Unterminated quoted field"))
+        return records
+
+    def _numbered(self, record: Optional[dict], error: Optional[str]) -> ParsedRecord:
+        self.index += 1
+        return self.index - 1, record, error
+
+    def _too_large(self) -> ParsedRecord:
+        # Also drops a CSV record the oversized line belonged to
+        self._reset_pending()
+        return self._numbered(None, f"Record exceeds {self.max_record_size} characters")
+
+    def _reset_pending(self):
+        self.pending = []
+        self.pending_size = 0
+        self.pending_quotes = 0
+
+    def _parse_ndjson(self, line: str) -> Optional[ParsedRecord]:
+        if not line.strip():
+            return None
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            return self._numbered(None, f"Invalid JSON: {e}")
+        if not isinstance(record, dict):
+            return self._numbered(None, "Each line must be a JSON object")
+        return self._numbered(record, None)
+
+    def _parse_csv(self, line: str) -> Optional[ParsedRecord]:
+        # An odd number of quotes so far means a quoted field continues on the next line
+        self.pending.append(line)
+        self.pending_size += len(line) + 1
+        self.pending_quotes += line.count('"')
+        if self.pending_quotes % 2:
+            if self.pending_size > self.max_record_size:
+                return self._too_large()
+            return None
+        text = "\n".join(self.pending)
+        self._reset_pending()
+        if not text.strip():
+            return None
+
+        try:
+            row = next(csv.reader(io.StringIO(text)))
+        except csv.Error as e:
+            if self.header is None:
+                self.header = []  # unusable header: every row then fails the column check
+            return self._numbered(None, f"Invalid CSV: {e}")
+        if self.header is None:
+            self.header = [name.strip() for name in row]
+            return None
+        if len(row) != len(self.header):
+            return self._numbered(None, f"Expected {len(self.header)} columns, got {len(row)}")
+        # Empty cells mean "not set", as exported for NULL descriptions
+        return self._numbered({name: value for name, value in zip(self.header, row) if value != ""}, None)
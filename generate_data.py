@@ -0,0 +1,217 @@
+import io
+import csv
+import sys
+import time
+import random
+import argparse
+import multiprocessing
+from datetime import datetime, timedelta, UTC
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.pool import NullPool
+
+from app.config.database import Base, SQLALCHEMY_DATABASE_URL
+from app.models import model as models
+from app.utils import auth
+from seed import TASK_POOL, CATEGORIES
+
+# --- High-Volume Data Generator ---
+# seed.py goes through the API, one request at a time. This writes straight to
+# the tables: batched executemany (Postgres: COPY), split across worker
+# processes by user range. Ids are computed, not returned by the database, so
+# workers never coordinate:
+#   user u         -> id users0 + u
+#   group g of u   -> id groups0 + (u - 1) * groups + g + 1   (g = 0 is the Inbox)
+#   task t of u    -> id tasks0 + (u - 1) * tasks + t + 1
+# where users0/groups0/tasks0 are each table's max(id) before the load (0 with
+# --reset), so rows already there are never collided with. Every value comes
+# from a per-user RNG, so the same --seed gives the same data whatever the
+# number of workers.
+#
+#   python generate_data.py --users 1000000 --tasks 50 --reset --defer-indexes
+
+PASSWORD = "password123"
+EPOCH = datetime(2025, 1, 1, tzinfo=UTC)  # Fixed, so timestamps are reproducible too
+
+def group_name(g: int) -> str:
+    # Group 0 is the Inbox create_default_group would have made; names are
+    # unique per user (_user_group_uc)
+    if g == 0:
+        return "Inbox"
+    category = CATEGORIES[(g - 1) % len(CATEGORIES)]
+    return category if g <= len(CATEGORIES) else f"{category} {(g - 1) // len(CATEGORIES) + 1}"
+
+def user_rows(start: int, stop: int, base: tuple, password_hash: str):
+    for u in range(start, stop):
+        user_id = base[0] + u
+        yield {"id": user_id, "username": f"user_{user_id}", "email": f"user_{user_id}@example.com", "password_hash": password_hash}
+
+def group_rows(start: int, stop: int, base: tuple, groups: int):
+    for u in range(start, stop):
+        created_at = EPOCH + timedelta(seconds=u)
+        for g in range(groups):
+            yield {"id": base[1] + (u - 1) * groups + g + 1, "user_id": base[0] + u, "name": group_name(g), "created_at": created_at}
+
+def task_rows(start: int, stop: int, base: tuple, groups: int, tasks: int, seed: int):
+    for u in range(start, stop):
+        rng = random.Random(seed * 1_000_003 + u)
+        created_at = EPOCH + timedelta(seconds=u)
+        for t in range(tasks):
+            g = rng.randrange(groups)
+            pool = TASK_POOL[CATEGORIES[(g - 1) % len(CATEGORIES)]] if g else TASK_POOL[rng.choice(CATEGORIES)]
+            item = rng.choice(pool)
+            yield {
+                "id": base[2] + (u - 1) * tasks + t + 1, "user_id": base[0] + u,
+                "group_id": base[1] + (u - 1) * groups + g + 1,
+                # The #t suffix keeps (title, group_id, user_id) unique (_user_task_group_uc)
+                "title": f"{item['title']} #{t + 1}", "description": item["description"],
+                "is_completed": rng.random() < 0.3, "created_at": created_at + timedelta(minutes=t),
+            }
+
+# --- Writers ---
+
+def batched(rows, size: int):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def write_executemany(conn, table, rows, batch_size: int) -> int:
+    count = 0
+    for batch in batched(rows, batch_size):
+        conn.execute(insert(table), batch)
+        count += len(batch)
+    return count
+
+def write_copy(conn, table, rows, batch_size: int) -> int:
+    # COPY ... FROM STDIN (CSV) through psycopg2: no per-row statement at all
+    count = 0
+    cursor = conn.connection.dbapi_connection.cursor()
+    for batch in batched(rows, batch_size):
+        columns = list(batch[0])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in batch:
+            writer.writerow([row[column] for column in columns])
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        count += len(batch)
+    cursor.close()
+    return count
+
+def load_users(job: tuple) -> tuple:
+    """Worker: write users [start, stop) with their groups and tasks in one transaction."""
+    url, start, stop, base, groups, tasks, seed, password_hash, batch_size = job
+    engine = create_engine(url, poolclass=NullPool)  # never share a parent's connections
+    write = write_copy if engine.dialect.name == "postgresql" else write_executemany
+    with engine.begin() as conn:
+        write(conn, models.User.__table__, user_rows(start, stop, base, password_hash), batch_size)
+        write(conn, models.Group.__table__, group_rows(start, stop, base, groups), batch_size)
+        written = write(conn, models.Task.__table__, task_rows(start, stop, base, groups, tasks, seed), batch_size)
+    engine.dispose()
+    return stop - start, written
+
+# --- Driver ---
+
+def secondary_indexes():
+    # Every non-PK index. Unique ones (username, email) are rebuilt too, so a
+    # duplicate would still fail the load, just at the end
+    return [index for table in Base.metadata.sorted_tables for index in table.indexes]
+
+def max_ids(conn) -> tuple:
+    # Where this load's ids start, per table, so it appends to existing rows
+    tables = (models.User.__table__, models.Group.__table__, models.Task.__table__)
+    return tuple(conn.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {table.name}")).scalar_one() for table in tables)
+
+def reset_sequences(conn):
+    # Explicit ids don't advance the serial sequences
+    for table in Base.metadata.sorted_tables:
+        conn.execute(text(f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                          f"COALESCE((SELECT MAX(id) FROM {table.name}), 1))"))
+
+def generate(url: str, users: int, groups: int = 4, tasks: int = 50, seed: int = 42, workers: int = 1,
+             chunk_users: int = 10_000, batch_size: int = 5_000, reset: bool = False,
+             defer_indexes: bool = False, verbose: bool = True) -> tuple:
+    """Write users x groups x tasks; returns (users, tasks) written."""
+    engine = create_engine(url, poolclass=NullPool)
+    if engine.dialect.name == "sqlite":
+        workers = 1  # SQLite has a single writer; more processes would only wait on its lock
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+    indexes = secondary_indexes() if defer_indexes else []
+    with engine.begin() as conn:
+        base = max_ids(conn)
+        for index in indexes:
+            index.drop(conn, checkfirst=True)
+
+    password_hash = auth.get_password_hash(PASSWORD)  # one bcrypt call, shared by every user
+    jobs = [(url, start, min(start + chunk_users, users + 1), base, groups, tasks, seed, password_hash, batch_size)
+            for start in range(1, users + 1, chunk_users)]
+    written_users = written_tasks = 0
+    started = time.perf_counter()
+    with multiprocessing.Pool(workers) if workers > 1 else _Inline() as pool:
+        for done_users, done_tasks in pool.imap_unordered(load_users, jobs):
+            written_users += done_users
+            written_tasks += done_tasks
+            if verbose:
+                elapsed = time.perf_counter() - started
+                print(f"   {written_users:,}/{users:,} users, {written_tasks:,} tasks "
+                      f"({written_tasks / elapsed:,.0f} tasks/s)")
+
+    with engine.begin() as conn:
+        if indexes and verbose:
+            print(f"🔧 Rebuilding {len(indexes)} indexes...")
+        for index in indexes:
+            index.create(conn)
+        if engine.dialect.name == "postgresql":
+            reset_sequences(conn)
+            conn.execute(text("ANALYZE"))
+    engine.dispose()
+    return written_users, written_tasks
+
+
+class _Inline:
+    """Stands in for a Pool when there is one worker (and for SQLite)."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def imap_unordered(self, func, jobs):
+        return map(func, jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a large, deterministic dataset straight to the database")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--groups", type=int, default=4, help="groups per user, Inbox included")
+    parser.add_argument("--tasks", type=int, default=50, help="tasks per user")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--chunk-users", type=int, default=10_000, help="users per worker job (one transaction)")
+    parser.add_argument("--batch-size", type=int, default=5_000, help="rows per executemany / COPY")
+    parser.add_argument("--database-url", default=SQLALCHEMY_DATABASE_URL)
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    parser.add_argument("--defer-indexes", action="store_true", help="drop secondary indexes during the load, rebuild after")
+    args = parser.parse_args()
+    if args.groups < 1:
+        parser.error("--groups must be at least 1 (the Inbox)")
+
+    print(f"🚀 Generating {args.users:,} users x {args.groups} groups x {args.tasks} tasks "
+          f"({args.users * args.tasks:,} tasks, {args.workers} workers, seed {args.seed})...")
+    start = time.perf_counter()
+    users, tasks = generate(
+        args.database_url, args.users, args.groups, args.tasks, args.seed, args.workers,
+        args.chunk_users, args.batch_size, args.reset, args.defer_indexes
+    )
+    print(f"\n🏁 Generated {users:,} users and {tasks:,} tasks in {time.perf_counter() - start:.1f}s")
+    print(f"   Every user can log in with password '{PASSWORD}'.")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""Add per-user access path indexes
+
+Revision ID: e2f1a30655f6
+Revises: 2c547a27ae96
+Create Date: 2026-10-18 09:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f1a30655f6'
+down_revision: Union[str, Sequence[str], None] = '2c547a27ae96'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partial on live rows; dialects without partial index support ignore these.
+LIVE_ROWS = sa.text('deleted_at IS NULL')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_user_completed_id', 'tasks', ['user_id', 'is_completed', 'id'], unique=False,
+                    postgresql_where=LIVE_ROWS, sqlite_where=LIVE_ROWS)
+    op.create_index('ix_tasks_user_group_id', 'tasks', ['user_id', 'group_id', 'id'], unique=False,
+                    postgresql_where=LIVE_ROWS, sqlite_where=LIVE_ROWS)
+    op.create_index('ix_groups_user_id_live', 'groups', ['user_id'], unique=False,
+                    postgresql_where=LIVE_ROWS, sqlite_where=LIVE_ROWS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_groups_user_id_live', table_name='groups')
+    op.drop_index('ix_tasks_user_group_id', table_name='tasks')
+    op.drop_index('ix_tasks_user_completed_id', table_name='tasks')
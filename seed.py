@@ -74,6 +74,7 @@ def seed():
         
         print(f"👤 {username}: Selected {len(user_categories)} categories...")
 
+        task_payloads = []
         for cat in user_categories:
             # Create Group
             group_resp = requests.post(f"{BASE_URL}/groups/", json={"name": cat}, headers=headers)
@@ -85,13 +86,16 @@ def seed():
                 tasks_to_add = random.sample(TASK_POOL[cat], k=random.randint(1, 3))
                 
                 for task_info in tasks_to_add:
-                    task_payload = {
+                    task_payloads.append({
                         "title": task_info["title"],
                         "description": task_info["description"],
                         "group_id": group_id,
                         "is_completed": False
-                    }
-                    requests.post(f"{BASE_URL}/tasks/", json=task_payload, headers=headers)
+                    })
+
+        # One round trip for all of this user's tasks
+        if task_payloads:
+            requests.post(f"{BASE_URL}/tasks/bulk", json={"items": task_payloads}, headers=headers)
         
         print(f"✅ {username}: Data seeded with unique priority.")
 
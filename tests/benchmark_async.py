@@ -0,0 +1,103 @@
+import os
+import sys
+import logging
+import time
+import asyncio
+import tempfile
+from pathlib import Path
+
+# Runs fully offline against a throwaway SQLite file, driving the app in-process
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+DB_PATH = Path(tempfile.gettempdir()) / "todo_benchmark_async.db"
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_PATH}")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("GROQ_API_KEY", "unused")
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.config.database import Base, get_db, get_async_db
+from app.main import include_routers
+from app.models import model as models
+from app.utils import auth
+
+logging.getLogger("httpx").setLevel(logging.WARNING)  # one INFO line per request otherwise
+
+TASKS = 500        # Tasks owned by the benchmark user
+REQUESTS = 2000    # Requests per mode
+CONCURRENCY = 64   # Requests in flight at once (same load for both modes)
+PATH = "/tasks/?limit=50"
+
+def seed(engine) -> str:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        user = models.User(username="bench", email="bench@example.com", password_hash="x")
+        db.add(user)
+        db.commit()
+        inbox = db.query(models.Group).filter_by(user_id=user.id).first()
+        db.add_all(models.Task(title=f"Task {i}", user_id=user.id, group_id=inbox.id) for i in range(TASKS))
+        db.commit()
+    return auth.create_access_token(data={"sub": "bench"})
+
+def build_app(async_db: bool) -> FastAPI:
+    app = FastAPI()
+    include_routers(app, async_db=async_db)
+    if async_db:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{DB_PATH}", pool_size=CONCURRENCY)
+        SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+        async def override():
+            async with SessionLocal() as db:
+                yield db
+        app.dependency_overrides[get_async_db] = override
+    else:
+        engine = create_engine(f"sqlite:///{DB_PATH}", connect_args={"check_same_thread": False}, pool_size=CONCURRENCY)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        def override():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+        app.dependency_overrides[get_db] = override
+    return app
+
+async def drive(app: FastAPI, token: str) -> float:
+    headers = {"Authorization": f"Bearer {token}"}
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                resp = await client.get(PATH, headers=headers)
+                assert resp.status_code == 200, resp.text
+
+        await asyncio.gather(*(one() for _ in range(50)))  # warm-up
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(REQUESTS)))
+        return REQUESTS / (time.perf_counter() - start)
+
+async def benchmark():
+    print(f"⏱️ Starting Concurrency Benchmark ({REQUESTS} x GET {PATH}, {CONCURRENCY} in flight)...")
+    token = seed(create_engine(f"sqlite:///{DB_PATH}"))
+
+    print("🏃 Testing sync routes (threadpool + Session)...")
+    sync_rps = await drive(build_app(async_db=False), token)
+    print("🚀 Testing async routes (AsyncSession + aiosqlite)...")
+    async_rps = await drive(build_app(async_db=True), token)
+
+    print("\n" + "="*45)
+    print("🏁 BENCHMARK RESULTS (requests/second)")
+    print("="*45)
+    print(f"Sync  (DB_ASYNC=false): {sync_rps:8.1f} req/s")
+    print(f"Async (DB_ASYNC=true):  {async_rps:8.1f} req/s")
+    print("-"*45)
+    print(f"Result: async is {async_rps / sync_rps:.2f}x the sync throughput")
+    print("💡 Note: SQLite I/O is local. Against Postgres, queries wait on the")
+    print("   network, which holds a threadpool slot in sync mode but not in async.")
+    print("="*45)
+
+if __name__ == "__main__":
+    asyncio.run(benchmark())
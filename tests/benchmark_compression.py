@@ -0,0 +1,76 @@
+import sys
+import time
+import json
+import statistics
+from pathlib import Path
+
+# Runs fully offline: compresses representative response bodies in-process,
+# no server or database needed
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.middleware.compression_middleware import CODECS
+
+ROUNDS = 20  # We report the median round
+LEVELS = {"zstd": [1, 3, 9], "br": [1, 4, 9], "gzip": [1, 6, 9]}
+LINKS_MBPS = [10, 100]  # Mobile-ish and office-ish links for the total-time estimate
+EXPORT_ROWS, EXPORT_CHUNK = 20_000, 1000  # Mirrors EXPORT_CHUNK_SIZE
+
+def task(i: int) -> dict:
+    return {
+        "title": f"Prepare quarterly report {i}", "description": f"Collect numbers from team {i % 17} and review",
+        "is_completed": i % 3 == 0, "group_id": 1 + i % 4, "id": i, "user_id": 1,
+        "created_at": f"2025-01-{1 + i % 28:02d}T09:{i % 60:02d}:00.123000", "updated_at": None,
+        "group": {"name": ["Inbox", "Work", "Home", "Errands"][i % 4]},
+    }
+
+def payloads() -> dict:
+    page = lambda n: json.dumps([task(i) for i in range(n)], separators=(",", ":")).encode()
+    ndjson = [b"".join(json.dumps(task(i)).encode() + b"\n" for i in range(start, start + EXPORT_CHUNK))
+              for start in range(0, EXPORT_ROWS, EXPORT_CHUNK)]
+    return {"1 task": [page(1)], "10 tasks": [page(10)], "100 tasks": [page(100)], "export (streamed)": ndjson}
+
+def compress(codec, level, chunks) -> bytes:
+    if len(chunks) == 1:
+        return codec.compress(chunks[0], level)
+    # What the middleware does for a StreamingResponse: flush after every chunk
+    stream = codec.stream(level)
+    out = [stream.compress(chunk) + stream.flush() for chunk in chunks]
+    return b"".join(out) + stream.finish()
+
+def measure(codec, level, chunks):
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.process_time()
+        size = len(compress(codec, level, chunks))
+        timings.append((time.process_time() - start) * 1000)
+    return statistics.median(timings), size
+
+def transfer_ms(size: int, mbps: int) -> float:
+    return size * 8 / (mbps * 1000)
+
+def benchmark():
+    print(f"⏱️ Starting Compression Benchmark (codecs: {', '.join(CODECS)}; {ROUNDS} rounds, median)...")
+    missing = {"zstd", "br"} - set(CODECS)
+    if missing:
+        print(f"⚠️ Not installed: {', '.join(sorted(missing))} (pip install zstandard brotli)")
+
+    links = "".join(f"  total@{mbps}Mbps" for mbps in LINKS_MBPS)
+    width = 58 + 14 * len(LINKS_MBPS)
+    for name, chunks in payloads().items():
+        raw = sum(len(chunk) for chunk in chunks)
+        print("\n" + "="*width)
+        print(f"🏁 {name}: {raw:,} bytes")
+        print("="*width)
+        print(f"{'codec':<10}{'level':>6}{'bytes':>12}{'ratio':>8}{'CPU ms':>10}{links}")
+        totals = "".join(f"{transfer_ms(raw, mbps):>16.2f}" for mbps in LINKS_MBPS)
+        print(f"{'identity':<10}{'-':>6}{raw:>12,}{1:>8.2f}{0:>10.3f}{totals}")
+        for codec_name, codec in CODECS.items():
+            for level in LEVELS[codec_name]:
+                cpu, size = measure(codec, level, chunks)
+                totals = "".join(f"{cpu + transfer_ms(size, mbps):>16.2f}" for mbps in LINKS_MBPS)
+                print(f"{codec_name:<10}{level:>6}{size:>12,}{raw / size:>8.2f}{cpu:>10.3f}{totals}")
+    print("\n💡 Note: total = CPU + bytes on the wire at that link speed (ms); latency and")
+    print("   decompression on the client are not included.")
+
+if __name__ == "__main__":
+    benchmark()
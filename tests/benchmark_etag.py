@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import asyncio
+import logging
+import statistics
+import tempfile
+from pathlib import Path
+
+# Runs fully offline against a throwaway SQLite file, driving the app in-process
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/todo_benchmark.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("GROQ_API_KEY", "unused")
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+
+from app.config.database import Base, SessionLocal, engine
+from app.main import include_routers
+from app.models import model as models
+from app.utils import auth, read_cache
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+TASKS = 5_000  # Tasks owned by the polling user
+POLLS = 300    # Unchanged polls per mode
+ENDPOINTS = ["/tasks/?limit=100", "/groups/"]
+
+def seed() -> str:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        user = models.User(username="bench", email="bench@example.com", password_hash="unused")
+        db.add(user)
+        db.commit()
+        inbox = db.query(models.Group).filter_by(user_id=user.id).first()
+        db.execute(insert(models.Task), [
+            {"title": f"Task {i}", "description": "Polled for the benchmark", "user_id": user.id, "group_id": inbox.id}
+            for i in range(TASKS)
+        ])
+        db.commit()
+    return auth.create_access_token(data={"sub": "bench"})
+
+async def poll(client, url, conditional: bool, cached: bool):
+    # An empty LRU stands in for READ_CACHE_MAX_SIZE=0
+    read_cache.use_backend(read_cache.LocalBackend(10_000 if cached else 0, 300))
+    headers = {}
+    if conditional:
+        headers["If-None-Match"] = (await client.get(url)).headers["ETag"]
+    timings = []
+    for _ in range(POLLS):
+        start = time.perf_counter()
+        resp = await client.get(url, headers=headers)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert resp.status_code == (304 if conditional else 200)
+    return statistics.median(timings)
+
+async def benchmark():
+    print(f"⏱️ Starting Conditional GET / Read Cache Benchmark ({POLLS} unchanged polls, {TASKS:,} tasks)...")
+    token = seed()
+    app = FastAPI()
+    include_routers(app)
+
+    print("\n" + "="*76)
+    print("🏁 BENCHMARK RESULTS (median latency per poll)")
+    print("="*76)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench",
+                           headers={"Authorization": f"Bearer {token}"}) as client:
+        for url in ENDPOINTS:
+            full = await poll(client, url, conditional=False, cached=False)
+            revalidated = await poll(client, url, conditional=True, cached=False)
+            cached = await poll(client, url, conditional=False, cached=True)
+            both = await poll(client, url, conditional=True, cached=True)
+            print(f"{url:<18} 200 {full:6.2f} ms  304 {revalidated:6.2f} ms  "
+                  f"cached 200 {cached:6.2f} ms  cached 304 {both:6.2f} ms")
+    print("="*76)
+
+if __name__ == "__main__":
+    asyncio.run(benchmark())
@@ -0,0 +1,111 @@
+import os
+import sys
+import time
+import asyncio
+import logging
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Runs fully offline against a throwaway SQLite file, driving the app in-process
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/todo_benchmark.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("GROQ_API_KEY", "unused")
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+
+from app.config.database import Base, SessionLocal, engine
+from app.main import include_routers
+from app.models import model as models
+from app.utils import auth
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+TASK_COUNTS = [5_000, 20_000]  # Tasks owned by one heavy user
+PAGE_SIZE = 100                # The max limit GET /tasks/ allows
+
+def seed(count: int) -> str:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        user = models.User(username="bench", email="bench@example.com", password_hash="unused")
+        db.add(user)
+        db.commit()
+        inbox = db.query(models.Group).filter_by(user_id=user.id).first()
+        db.execute(insert(models.Task), [
+            {"title": f"Task {i}", "description": "Exported for the benchmark", "user_id": user.id, "group_id": inbox.id}
+            for i in range(count)
+        ])
+        db.commit()
+    return auth.create_access_token(data={"sub": "bench"})
+
+async def paged(client) -> int:
+    # BEFORE: walk GET /tasks/ with the cursor, one full JSON list per page
+    rows, params = 0, {"limit": PAGE_SIZE}
+    while True:
+        resp = await client.get("/tasks/", params=params)
+        rows += len(resp.json())
+        if "X-Next-Cursor" not in resp.headers:
+            return rows
+        params["cursor"] = resp.headers["X-Next-Cursor"]
+
+async def exported(client) -> int:
+    # Fed straight into the ASGI app: httpx's ASGITransport would buffer the
+    # whole streamed body and hide the server's own footprint
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "server": ("bench", 80), "client": ("127.0.0.1", 5000), "root_path": "",
+        "path": "/tasks/export", "raw_path": b"/tasks/export", "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"authorization", client.headers["Authorization"].encode())],
+    }
+    rows, requested = 0, False
+    async def receive():
+        nonlocal requested
+        if requested:
+            # StreamingResponse listens for a disconnect while it sends; never send one
+            await asyncio.Event().wait()
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        nonlocal rows
+        if message["type"] == "http.response.body":
+            rows += message.get("body", b"").count(b"\n")
+    await client.app(scope, receive, send)
+    return rows
+
+async def measure(fn, client):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = await fn(client)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return rows, elapsed, peak
+
+async def benchmark():
+    print("⏱️ Starting Export Benchmark (paged GET /tasks/ vs streamed GET /tasks/export)...")
+    app = FastAPI()
+    include_routers(app)
+
+    print("\n" + "="*66)
+    print("🏁 BENCHMARK RESULTS (wall time / peak Python memory, tracemalloc)")
+    print("="*66)
+    for count in TASK_COUNTS:
+        token = seed(count)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench",
+                               headers={"Authorization": f"Bearer {token}"}) as client:
+            client.app = app
+            before = await measure(paged, client)
+            after = await measure(exported, client)
+        assert before[0] == after[0] == count
+        print(f"{count:>7,} tasks:  paged  {before[1]:6.2f} s {before[2]:7.2f} MiB   "
+              f"export {after[1]:6.2f} s {after[2]:7.2f} MiB")
+    print("="*66)
+    print("💡 Note: paged memory is one page at a time too, but it costs one")
+    print(f"   request (auth, query, validation) per {PAGE_SIZE} tasks.")
+
+if __name__ == "__main__":
+    asyncio.run(benchmark())
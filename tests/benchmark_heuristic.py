@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+import random
+import statistics
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+# Runs fully offline on synthetic tasks shaped like seed.py's pool
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/todo_benchmark.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("GROQ_API_KEY", "unused")
+
+from app.routers.tasks import analyze_tasks_heuristically
+from seed import TASK_POOL
+
+TASK_COUNTS = [10_000, 50_000]  # Open tasks for one heavy user
+ROUNDS = 5                      # We report the median round
+
+# BEFORE: the previous implementation, verbatim
+def legacy_analyze_tasks_heuristically(tasks):
+    if not tasks:
+        return "Your schedule is clear! It's a great time to start a new project in your 'Learning' group."
+    HIGH_PRIORITY_KEYWORDS = ["finish", "submit", "deadline", "urgent", "important", "review", "bill"]
+    CATEGORY_TIPS = {
+        "Work": "Focus on deep work sessions for your professional projects.",
+        "Personal": "Don't forget to balance your productivity with self-care.",
+        "Fitness": "Physical activity boosts mental clarity. Keep moving!",
+        "Learning": "Consistency is key to mastering new skills. Spend 15 minutes on this today.",
+        "Shopping": "Try to batch your errands to save time and energy."
+    }
+    scored_tasks = []
+    category_counts = {}
+    for task in tasks:
+        score = 0
+        content = (task.title + " " + (task.description or "")).lower()
+        if any(word in content for word in HIGH_PRIORITY_KEYWORDS):
+            score += 5
+        group_name = task.group.name if task.group else "General"
+        if group_name in ["Work", "Learning"]:
+            score += 2
+        category_counts[group_name] = category_counts.get(group_name, 0) + 1
+        scored_tasks.append({"score": score, "title": task.title, "group": group_name})
+    scored_tasks.sort(key=lambda x: x["score"], reverse=True)
+    top_item = scored_tasks[0]
+    dominant_cat = max(category_counts, key=category_counts.get)
+    cat_tip = CATEGORY_TIPS.get(dominant_cat, "Keep up the great work!")
+    return (
+        f"AI Suggestion: Based on your {dominant_cat} focus, {cat_tip} "
+        f"I recommend starting with '{top_item['title']}' as it appears most critical."
+    )
+
+def make_tasks(count, rng):
+    groups = {name: SimpleNamespace(name=name) for name in TASK_POOL}
+    tasks = []
+    for i in range(count):
+        category = rng.choice(list(TASK_POOL))
+        info = rng.choice(TASK_POOL[category])
+        tasks.append(SimpleNamespace(title=f"{info['title']} #{i}", description=info["description"], group=groups[category]))
+    return tasks
+
+def median_ms(fn, tasks):
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn(tasks)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def benchmark():
+    print(f"⏱️ Starting Suggestion Heuristic Benchmark ({ROUNDS} rounds per size)...")
+    rng = random.Random(42)
+
+    print("\n" + "="*55)
+    print("🏁 BENCHMARK RESULTS (median per call)")
+    print("="*55)
+    for count in TASK_COUNTS:
+        tasks = make_tasks(count, rng)
+        assert legacy_analyze_tasks_heuristically(tasks) == analyze_tasks_heuristically(tasks)
+        before = median_ms(legacy_analyze_tasks_heuristically, tasks)
+        after = median_ms(analyze_tasks_heuristically, tasks)
+        print(f"{count:>7,} tasks:  legacy {before:8.2f} ms   compiled {after:8.2f} ms   ({before / after:.1f}x)")
+    print("="*55)
+    print("✅ Output identical for every size")
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+import statistics
+import tempfile
+from pathlib import Path
+
+# Runs fully offline: the app only needs settings to import, not a live database
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/todo_benchmark.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("GROQ_API_KEY", "unused")
+
+from jose import jwt
+from app.utils import auth
+
+ITERATIONS = 20000  # Token verifications per run (one per simulated request)
+ROUNDS = 5          # Runs per variant; we report the median
+
+def per_request_us(fn, token):
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            fn(token)
+        timings.append((time.perf_counter() - start) / ITERATIONS * 1e6)
+    return statistics.median(timings)
+
+def benchmark():
+    print(f"⏱️ Starting JWT Verification Benchmark ({ITERATIONS} requests x {ROUNDS} rounds)...")
+    token = auth.create_access_token(data={"sub": "DevUser1"})
+
+    # BEFORE: every request re-runs the HMAC check and JSON parsing
+    print("🏃 Testing uncached jose.jwt.decode...")
+    before = per_request_us(lambda t: jwt.decode(t, auth.SECRET_KEY, algorithms=[auth.ALGORITHM]), token)
+
+    # AFTER: the first call verifies, the rest are served from token_cache
+    print("🚀 Testing cached decode_jwt_token...")
+    auth.token_cache.clear()
+    after = per_request_us(auth.decode_jwt_token, token)
+
+    print("\n" + "="*45)
+    print("🏁 BENCHMARK RESULTS (cost per request)")
+    print("="*45)
+    print(f"jwt.decode:        {before:8.2f} µs")
+    print(f"decode_jwt_token:  {after:8.2f} µs")
+    print("-"*45)
+    print(f"Result: {before / after:.1f}x faster ({before - after:.2f} µs saved per request)")
+    print(f"Cache: {auth.token_cache.stats()}")
+    print("="*45)
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,126 @@
+import os
+import sys
+import logging
+import time
+import asyncio
+import statistics
+import tempfile
+from pathlib import Path
+
+# Runs fully offline against a throwaway SQLite file, driving the app in-process
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+DB_PATH = Path(tempfile.gettempdir()) / "todo_benchmark_login.db"
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_PATH}")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("GROQ_API_KEY", "unused")
+os.environ.setdefault("BCRYPT_ROUNDS", "10")      # keeps the run short; the shape is the same at 12
+os.environ.setdefault("BCRYPT_MAX_QUEUE", "1000")  # measure queuing, not 503s
+os.environ.setdefault("READ_CACHE_MAX_SIZE", "0")  # reads must reach the threadpool
+
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config.database import Base, get_db
+from app.main import include_routers
+from app.models import model as models
+from app.utils import auth
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+LOGINS = 100          # Concurrent logins in the storm
+READS = 100           # Sequential task reads measured while idle
+READ_INTERVAL = 0.02  # During the storm, one read is started every 20ms until it ends
+PASSWORD = "password123"
+
+engine = create_engine(f"sqlite:///{DB_PATH}", connect_args={"check_same_thread": False}, pool_size=64)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# BEFORE: the original handler, hashing inline on Starlette's shared threadpool
+def legacy_login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    user = db.query(models.User).filter(models.User.username == form_data.username).first()
+    if not user or not auth.verify_password(form_data.password, user.password_hash):
+        raise HTTPException(status_code=401)
+    return {"access_token": auth.create_access_token(data={"sub": user.username}), "token_type": "bearer"}
+
+def build_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+    if legacy:
+        app.post("/auth/login")(legacy_login)
+    include_routers(app)
+    app.dependency_overrides[get_db] = override_get_db
+    return app
+
+def seed() -> str:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        user = models.User(username="bench", email="bench@example.com", password_hash=auth.get_password_hash(PASSWORD))
+        db.add(user)
+        db.commit()
+        inbox = db.query(models.Group).filter_by(user_id=user.id).first()
+        db.add_all(models.Task(title=f"Task {i}", user_id=user.id, group_id=inbox.id) for i in range(50))
+        db.commit()
+    return auth.create_access_token(data={"sub": "bench"})
+
+async def timed_read(client, token):
+    start = time.perf_counter()
+    resp = await client.get("/tasks/", headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 200
+    return (time.perf_counter() - start) * 1000
+
+def summary(timings):
+    q = statistics.quantiles(timings, n=100)
+    return f"p50 {q[49]:8.2f} ms   p95 {q[94]:8.2f} ms   max {max(timings):8.2f} ms"
+
+async def run(app, token):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        idle = [await timed_read(client, token) for _ in range(READS)]
+
+        async def login():
+            resp = await client.post("/auth/login", data={"username": "bench", "password": PASSWORD})
+            assert resp.status_code == 200
+
+        # Reads arrive at a steady rate for as long as the storm lasts
+        storm = asyncio.ensure_future(asyncio.gather(*(login() for _ in range(LOGINS))))
+        reads = []
+        while not storm.done():
+            reads.append(asyncio.ensure_future(timed_read(client, token)))
+            await asyncio.sleep(READ_INTERVAL)
+        await storm
+        busy = await asyncio.gather(*reads)
+        return idle, busy
+
+async def benchmark():
+    print(f"⏱️ Starting Login Storm Benchmark ({LOGINS} concurrent logins, bcrypt cost {auth.settings.BCRYPT_ROUNDS})...")
+    token = seed()
+
+    print("🏃 Testing inline bcrypt on the shared threadpool...")
+    before = await run(build_app(legacy=True), token)
+    print("🚀 Testing dedicated bcrypt pool...")
+    after = await run(build_app(legacy=False), token)
+
+    print("\n" + "="*72)
+    print("🏁 BENCHMARK RESULTS (GET /tasks/ latency)")
+    print("="*72)
+    print(f"Inline  idle:        {summary(before[0])}")
+    print(f"Inline  login storm: {summary(before[1])}")
+    print(f"Pool    idle:        {summary(after[0])}")
+    print(f"Pool    login storm: {summary(after[1])}")
+    print("-"*72)
+    print("💡 Note: inline hashing holds Starlette's 40 threadpool slots, so reads")
+    print(f"   queue behind logins. The pool caps bcrypt at BCRYPT_WORKERS={auth.settings.BCRYPT_WORKERS}")
+    print(f"   and leaves the threadpool free ({os.cpu_count()} CPU(s) on this machine).")
+    print("="*72)
+
+if __name__ == "__main__":
+    asyncio.run(benchmark())
@@ -0,0 +1,99 @@
+import os
+import sys
+import time
+import asyncio
+import logging
+import statistics
+import tempfile
+from pathlib import Path
+
+# Runs fully offline: no database, the app is driven in-process
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/todo_benchmark.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("GROQ_API_KEY", "unused")
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.middleware.metrics_middleware import MetricsMiddleware
+from app.utils import metrics
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+OBSERVATIONS = 1_000_000  # Direct histogram observations
+REQUESTS = 5000           # Requests per app
+ROUNDS = 5                # We report the median round
+
+def observe_ns() -> float:
+    histogram = metrics.Histogram("bench_seconds", "Benchmark.", ("method", "route", "status"))
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for i in range(OBSERVATIONS):
+            histogram.observe(0.012, "GET", "/tasks/", "200")
+        timings.append((time.perf_counter() - start) / OBSERVATIONS * 1e9)
+    return statistics.median(timings)
+
+class SendWrapper:
+    """A middleware that only wraps send(), like MetricsMiddleware minus the recording."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        async def wrapped(message):
+            await send(message)
+        await self.app(scope, receive, wrapped)
+
+def build_app(middleware=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/tasks/{id}")
+    async def task(id: int):
+        return {"id": id}
+
+    if middleware:
+        app.add_middleware(middleware)
+    return app
+
+async def us_per_request(apps) -> list:
+    # Rounds alternate between the apps, so drift (CPU frequency, GC) hits both alike
+    timings = [[] for _ in apps]
+    clients = [AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") for app in apps]
+    for _ in range(ROUNDS):
+        for client, app_timings in zip(clients, timings):
+            start = time.perf_counter()
+            for i in range(REQUESTS):
+                await client.get(f"/tasks/{i}")
+            app_timings.append((time.perf_counter() - start) / REQUESTS * 1e6)
+    for client in clients:
+        await client.aclose()
+    return [statistics.median(app_timings) for app_timings in timings]
+
+async def benchmark():
+    print(f"⏱️ Starting Metrics Overhead Benchmark ({OBSERVATIONS:,} observations, {REQUESTS} requests x {ROUNDS} rounds)...")
+    per_observation = observe_ns()
+    print("🏃 Testing a bare app, a send() wrapper and MetricsMiddleware...")
+    bare, wrapped, instrumented = await us_per_request([build_app(), build_app(SendWrapper), build_app(MetricsMiddleware)])
+    metrics.registry.render()  # the first render pays for anyio's lazy imports
+    scrape_start = time.perf_counter()
+    metrics.registry.render()
+    scrape_ms = (time.perf_counter() - scrape_start) * 1000
+
+    print("\n" + "="*50)
+    print("🏁 BENCHMARK RESULTS (median round)")
+    print("="*50)
+    print(f"Histogram.observe():    {per_observation:8.0f} ns")
+    print(f"Request, bare app:      {bare:8.1f} µs")
+    print(f"Request, send wrapper:  {wrapped:8.1f} µs")
+    print(f"Request, instrumented:  {instrumented:8.1f} µs")
+    print("-"*50)
+    print(f"Recording, per request: {instrumented - wrapped:8.1f} µs (vs the send wrapper)")
+    print(f"One /metrics render:    {scrape_ms:8.2f} ms")
+    print("💡 Note: request timings under ASGITransport drift by tens of µs between")
+    print("   runs; what recording adds is ~one observe() plus two perf_counter() calls.")
+    print("="*50)
+
+if __name__ == "__main__":
+    asyncio.run(benchmark())
@@ -0,0 +1,177 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import platform
+import tempfile
+from datetime import datetime, UTC
+from pathlib import Path
+
+# Runs fully offline: builds a generated dataset and drives the app in-process.
+# The suite drops and recreates every table, so it never reads DATABASE_URL;
+# point BENCHMARK_DATABASE_URL at a scratch local Postgres to use one instead
+# of the default throwaway SQLite file.
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+os.environ["DATABASE_URL"] = os.environ.get(
+    "BENCHMARK_DATABASE_URL", f"sqlite:///{tempfile.gettempdir()}/todo_benchmark_suite.db"
+)
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("GROQ_API_KEY", "unused")
+os.environ.setdefault("BCRYPT_ROUNDS", "10")       # keeps /auth/login runs short; compare like with like
+os.environ.setdefault("BCRYPT_MAX_QUEUE", "1000")  # measure queuing, not 503s
+os.environ.setdefault("ENV", "production")          # the production middleware stack (no per-request logging)
+
+from httpx import ASGITransport, AsyncClient
+from app.config.database import engine
+from app.main import app
+from app.utils import auth, read_cache
+from generate_data import PASSWORD, generate
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# name -> (method, path, requests per run relative to --requests)
+ENDPOINTS = {
+    "GET /tasks/": ("GET", "/tasks/?limit=50", 1.0),
+    "GET /tasks/suggestions": ("GET", "/tasks/suggestions", 1.0),
+    "GET /groups/": ("GET", "/groups/", 1.0),
+    "POST /auth/login": ("POST", "/auth/login", 0.1),  # bcrypt-bound on purpose
+}
+
+# --- MEASUREMENT ---
+
+def percentile(sorted_ms, p: float) -> float:
+    index = min(len(sorted_ms) - 1, max(0, round(p / 100 * len(sorted_ms)) - 1))
+    return sorted_ms[index]
+
+async def run_endpoint(client, name: str, requests: int, concurrency: int, users: int) -> dict:
+    method, path, _ = ENDPOINTS[name]
+    tokens = {}
+    semaphore = asyncio.Semaphore(concurrency)
+    timings, errors = [], 0
+
+    async def one(i):
+        nonlocal errors
+        u = i % users + 1
+        async with semaphore:
+            if method == "POST":
+                kwargs = {"data": {"username": f"user_{u}", "password": PASSWORD}}
+            else:
+                token = tokens.get(u) or tokens.setdefault(u, auth.create_access_token(data={"sub": f"user_{u}"}))
+                kwargs = {"headers": {"Authorization": f"Bearer {token}"}}
+            start = time.perf_counter()
+            resp = await client.request(method, path, **kwargs)
+            timings.append((time.perf_counter() - start) * 1000)
+            if resp.status_code >= 400:
+                errors += 1
+
+    await asyncio.gather(*(one(i) for i in range(min(requests, 20))))  # warm-up
+    timings.clear()
+    errors = 0
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    timings.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "p99_ms": round(percentile(timings, 99), 2),
+    }
+
+# --- BASELINE COMPARISON ---
+# A run regresses when an endpoint's p95 grows, or its throughput drops, by
+# more than the threshold (relative to the baseline run).
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    for name, current in results["endpoints"].items():
+        base = baseline.get("endpoints", {}).get(name)
+        if not base:
+            continue
+        p95_change = current["p95_ms"] / base["p95_ms"] - 1
+        rps_change = current["rps"] / base["rps"] - 1
+        failed = p95_change > threshold or rps_change < -threshold
+        print(f"{name:<26} p95 {base['p95_ms']:8.2f} -> {current['p95_ms']:8.2f} ms ({p95_change:+6.1%})  "
+              f"rps {base['rps']:7.1f} -> {current['rps']:7.1f} ({rps_change:+6.1%})  {'❌' if failed else '✅'}")
+        if failed:
+            regressions.append(name)
+    return regressions
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="In-process endpoint benchmarks with baseline regression gates")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--groups", type=int, default=4, help="groups per user, Inbox included")
+    parser.add_argument("--tasks", type=int, default=200, help="tasks per user")
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint (login runs a tenth)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--endpoints", nargs="*", choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--read-cache", action="store_true", help="turn the local read cache on (off: every request renders)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare against a previous --output file")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative regression (0.15 = 15%%)")
+    return parser.parse_args()
+
+async def benchmark(args) -> int:
+    print(f"⏱️ Starting Endpoint Benchmark Suite ({args.users:,} users x {args.groups} groups x "
+          f"{args.tasks:,} tasks, {engine.dialect.name})...")
+    start = time.perf_counter()
+    generate(engine.url.render_as_string(hide_password=False), args.users, args.groups, args.tasks,
+             args.seed, reset=True, verbose=False)
+    print(f"🌱 Dataset built in {time.perf_counter() - start:.1f}s")
+    # An empty LRU keeps nothing; with --read-cache, a single-process-sized one
+    read_cache.use_backend(read_cache.LocalBackend(10_000, 300) if args.read_cache else read_cache.LocalBackend(0, 0))
+
+    # The full app from main.py: its middleware (auth, compression, query stats,
+    # metrics...) is part of what a regression can come from
+    results = {
+        "meta": {
+            "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+            "database": engine.dialect.name, "python": platform.python_version(),
+            "users": args.users, "groups": args.groups, "tasks": args.tasks,
+            "concurrency": args.concurrency, "read_cache": args.read_cache,
+            "bcrypt_rounds": auth.settings.BCRYPT_ROUNDS,
+        },
+        "endpoints": {},
+    }
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        for name in args.endpoints:
+            requests = max(1, int(args.requests * ENDPOINTS[name][2]))
+            print(f"🏃 {name} ({requests} requests)...")
+            results["endpoints"][name] = await run_endpoint(client, name, requests, args.concurrency, args.users)
+
+    print("\n" + "="*80)
+    print(f"🏁 BENCHMARK RESULTS ({args.concurrency} in flight)")
+    print("="*80)
+    print(f"{'endpoint':<26}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'errors':>8}")
+    for name, stats in results["endpoints"].items():
+        print(f"{name:<26}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+              f"{stats['rps']:>10.1f}{stats['errors']:>8}")
+    print("="*80)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"💾 Results saved to {args.output}")
+
+    failed = any(stats["errors"] for stats in results["endpoints"].values())
+    if args.baseline:
+        print(f"\n📊 Against {args.baseline} (threshold {args.threshold:.0%}):")
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("meta", {}).get("database") != results["meta"]["database"]:
+            print("⚠️ Baseline was recorded on a different database; the comparison is indicative only.")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"❌ Regressed: {', '.join(regressions)}")
+            failed = True
+        else:
+            print("✅ No regressions")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(benchmark(parse_args())))
@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 import pytest
@@ -10,11 +11,15 @@ from httpx import ASGITransport, AsyncClient
 # Add project root to path
 project_root = Path(__file__).resolve().parent.parent
 sys.path.append(str(project_root))
+# Routes that exceed their @query_budget fail the test instead of logging
+os.environ.setdefault("QUERY_BUDGET_ENFORCE", "true")
+# Off by default (per-process); the tests run one process and cover the cache paths
+os.environ.setdefault("READ_CACHE_MAX_SIZE", "10000")
 
 from app.config.database import Base, get_db
 from app.main import app
 from app.models import model as models
-from app.utils import auth
+from app.utils import auth, query_stats, read_cache, slow_queries
 
 # 1. Setup in-memory SQLite
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -32,6 +37,9 @@ def set_sqlite_pragma(dbapi_connection, item):
     cursor.execute("PRAGMA foreign_keys=ON")
     cursor.close()
 
+query_stats.instrument_engine(engine)
+slow_queries.instrument_engine(engine)
+
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 @pytest.fixture(scope="session")
@@ -40,6 +48,9 @@ def anyio_backend():
 
 @pytest.fixture(scope="function")
 def db():
+    # Tables are recreated per test, so ids (and usernames) get reused
+    auth.user_cache.clear()
+    read_cache.clear()
     Base.metadata.create_all(bind=engine)
     session = TestingSessionLocal()
     try:
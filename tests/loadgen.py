@@ -0,0 +1,270 @@
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import itertools
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+# Mixed-workload load generator for a running server (unlike the in-process
+# benchmarks, this goes through uvicorn/hypercorn, the pool and the threadpool
+# for real). Each virtual user loops over a weighted mix of operations on one
+# account; a sampler polls /db-status for pool and threadpool saturation.
+# Accounts come from generate_data.py (user_1..user_N, password123):
+#
+#   python generate_data.py --users 1000 --reset
+#   hypercorn app.main:app --bind 0.0.0.0:8000
+#   python tests/loadgen.py --accounts 1000 --concurrency 8 16 32 64 128 --duration 30
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from seed import TASK_POOL, CATEGORIES
+
+PASSWORD = "password123"
+# Operation -> weight; override with --mix login=1,list=40,...
+DEFAULT_MIX = {"login": 2, "list": 40, "create": 15, "toggle": 20, "suggestions": 15, "delete": 8}
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+
+
+@dataclass
+class Account:
+    username: str
+    token: Optional[str] = None
+    group_ids: List[int] = field(default_factory=list)
+    task_ids: List[int] = field(default_factory=list)
+    completed: Dict[int, bool] = field(default_factory=dict)
+
+
+@dataclass
+class Recorder:
+    """Latencies and errors per operation, for the whole step and per interval."""
+    timings: Dict[str, List[float]] = field(default_factory=dict)
+    errors: Dict[str, int] = field(default_factory=dict)
+    interval: List[float] = field(default_factory=list)
+    interval_errors: int = 0
+
+    def record(self, op: str, ms: float, ok: bool):
+        self.timings.setdefault(op, []).append(ms)
+        self.interval.append(ms)
+        if not ok:
+            self.errors[op] = self.errors.get(op, 0) + 1
+            self.interval_errors += 1
+
+    def take_interval(self):
+        timings, errors = self.interval, self.interval_errors
+        self.interval, self.interval_errors = [], 0
+        return timings, errors
+
+
+class Workload:
+    def __init__(self, client: httpx.AsyncClient, accounts: List[Account], mix: Dict[str, int], rng: random.Random):
+        self.client = client
+        self.accounts = accounts
+        self.ops = list(mix)
+        self.weights = list(mix.values())
+        self.rng = rng
+        self.counter = itertools.count()
+        self.recorder = Recorder()
+
+    async def call(self, op: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            resp = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            resp = None
+        self.recorder.record(op, (time.perf_counter() - start) * 1000, resp is not None and resp.status_code < 400)
+        return resp
+
+    def auth(self, account: Account) -> dict:
+        return {"Authorization": f"Bearer {account.token}"}
+
+    async def login(self, account: Account):
+        resp = await self.call("login", "POST", "/auth/login", data={"username": account.username, "password": PASSWORD})
+        if resp is not None and resp.status_code == 200:
+            account.token = resp.json()["access_token"]
+
+    async def list(self, account: Account):
+        resp = await self.call("list", "GET", "/tasks/", params={"limit": 50}, headers=self.auth(account))
+        if resp is not None and resp.status_code == 200:
+            tasks = resp.json()
+            account.task_ids = [task["id"] for task in tasks]
+            account.completed = {task["id"]: task["is_completed"] for task in tasks}
+
+    async def create(self, account: Account):
+        if not account.group_ids:
+            resp = await self.call("groups", "GET", "/groups/", headers=self.auth(account))
+            if resp is None or resp.status_code != 200:
+                return
+            account.group_ids = [group["id"] for group in resp.json()]
+        item = self.rng.choice(TASK_POOL[self.rng.choice(CATEGORIES)])
+        resp = await self.call("create", "POST", "/tasks/", headers=self.auth(account), json={
+            "title": f"{item['title']} (load {next(self.counter)})", "description": item["description"],
+            "group_id": self.rng.choice(account.group_ids),
+        })
+        if resp is not None and resp.status_code == 201:
+            account.task_ids.append(resp.json()["id"])
+
+    async def toggle(self, account: Account):
+        if not account.task_ids:
+            return await self.list(account)
+        task_id = self.rng.choice(account.task_ids)
+        done = not account.completed.get(task_id, False)
+        resp = await self.call("toggle", "PUT", f"/tasks/{task_id}", headers=self.auth(account), json={"is_completed": done})
+        if resp is not None and resp.status_code == 200:
+            account.completed[task_id] = done
+
+    async def suggestions(self, account: Account):
+        await self.call("suggestions", "GET", "/tasks/suggestions", headers=self.auth(account))
+
+    async def delete(self, account: Account):
+        if not account.task_ids:
+            return await self.list(account)
+        task_id = account.task_ids.pop(self.rng.randrange(len(account.task_ids)))
+        await self.call("delete", "DELETE", f"/tasks/{task_id}", headers=self.auth(account))
+
+    async def virtual_user(self, deadline: float):
+        while time.perf_counter() < deadline:
+            account = self.rng.choice(self.accounts)
+            op = "login" if account.token is None else self.rng.choices(self.ops, self.weights)[0]
+            await getattr(self, op)(account)
+
+
+async def sample(client: httpx.AsyncClient, workload: Workload, interval: float, deadline: float, series: list):
+    started = time.perf_counter()
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(interval)
+        timings, errors = workload.recorder.take_interval()
+        point = {
+            "t": round(time.perf_counter() - started, 1), "rps": round(len(timings) / interval, 1),
+            "p95_ms": round(percentile(timings, 95), 1), "errors": errors,
+        }
+        try:
+            status = (await client.get("/db-status")).json()
+            point["pool"], point["threadpool"] = status.get("pool", {}), status.get("threadpool", {})
+        except (httpx.HTTPError, ValueError):
+            point["pool"], point["threadpool"] = {}, {}
+        series.append(point)
+        pool, threads = point["pool"], point["threadpool"]
+        print(f"   t={point['t']:>5}s  {point['rps']:>7.1f} req/s  p95 {point['p95_ms']:>7.1f} ms  "
+              f"errors {errors:>3}  pool {pool.get('checked_out', '?')}/{pool.get('size', '?')}"
+              f"+{pool.get('overflow', '?')}  threads {threads.get('busy', '?')}/{threads.get('total', '?')}"
+              f" (waiting {threads.get('waiting', '?')})")
+
+async def run_step(args, accounts: List[Account], concurrency: int, rng: random.Random) -> dict:
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        workload = Workload(client, accounts, args.mix, rng)
+        deadline = time.perf_counter() + args.duration
+        series = []
+        start = time.perf_counter()
+        await asyncio.gather(
+            sample(client, workload, args.interval, deadline, series),
+            *(workload.virtual_user(deadline) for _ in range(concurrency)),
+        )
+        elapsed = time.perf_counter() - start
+
+    recorder = workload.recorder
+    requests = sum(len(timings) for timings in recorder.timings.values())
+    all_timings = list(itertools.chain.from_iterable(recorder.timings.values()))
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(all_timings, 50), 1),
+        "p95_ms": round(percentile(all_timings, 95), 1),
+        "p99_ms": round(percentile(all_timings, 99), 1),
+        "error_rate": round(sum(recorder.errors.values()) / max(requests, 1), 4),
+        "peak_pool_checked_out": max((p["pool"].get("checked_out", 0) for p in series), default=0),
+        "peak_threadpool_waiting": max((p["threadpool"].get("waiting", 0) for p in series), default=0),
+        "operations": {
+            op: {
+                "requests": len(timings), "rps": round(len(timings) / elapsed, 1),
+                "p50_ms": round(percentile(timings, 50), 1), "p95_ms": round(percentile(timings, 95), 1),
+                "p99_ms": round(percentile(timings, 99), 1),
+                "error_rate": round(recorder.errors.get(op, 0) / len(timings), 4),
+            }
+            for op, timings in sorted(recorder.timings.items())
+        },
+        "series": series,
+    }
+
+def knee(steps: List[dict]) -> Optional[dict]:
+    # The last step whose extra concurrency still bought >10% throughput;
+    # past it, more clients mostly add queueing (latency) instead of work
+    best = steps[0] if steps else None
+    for previous, step in zip(steps, steps[1:]):
+        if step["rps"] < previous["rps"] * 1.10:
+            break
+        best = step
+    return best
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for item in value.split(","):
+        op, _, weight = item.partition("=")
+        if op.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown operation '{op}' (known: {', '.join(DEFAULT_MIX)})")
+        mix[op.strip()] = int(weight)
+    return mix
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replay a mixed workload against a running server")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--accounts", type=int, default=100, help="use user_1..user_N (see generate_data.py)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 16, 32, 64],
+                        help="virtual users; several values run one step each, to find the knee")
+    parser.add_argument("--duration", type=float, default=30, help="seconds per step")
+    parser.add_argument("--interval", type=float, default=2, help="seconds between samples")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="e.g. login=1,list=40,create=15")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="write every step (with its time series) as JSON")
+    return parser.parse_args()
+
+async def main(args):
+    rng = random.Random(args.seed)
+    accounts = [Account(f"user_{i}") for i in range(1, args.accounts + 1)]
+    mix = ", ".join(f"{op}={weight}" for op, weight in args.mix.items())
+    print(f"⏱️ Starting Mixed Load ({args.base_url}, {args.accounts} accounts, {args.duration:g}s per step; {mix})...")
+
+    steps = []
+    for concurrency in args.concurrency:
+        print(f"\n🏃 {concurrency} virtual users...")
+        step = await run_step(args, accounts, concurrency, rng)
+        steps.append(step)
+        print(f"{'operation':<14}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}")
+        for op, stats in step["operations"].items():
+            print(f"{op:<14}{stats['rps']:>9.1f}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+                  f"{stats['p99_ms']:>10.1f}{stats['error_rate']:>9.1%}")
+
+    print("\n" + "="*78)
+    print("🏁 LOAD RESULTS (all operations)")
+    print("="*78)
+    print(f"{'users':>6}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}{'pool peak':>11}{'thr. wait':>11}")
+    for step in steps:
+        print(f"{step['concurrency']:>6}{step['rps']:>9.1f}{step['p50_ms']:>10.1f}{step['p95_ms']:>10.1f}"
+              f"{step['p99_ms']:>10.1f}{step['error_rate']:>9.1%}{step['peak_pool_checked_out']:>11}"
+              f"{step['peak_threadpool_waiting']:>11}")
+    print("-"*78)
+    best = knee(steps)
+    if best and len(steps) > 1:
+        print(f"Knee: ~{best['concurrency']} virtual users ({best['rps']:.1f} req/s, p95 {best['p95_ms']:.1f} ms)")
+    print("💡 Note: pool peak counts checked-out connections (pool_size=10 + max_overflow=20);")
+    print("   threads waiting > 0 means sync routes queued for the default threadpool.")
+    print("="*78)
+
+    if args.output:
+        args.output.write_text(json.dumps({"mix": args.mix, "steps": steps}, indent=2) + "\n")
+        print(f"💾 Results saved to {args.output}")
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
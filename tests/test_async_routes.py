@@ -0,0 +1,91 @@
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+from httpx import ASGITransport, AsyncClient
+
+pytest.importorskip("aiosqlite")
+
+from app.config.database import Base, get_async_db
+from app.main import include_routers, with_async_routes
+from app.routers import tasks, tasks_async
+from app.utils import auth, read_cache
+
+
+@pytest.fixture(scope="function")
+async def async_client():
+    """A client for an app built with DB_ASYNC routes on in-memory aiosqlite"""
+    auth.user_cache.clear()
+    read_cache.clear()
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, item):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with SessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+    include_routers(app, async_db=True)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+    await engine.dispose()
+
+
+def test_async_routes_replace_sync_routes_in_place():
+    merged = with_async_routes(tasks.router, tasks_async.router)
+    by_key = {(r.path, frozenset(r.methods)): r for r in merged.routes}
+    assert by_key[("/tasks/", frozenset({"GET"}))].endpoint is tasks_async.get_tasks
+
+    # No duplicates, and the literal path still precedes the {id} route
+    assert len(by_key) == len(merged.routes) == len(tasks.router.routes)
+    paths = [r.path for r in merged.routes]
+    assert paths.index("/tasks/suggestions") < paths.index("/tasks/{id}")
+
+
+async def test_async_task_lifecycle(async_client):
+    reg = await async_client.post("/auth/register", json={
+        "email": "async@example.com", "username": "asyncuser", "password": "password123"
+    })
+    assert reg.status_code == 200
+    login = await async_client.post("/auth/login", data={"username": "asyncuser", "password": "password123"})
+    assert login.status_code == 200
+    async_client.headers["Authorization"] = f"Bearer {login.json()['access_token']}"
+
+    group = await async_client.post("/groups/", json={"name": "Work"})
+    assert group.status_code == 200
+    group_id = group.json()["id"]
+    assert {g["name"] for g in (await async_client.get("/groups/")).json()} == {"Inbox", "Work"}
+
+    for i in range(3):
+        resp = await async_client.post("/tasks/", json={"title": f"Finish {i}", "group_id": group_id})
+        assert resp.status_code == 201
+        assert resp.json()["group"]["name"] == "Work"
+
+    page = await async_client.get("/tasks/", params={"limit": 2})
+    assert [t["title"] for t in page.json()] == ["Finish 0", "Finish 1"]
+    rest = await async_client.get("/tasks/", params={"limit": 2, "cursor": page.headers["X-Next-Cursor"]})
+    assert [t["title"] for t in rest.json()] == ["Finish 2"]
+
+    task_id = page.json()[0]["id"]
+    tag = (await async_client.get(f"/tasks/{task_id}")).headers["ETag"]
+    assert (await async_client.get(f"/tasks/{task_id}", headers={"If-None-Match": tag})).status_code == 304
+    updated = await async_client.put(f"/tasks/{task_id}", json={"is_completed": True})
+    assert updated.json()["is_completed"] is True
+    assert (await async_client.get(f"/tasks/{task_id}", headers={"If-None-Match": tag})).status_code == 200
+
+    suggestions = await async_client.get("/tasks/suggestions")
+    assert suggestions.json()["active_tasks"] == 2
+
+    assert (await async_client.delete(f"/tasks/{task_id}")).status_code == 200
+    assert (await async_client.get(f"/tasks/{task_id}")).status_code == 404
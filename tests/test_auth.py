@@ -37,4 +37,61 @@ async def test_register(client):
         "username": "tester",
         "password": "password123"
     })
-    assert response.status_code == 200
\ No newline at end of file
+    assert response.status_code == 200
+
+async def test_current_user_is_cached_and_invalidated(auth_client, db):
+    from app.utils import auth
+
+    await auth_client.get("/groups/")
+    hits = auth.user_cache.stats()["hits"]
+    await auth_client.get("/groups/")
+    assert auth.user_cache.stats()["hits"] == hits + 1
+    assert isinstance(auth.user_cache.get("testuser"), auth.CurrentUser)
+
+    # Changing the user must evict the stale snapshot
+    auth_client.user.email = "changed@example.com"
+    db.commit()
+    assert auth.user_cache.get("testuser") is None
+
+
+def test_verified_token_cache():
+    from datetime import timedelta
+    from fastapi import HTTPException
+    from app.utils import auth
+
+    token = auth.create_access_token(data={"sub": "cached"}, expires_delta=timedelta(minutes=5))
+    assert auth.decode_jwt_token(token)["sub"] == "cached"
+    hits = auth.token_cache.stats()["hits"]
+    assert auth.decode_jwt_token(token)["sub"] == "cached"
+    assert auth.token_cache.stats()["hits"] == hits + 1
+
+    # A tampered signature is a different cache key and must still be rejected
+    with pytest.raises(HTTPException):
+        auth.decode_jwt_token(token[:-2] + ("AA" if not token.endswith("AA") else "BB"))
+
+
+async def test_login_upgrades_hash_when_cost_changes(client, db, monkeypatch):
+    import bcrypt
+    from app.config.config import settings
+    from app.models import model as models
+
+    old_hash = bcrypt.hashpw(b"password123", bcrypt.gensalt(rounds=4)).decode()
+    db.add(models.User(username="legacy", email="legacy@example.com", password_hash=old_hash))
+    db.commit()
+
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+    resp = await client.post("/auth/login", data={"username": "legacy", "password": "password123"})
+    assert resp.status_code == 200
+
+    user = db.query(models.User).filter_by(username="legacy").one()
+    db.refresh(user)
+    assert user.password_hash.split("$")[2] == "05"
+    assert bcrypt.checkpw(b"password123", user.password_hash.encode())
+
+
+def test_admin_exclusion_is_limited_to_the_admin_subtree():
+    from app.middleware.authentication_middleware import AuthenticationMiddleware
+
+    middleware = AuthenticationMiddleware(app=None)
+    assert middleware.is_excluded("/admin") and middleware.is_excluded("/admin/slow-queries")
+    assert not middleware.is_excluded("/administrators") and not middleware.is_excluded("/admin-export")
@@ -0,0 +1,103 @@
+import json
+import os
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from app.middleware.compression_middleware import CODECS, CompressionMiddleware, compression, negotiate
+
+BODY = json.dumps([{"id": i, "title": f"Task {i}", "is_completed": False} for i in range(200)])
+RANDOM = os.urandom(2000)
+
+def make_app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/json")
+    def whole():
+        return Response(BODY, media_type="application/json")
+
+    @app.get("/small")
+    def small():
+        return Response("x" * 100, media_type="application/json")
+
+    @app.get("/png")
+    def png():
+        return Response(b"\x89PNG" + b"\0" * 5000, media_type="image/png")
+
+    @app.get("/random")
+    def random():
+        return Response(RANDOM, media_type="text/plain")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((line + "\n" for line in BODY.split(",")), media_type="application/x-ndjson")
+
+    @app.get("/opted-out")
+    @compression(enabled=False)
+    def opted_out():
+        return Response(BODY, media_type="application/json")
+
+    @app.get("/eager")
+    @compression(minimum_size=0, levels={"gzip": 1})
+    def eager():
+        return Response("x" * 100, media_type="application/json")
+    return app
+
+
+def test_negotiate():
+    available = list(CODECS)
+    assert negotiate("") is None and negotiate("identity") is None
+    assert negotiate("gzip, deflate").name == "gzip"
+    assert negotiate("gzip;q=1, *;q=0.5").name == "gzip"
+    assert negotiate("gzip;q=0, deflate") is None
+    assert negotiate("*").name == available[0]
+    # Equal q-values fall back to the server's order (zstd, br, gzip)
+    assert negotiate("gzip, br, zstd").name == available[0]
+    if "br" in CODECS:
+        assert negotiate("gzip;q=0.5, br;q=0.8").name == "br"
+
+
+async def get(app, url, accept):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get(url, headers={"Accept-Encoding": accept})
+
+
+@pytest.mark.parametrize("codec", list(CODECS))
+async def test_whole_and_streamed_bodies_round_trip(codec):
+    app = make_app()
+    for url, body in [("/json", BODY), ("/stream", BODY.replace(",", "\n") + "\n")]:
+        resp = await get(app, url, codec)
+        assert resp.headers["content-encoding"] == codec
+        assert "Accept-Encoding" in resp.headers["vary"]
+        assert resp.text == body  # httpx decodes all three
+    # Buffered bodies get a real Content-Length, streamed ones stay chunked
+    resp = await get(app, "/json", codec)
+    assert int(resp.headers["content-length"]) < len(BODY)
+    assert "content-length" not in (await get(app, "/stream", codec)).headers
+
+
+async def test_skips_what_should_not_be_compressed():
+    app = make_app()
+    assert "content-encoding" not in (await get(app, "/json", "identity")).headers
+    assert "content-encoding" not in (await get(app, "/small", "gzip")).headers
+    assert "content-encoding" not in (await get(app, "/png", "gzip")).headers
+    assert "content-encoding" not in (await get(app, "/opted-out", "gzip")).headers
+
+    # Per-route threshold and level
+    resp = await get(app, "/eager", "gzip")
+    assert resp.headers["content-encoding"] == "gzip" and resp.text == "x" * 100
+
+
+async def test_incompressible_body_is_sent_as_is():
+    # Random bytes come out of any codec slightly bigger: identity is smaller
+    resp = await get(make_app(), "/random", "gzip")
+    assert "content-encoding" not in resp.headers and resp.content == RANDOM
+
+
+async def test_export_is_stream_compressed(auth_client, db):
+    work = (await auth_client.post("/groups/", json={"name": "Work"})).json()["id"]
+    await auth_client.post("/tasks/bulk", json={"items": [{"title": f"Task {i}", "group_id": work} for i in range(300)]})
+    resp = await auth_client.get("/tasks/export", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip" and "content-length" not in resp.headers
+    assert len(resp.text.splitlines()) == 300
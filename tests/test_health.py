@@ -0,0 +1,9 @@
+async def test_db_status_reports_pool_and_threadpool(client):
+    resp = await client.get("/db-status")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["status"] == "connected"
+    assert {"reads", "users", "tokens"} <= set(body["caches"])
+    assert "class" in body["pool"]
+    threadpool = body["threadpool"]
+    assert threadpool["total"] > 0 and threadpool["waiting"] >= 0
@@ -0,0 +1,36 @@
+from app.config.config import settings
+from app.utils import memory
+
+ADMIN = {"X-Admin-Token": "admin-secret"}
+leak = []
+
+
+async def test_snapshot_diff_and_endpoint_peaks(auth_client, db, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "admin-secret")
+    monkeypatch.setattr(settings, "MEMORY_SAMPLE_RATE", 1.0)
+    assert (await auth_client.post("/admin/memory/snapshots/before", headers=ADMIN)).status_code == 409
+    try:
+        assert (await auth_client.post("/admin/memory/start", headers=ADMIN)).json()["tracing"] is True
+        assert (await auth_client.post("/admin/memory/snapshots/before", headers=ADMIN)).status_code == 201
+
+        leak.extend(bytearray(1000) for _ in range(200))  # ~200 KB held by this line
+        await auth_client.get("/groups/")
+
+        assert (await auth_client.post("/admin/memory/snapshots/after", headers=ADMIN)).status_code == 201
+        resp = await auth_client.get("/admin/memory/diff?base=before&target=after&top=5", headers=ADMIN)
+        assert resp.status_code == 200
+        top = resp.json()["top"][0]
+        assert top["file"].endswith("test_memory.py") and top["size_diff"] >= 200_000
+
+        by_file = (await auth_client.get("/admin/memory/diff?base=before&group_by=filename", headers=ADMIN)).json()
+        assert by_file["target"] == "now" and "line" not in by_file["top"][0]
+        assert [s["name"] for s in memory.list_snapshots()] == ["before", "after"]
+        assert (await auth_client.get("/admin/memory/diff?base=missing", headers=ADMIN)).status_code == 404
+
+        peaks = (await auth_client.get("/admin/memory/endpoints", headers=ADMIN)).json()["endpoints"]
+        groups = next(entry for entry in peaks if entry["route"] == "GET /groups/")
+        assert groups["samples"] == 1 and groups["max_peak_bytes"] > 0
+    finally:
+        leak.clear()
+        memory.stop()
+    assert memory.status()["snapshots"] == []
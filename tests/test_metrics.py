@@ -0,0 +1,46 @@
+import threading
+from app.utils import metrics
+
+
+def test_histogram_shards_add_up_across_threads():
+    histogram = metrics.Histogram("test_seconds", "Test.", ("route",), buckets=(0.1, 1.0))
+
+    def record():
+        for _ in range(1000):
+            histogram.observe(0.05, "/a")
+        histogram.observe(5, "/b")
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    lines = histogram.collect()
+    assert 'test_seconds_bucket{route="/a",le="0.1"} 4000' in lines
+    assert 'test_seconds_bucket{route="/b",le="1.0"} 0' in lines
+    assert 'test_seconds_bucket{route="/b",le="+Inf"} 4' in lines
+    assert 'test_seconds_count{route="/a"} 4000' in lines
+
+
+async def test_metrics_endpoint(auth_client, db, monkeypatch):
+    from app.config.config import settings
+    metrics.registry.reset()
+    task = (await auth_client.post("/tasks/", json={"title": "Report", "group_id": (await auth_client.get("/groups/")).json()[0]["id"]})).json()
+    await auth_client.get(f"/tasks/{task['id']}")
+    await auth_client.get("/tasks/999999")
+
+    # Operator data: hidden without ADMIN_TOKEN, then the token is required
+    assert (await auth_client.get("/metrics")).status_code == 404
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "admin-secret")
+    assert (await auth_client.get("/metrics")).status_code == 403
+    resp = await auth_client.get("/metrics", headers={"X-Admin-Token": "admin-secret"})
+    assert resp.status_code == 200 and resp.headers["content-type"].startswith("text/plain")
+    text = resp.text
+    # Route templates, not raw paths
+    assert 'http_request_duration_seconds_count{method="GET",route="/tasks/{id}",status="200"} 1' in text
+    assert 'http_request_duration_seconds_count{method="GET",route="/tasks/{id}",status="404"} 1' in text
+    assert "/tasks/999999" not in text
+    assert "http_requests_in_flight 1" in text  # the scrape itself
+    for name in ["db_pool_checked_out", "db_pool_checkout_wait_seconds", "threadpool_waiting", "threadpool_total"]:
+        assert f"# TYPE {name} " in text
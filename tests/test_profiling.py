@@ -0,0 +1,62 @@
+import json
+import marshal
+import pstats
+import pytest
+from httpx import ASGITransport, AsyncClient
+from app.config.config import Settings, settings
+from app.main import app
+from app.middleware.profiling_middleware import ProfilingMiddleware
+
+
+ADMIN = {"X-Admin-Token": "admin-secret"}
+
+
+@pytest.fixture(autouse=True)
+def admin_token(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "admin-secret")
+
+
+async def profiled_client(auth_client, **options) -> AsyncClient:
+    # The app as main.py builds it with PROFILING_ENABLED, sharing auth_client's DB override
+    return AsyncClient(
+        transport=ASGITransport(app=ProfilingMiddleware(app, interval=0.0005, **options)),
+        base_url="http://test", headers={**auth_client.headers, **ADMIN},
+    )
+
+
+def test_profiling_requires_an_admin_token():
+    with pytest.raises(ValueError, match="requires ADMIN_TOKEN"):
+        Settings(PROFILING_ENABLED=True, ADMIN_TOKEN=None)
+
+
+async def test_profile_is_returned_as_a_download(auth_client, db):
+    async with await profiled_client(auth_client) as client:
+        # Not flagged: the normal response
+        resp = await client.get("/groups/")
+        assert resp.status_code == 200 and "X-Profile-Status" not in resp.headers
+        # Flagged without the admin token: also the normal response
+        resp = await client.get("/groups/", headers={"X-Profile": "speedscope", "X-Admin-Token": "wrong"})
+        assert isinstance(resp.json(), list) and "X-Profile-Status" not in resp.headers
+
+        resp = await client.get("/tasks/suggestions", headers={"X-Profile": "speedscope"})
+        assert resp.status_code == 200
+        assert resp.headers["X-Profile-Status"] == "200"
+        assert "get-tasks-suggestions.speedscope.json" in resp.headers["Content-Disposition"]
+        profile = resp.json()
+        assert profile["name"] == "GET /tasks/suggestions"
+        assert profile["profiles"][0]["type"] == "sampled" and profile["profiles"][0]["samples"]
+        names = {frame["name"] for frame in profile["shared"]["frames"]}
+        assert "__call__" in names  # the middleware stack, as seen from the event loop
+
+        resp = await client.get("/tasks/?profile=pstats")
+        stats = marshal.loads(resp.content)
+        assert stats and all(len(entry) == 5 for entry in stats.values())
+
+
+async def test_profile_written_to_directory(auth_client, db, tmp_path):
+    async with await profiled_client(auth_client, profile_dir=str(tmp_path)) as client:
+        resp = await client.get("/groups/", headers={"X-Profile": "pstats"})
+    assert resp.status_code == 200 and isinstance(resp.json(), list)
+    path = resp.headers["X-Profile-File"]
+    assert path.endswith("-get-groups.prof")
+    assert pstats.Stats(path).total_tt > 0
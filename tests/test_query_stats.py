@@ -0,0 +1,42 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from app.middleware.query_stats_middleware import QueryStatsMiddleware
+from app.models import model as models
+from app.utils import auth, query_stats, read_cache
+
+
+async def test_query_count_does_not_grow_with_page_size(auth_client, db):
+    work = (await auth_client.post("/groups/", json={"name": "Work"})).json()["id"]
+    await auth_client.post("/tasks/bulk", json={"items": [{"title": f"Task {i}", "group_id": work} for i in range(60)]})
+
+    counts = {}
+    for url in ["/tasks/?limit=1", "/tasks/?limit=60", "/tasks/?limit=60&include=group", "/groups/"]:
+        read_cache.clear()  # a cached page would cost 0 queries
+        auth.user_cache.clear()
+        resp = await auth_client.get(url)
+        assert resp.status_code == 200
+        counts[url] = int(resp.headers["X-DB-Queries"])
+        assert resp.headers["Server-Timing"].startswith("db;dur=")
+    # user lookup + version + page
+    assert set(counts.values()) == {3}
+
+
+async def test_n_plus_one_exceeds_the_budget(auth_client, db):
+    for name in ["Work", "Home", "Errands"]:
+        group = (await auth_client.post("/groups/", json={"name": name})).json()["id"]
+        await auth_client.post("/tasks/", json={"title": f"{name} task", "group_id": group})
+
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, enforce_budgets=True)
+
+    @app.get("/tasks")
+    @query_stats.query_budget(2)
+    def lazy_groups():
+        # Lazy-loads each task's group: one query for the tasks, then one per group
+        db.expunge_all()
+        return [task.group.name for task in db.query(models.Task).all()]
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        with pytest.raises(query_stats.QueryBudgetExceeded, match="budget 2"):
+            await client.get("/tasks")
@@ -0,0 +1,113 @@
+import pytest
+from app.models import model as models
+from app.utils import read_cache
+
+
+class FakeSharedBackend(read_cache.CacheBackend):
+    """Stands in for Redis: plain dicts that several app instances could share"""
+
+    def __init__(self):
+        self.pages, self.generations = {}, {}
+
+    def get(self, key):
+        return self.pages.get(key)
+
+    def set(self, key, page, ttl):
+        self.pages[key] = page
+
+    def generation(self, name):
+        return self.generations.get(name, 0)
+
+    def bump(self, name):
+        self.generations[name] = self.generations.get(name, 0) + 1
+
+    def clear(self):
+        self.pages.clear()
+        self.generations.clear()
+
+
+async def test_reads_are_cached_until_a_write_commits(auth_client, db):
+    work = (await auth_client.post("/groups/", json={"name": "Work"})).json()["id"]
+    task_id = (await auth_client.post("/tasks/", json={"title": "Report", "group_id": work})).json()["id"]
+
+    async def hits_after(url):
+        before = read_cache.stats()["hits"]
+        resp = await auth_client.get(url)
+        assert resp.status_code == 200
+        return read_cache.stats()["hits"] - before, resp
+
+    for url in ["/tasks/", f"/tasks/{task_id}", "/groups/"]:
+        assert (await hits_after(url))[0] == 0
+        hit, resp = await hits_after(url)
+        assert hit == 1 and "ETag" in resp.headers
+
+    # update_task invalidates the task reads but not the groups listing
+    await auth_client.put(f"/tasks/{task_id}", json={"is_completed": True})
+    hit, resp = await hits_after(f"/tasks/{task_id}")
+    assert hit == 0 and resp.json()["is_completed"] is True
+    assert (await hits_after("/groups/"))[0] == 1
+
+    # A group rename invalidates tasks too (they embed the group name)
+    await hits_after("/tasks/")
+    await auth_client.put(f"/groups/{work}", json={"name": "Office"})
+    hit, resp = await hits_after("/tasks/")
+    assert hit == 0 and resp.json()[0]["group"]["name"] == "Office"
+
+    # Bulk DML (no flush) invalidates through do_orm_execute
+    await auth_client.post("/tasks/bulk", json={"items": [{"title": "Slides", "group_id": work}]})
+    hit, resp = await hits_after("/tasks/")
+    assert hit == 0 and len(resp.json()) == 2
+
+    await auth_client.delete(f"/tasks/{task_id}")
+    assert (await auth_client.get(f"/tasks/{task_id}")).status_code == 404
+
+    stats = read_cache.stats()
+    assert stats["hits"] > 0 and 0 < stats["hit_ratio"] < 1 and "evictions" in stats
+
+
+async def test_rollback_does_not_invalidate(auth_client, db):
+    await auth_client.get("/groups/")
+    generation = read_cache.backend.generation(f"groups:{auth_client.user.id}")
+
+    db.add(models.Group(name="Scratch", user_id=auth_client.user.id))
+    db.flush()
+    db.rollback()
+    assert read_cache.backend.generation(f"groups:{auth_client.user.id}") == generation
+
+
+async def test_shared_backend(auth_client, db):
+    shared = FakeSharedBackend()
+    local = read_cache.backend
+    read_cache.use_backend(shared)
+    try:
+        await auth_client.get("/groups/")
+        assert len(shared.pages) == 1
+
+        # Another instance sharing the backend sees this instance's invalidation
+        await auth_client.post("/groups/", json={"name": "Work"})
+        assert shared.generations == {f"groups:{auth_client.user.id}": 1, f"tasks:{auth_client.user.id}": 1}
+        assert {g["name"] for g in (await auth_client.get("/groups/")).json()} == {"Inbox", "Work"}
+    finally:
+        read_cache.use_backend(local)
+
+
+def test_backend_must_implement_every_method():
+    class Incomplete(read_cache.CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_local_generations_are_bounded_and_never_reused():
+    backend = read_cache.LocalBackend(max_size=2, ttl=300)
+    first = backend.generation("tasks:1")
+    backend.bump("tasks:1")
+    bumped = backend.generation("tasks:1")
+    assert bumped != first
+    for user_id in range(2, 10):
+        backend.bump(f"tasks:{user_id}")
+    assert len(backend.generations) == 2
+    # tasks:1 was evicted; its new value can't match a key its old pages used
+    assert backend.generation("tasks:1") not in (first, bumped)
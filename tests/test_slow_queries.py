@@ -0,0 +1,46 @@
+from app.config.config import settings
+from app.utils import slow_queries
+
+
+def test_normalize_collapses_literals_and_lists():
+    a = slow_queries.normalize("SELECT * FROM tasks WHERE owner_id = 7 AND title = 'x''y' AND id IN (1, 2, 3)")
+    b = slow_queries.normalize("SELECT *  FROM tasks\nWHERE owner_id = ? AND title = ? AND id IN (?, ?)")
+    assert a == b == "SELECT * FROM tasks WHERE owner_id = ? AND title = ? AND id IN (...)"
+    assert slow_queries.normalize("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (...), ..."
+    assert slow_queries.parameter_shape({"owner_id": 7, "title": "secret"}) == "{owner_id: int, title: str}"
+
+
+async def test_slow_queries_are_logged_by_route(auth_client, db, monkeypatch):
+    await auth_client.post("/groups/", json={"name": "Work"})
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)  # everything is slow
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN", False)
+    slow_queries.clear()
+    await auth_client.get("/groups/")
+    await auth_client.get("/groups/")
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 200)
+
+    # Disabled until a token is configured, then the token is required
+    assert (await auth_client.get("/admin/slow-queries")).status_code == 404
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "admin-secret")
+    assert (await auth_client.get("/admin/slow-queries", headers={"X-Admin-Token": "wrong"})).status_code == 403
+
+    resp = await auth_client.get("/admin/slow-queries", headers={"X-Admin-Token": "admin-secret"})
+    assert resp.status_code == 200
+    groups = resp.json()["by_fingerprint"]
+    assert any(group["routes"].get("GET /groups/") for group in groups)
+    totals = [group["total_ms"] for group in groups]
+    assert totals == sorted(totals, reverse=True)
+
+    resp = await auth_client.delete("/admin/slow-queries", headers={"X-Admin-Token": "admin-secret"})
+    assert resp.status_code == 204
+    assert slow_queries.by_fingerprint() == []
+
+
+def test_explain_captures_a_plan(db, monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN", True)
+    slow_queries.clear()
+    key = "test"
+    slow_queries._plans[key] = None
+    slow_queries.explain(db.get_bind(), key, "SELECT * FROM tasks WHERE owner_id = ?", (1,))
+    assert "tasks" in slow_queries._plans[key]
+    slow_queries.clear()
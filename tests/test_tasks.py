@@ -1,4 +1,8 @@
 # tests/test_tasks.py
+import csv
+import io
+import json
+
 async def test_create_task(auth_client, db):
     # First create a group (since tasks need group_id)
     group = await auth_client.post("/groups/", json={"name": "Work"})
@@ -10,4 +14,339 @@ async def test_create_task(auth_client, db):
         "group_id": group_id
     })
     assert resp.status_code == 201
-    assert resp.json()["user_id"] == auth_client.user.id
\ No newline at end of file
+    assert resp.json()["user_id"] == auth_client.user.id
+
+async def test_cursor_pagination(auth_client, db):
+    group = await auth_client.post("/groups/", json={"name": "Work"})
+    group_id = group.json()["id"]
+    for i in range(5):
+        await auth_client.post("/tasks/", json={"title": f"Task {i}", "group_id": group_id})
+
+    # Walk every page by following X-Next-Cursor until it disappears
+    titles, cursor = [], None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        resp = await auth_client.get("/tasks/", params=params)
+        assert resp.status_code == 200
+        titles += [t["title"] for t in resp.json()]
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            assert "Link" not in resp.headers
+            break
+        assert 'rel="next"' in resp.headers["Link"]
+
+    assert titles == [f"Task {i}" for i in range(5)]
+
+    bad = await auth_client.get("/tasks/", params={"cursor": "not-a-cursor"})
+    assert bad.status_code == 400
+    from app.utils.pagination import encode_cursor
+    for last_id in [2**63, 10**30, 0, -1]:
+        assert (await auth_client.get("/tasks/", params={"cursor": encode_cursor(last_id)})).status_code == 400
+
+
+def legacy_analyze(tasks):
+    # Reference: the original sort-based implementation
+    keywords = ["finish", "submit", "deadline", "urgent", "important", "review", "bill"]
+    scored, counts = [], {}
+    for task in tasks:
+        score = 0
+        content = (task.title + " " + (task.description or "")).lower()
+        if any(word in content for word in keywords):
+            score += 5
+        group_name = task.group.name if task.group else "General"
+        if group_name in ["Work", "Learning"]:
+            score += 2
+        counts[group_name] = counts.get(group_name, 0) + 1
+        scored.append({"score": score, "title": task.title})
+    scored.sort(key=lambda x: x["score"], reverse=True)
+    return max(counts, key=counts.get), scored[0]["title"]
+
+
+def test_heuristic_matches_legacy_scoring():
+    import random
+    from types import SimpleNamespace
+    from app.routers.tasks import analyze_tasks_heuristically, CATEGORY_TIPS
+
+    rng = random.Random(7)
+    words = ["Submit", "call", "BILL", "run", "Deadline", "read", "gym", "reVIEW", "plan", ""]
+    groups = [SimpleNamespace(name=n) for n in ["Work", "Personal", "Learning", "Shopping", "Misc"]] + [None]
+    for _ in range(200):
+        tasks = [
+            SimpleNamespace(
+                title=f"{rng.choice(words)} task {i}",
+                description=rng.choice([None, "", f"{rng.choice(words)} notes"]),
+                group=rng.choice(groups),
+            )
+            for i in range(rng.randint(1, 12))
+        ]
+        dominant, top = legacy_analyze(tasks)
+        tip = analyze_tasks_heuristically(tasks)
+        assert tip == (
+            f"AI Suggestion: Based on your {dominant} focus, "
+            f"{CATEGORY_TIPS.get(dominant, 'Keep up the great work!')} "
+            f"I recommend starting with '{top}' as it appears most critical."
+        )
+
+
+async def test_sql_suggestions_match_python_heuristic(auth_client, db, monkeypatch):
+    from app.config.config import settings
+
+    groups = {}
+    for name in ["Work", "Personal", "Fitness"]:
+        groups[name] = (await auth_client.post("/groups/", json={"name": name})).json()["id"]
+    for title, description, group in [
+        ("Call Home", None, "Personal"),
+        ("Gym", "URGENT physio", "Fitness"),
+        ("Team Standup", "Routine", "Work"),
+        ("Organize Room", "", "Personal"),
+        ("Pay Electricity Bill", "Deadline is today!", "Personal"),
+        ("Submit report", None, "Work"),
+    ]:
+        await auth_client.post("/tasks/", json={"title": title, "description": description, "group_id": groups[group]})
+    done = await auth_client.post("/tasks/", json={"title": "Finish old thing", "group_id": groups["Work"]})
+    await auth_client.put(f"/tasks/{done.json()['id']}", json={"is_completed": True})
+
+    monkeypatch.setattr(settings, "SUGGESTIONS_IN_SQL", True)
+    in_sql = (await auth_client.get("/tasks/suggestions")).json()
+    monkeypatch.setattr(settings, "SUGGESTIONS_IN_SQL", False)
+    in_python = (await auth_client.get("/tasks/suggestions")).json()
+
+    assert in_sql == in_python
+    assert in_sql["active_tasks"] == 6
+    assert "Personal focus" in in_sql["tip"] and "'Submit report'" in in_sql["tip"]
+
+async def test_bulk_create_and_upsert(auth_client, db):
+    work = (await auth_client.post("/groups/", json={"name": "Work"})).json()["id"]
+    await auth_client.post("/tasks/", json={"title": "Existing", "group_id": work})
+
+    resp = await auth_client.post("/tasks/bulk", json={"items": [
+        {"title": "First", "group_id": work},
+        {"title": "   ", "group_id": work},          # invalid
+        {"title": "Foreign", "group_id": 99999},     # group not owned
+        {"title": "First", "group_id": work},        # duplicate within the batch
+        {"title": "Existing", "group_id": work},     # conflicts with a stored task
+        {"title": "Second", "group_id": work, "description": "d"},
+    ]})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [t["title"] for t in body["tasks"]] == ["First", "Second"]
+    assert all(t["group"]["name"] == "Work" for t in body["tasks"])
+    assert [e["index"] for e in body["errors"]] == [1, 2, 3, 4]
+
+    # With upsert the stored task is updated instead of skipped
+    resp = await auth_client.post("/tasks/bulk", json={"upsert": True, "items": [
+        {"title": "Existing", "group_id": work, "description": "updated", "is_completed": True},
+    ]})
+    assert resp.json()["errors"] == []
+    [task] = resp.json()["tasks"]
+    assert task["description"] == "updated" and task["is_completed"] is True
+
+    listed = (await auth_client.get("/tasks/", params={"limit": 100})).json()
+    assert sorted(t["title"] for t in listed) == ["Existing", "First", "Second"]
+
+async def test_export_streams_ndjson_and_csv(auth_client, db):
+    work = (await auth_client.post("/groups/", json={"name": "Work"})).json()["id"]
+    await auth_client.post("/tasks/bulk", json={"items": [
+        {"title": f"Task {i}", "description": "a, \"quoted\"\nline", "group_id": work} for i in range(3)
+    ]})
+
+    resp = await auth_client.get("/tasks/export")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["title"] for r in rows] == ["Task 0", "Task 1", "Task 2"]
+    assert rows[0]["group"] == "Work" and rows[0]["description"] == 'a, "quoted"\nline'
+
+    resp = await auth_client.get("/tasks/export", params={"format": "csv"})
+    assert resp.headers["content-type"].startswith("text/csv")
+    records = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [r["title"] for r in records] == ["Task 0", "Task 1", "Task 2"]
+    assert records[2]["description"] == 'a, "quoted"\nline'
+
+    assert (await auth_client.get("/tasks/export", params={"format": "xml"})).status_code == 422
+
+def test_record_reader_handles_split_chunks():
+    from app.utils.transfer import RecordReader
+
+    body = 'title,description,group\r\nA,"multi\nline, ""quoted""",Work\r\nB,,\r\nbad\r\nC,ü,Home'.encode("utf-8")
+    reader = RecordReader("csv")
+    records = []
+    for i in range(len(body)):  # one byte at a time, splitting lines and characters
+        records += reader.feed(body[i:i + 1])
+    records += reader.feed(b"", final=True)
+
+    assert records == [
+        (0, {"title": "A", "description": 'multi\nline, "quoted"', "group": "Work"}, None),
+        (1, {"title": "B"}, None),
+        (2, None, "Expected 3 columns, got 1"),
+        (3, {"title": "C", "description": "ü", "group": "Home"}, None),
+    ]
+
+def test_record_reader_accepts_cr_line_endings_and_bounds_records():
+    from app.utils.transfer import RecordReader
+
+    # Classic Mac / Excel export: bare \r, split between chunks
+    reader = RecordReader("csv")
+    records = reader.feed(b'title,description\rA,"two\rlines"\r') + reader.feed(b"B,x\r") + reader.feed(b"", final=True)
+    assert records == [(0, {"title": "A", "description": "two\nlines"}, None), (1, {"title": "B", "description": "x"}, None)]
+
+    # An unterminated quote or a line with no end fails once and isn't buffered
+    reader = RecordReader("csv", max_record_size=100)
+    records = reader.feed(b'title\n"open\n') + reader.feed(b"x" * 500) + reader.feed(b"\nB\n", final=True)
+    assert records == [(0, None, "Record exceeds 100 characters"), (1, {"title": "B"}, None)]
+    assert reader.tail == "" and reader.pending == []
+
+    reader = RecordReader("ndjson", max_record_size=100)
+    records = []
+    for _ in range(10):
+        records += reader.feed(b"y" * 100)
+        assert len(reader.tail) <= 100
+    records += reader.feed(b'\n{"title": "C"}\n', final=True)
+    assert records == [(0, None, "Record exceeds 100 characters"), (1, {"title": "C"}, None)]
+
+async def test_import_round_trips_export(auth_client, db, monkeypatch):
+    from app.config.config import settings
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+
+    async def body(lines):
+        for line in lines:
+            yield line.encode("utf-8")
+
+    resp = await auth_client.post("/tasks/import", content=body([
+        '{"title": "Report", "group": "Work", "is_completed": true}\n',
+        '{"title": "Groceries"}\n',                            # no group -> Inbox
+        'not json\n',
+        '{"title": "   ", "group": "Work"}\n',                 # invalid title
+        '{"title": "Report", "group": "Work", "group_id": 7}\n',  # duplicate -> skipped
+    ]))
+    assert resp.status_code == 200
+    summary = resp.json()
+    assert (summary["inserted"], summary["skipped"], summary["failed"]) == (2, 1, 2)
+    assert [e["index"] for e in summary["errors"]] == [2, 3]
+
+    # Export as CSV and import it back: every row already exists
+    exported = (await auth_client.get("/tasks/export", params={"format": "csv"})).text
+    resp = await auth_client.post("/tasks/import", content=exported, headers={"Content-Type": "text/csv"})
+    assert resp.json() == {"inserted": 0, "skipped": 2, "failed": 0, "errors": []}
+
+    tasks = {t["title"]: t for t in (await auth_client.get("/tasks/")).json()}
+    assert tasks["Report"]["group"]["name"] == "Work" and tasks["Report"]["is_completed"] is True
+    assert tasks["Groceries"]["group"]["name"] == "Inbox"
+
+async def test_conditional_get_returns_304_until_data_changes(auth_client, db):
+    work = (await auth_client.post("/groups/", json={"name": "Work"})).json()["id"]
+    task_id = (await auth_client.post("/tasks/", json={"title": "Report", "group_id": work})).json()["id"]
+
+    for url in ["/tasks/", f"/tasks/{task_id}", "/groups/"]:
+        first = await auth_client.get(url)
+        tag = first.headers["ETag"]
+        assert tag.startswith('W/"') and first.headers["Cache-Control"] == "private, no-cache"
+        again = await auth_client.get(url, headers={"If-None-Match": tag})
+        assert again.status_code == 304 and again.content == b"" and again.headers["ETag"] == tag
+
+    tasks_tag = (await auth_client.get("/tasks/")).headers["ETag"]
+    task_tag = (await auth_client.get(f"/tasks/{task_id}")).headers["ETag"]
+    groups_tag = (await auth_client.get("/groups/")).headers["ETag"]
+
+    # Filters are part of the tag
+    filtered = await auth_client.get("/tasks/", params={"completed": False}, headers={"If-None-Match": tasks_tag})
+    assert filtered.status_code == 200
+
+    # An update changes the task and listing tags, immediately
+    await auth_client.put(f"/tasks/{task_id}", json={"is_completed": True})
+    assert (await auth_client.get("/tasks/", headers={"If-None-Match": tasks_tag})).status_code == 200
+    assert (await auth_client.get(f"/tasks/{task_id}", headers={"If-None-Match": task_tag})).status_code == 200
+
+    # Renaming the group changes the groups tag and the embedded group name in tasks
+    tasks_tag = (await auth_client.get("/tasks/")).headers["ETag"]
+    await auth_client.put(f"/groups/{work}", json={"name": "Office"})
+    assert (await auth_client.get("/groups/", headers={"If-None-Match": groups_tag})).status_code == 200
+    resp = await auth_client.get("/tasks/", headers={"If-None-Match": tasks_tag})
+    assert resp.status_code == 200 and resp.json()[0]["group"]["name"] == "Office"
+
+async def test_fast_read_path_is_byte_identical_to_response_model(auth_client, db):
+    from typing import List
+    from fastapi import FastAPI
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy.orm import joinedload
+    from app.models import model as models
+    from app.schemas import groups as group_schemas
+    from app.schemas import tasks as task_schemas
+
+    work = (await auth_client.post("/groups/", json={"name": "Wörk 🚀"})).json()["id"]
+    await auth_client.post("/groups/", json={"name": "Home"})
+    await auth_client.post("/tasks/bulk", json={"items": [
+        {"title": "Täsk \"quoted\" </script>", "description": "naïve\ttab\nline", "group_id": work},
+        {"title": "No description", "group_id": work, "is_completed": True},
+    ]})
+    first = (await auth_client.get("/tasks/")).json()[0]["id"]
+    await auth_client.put(f"/tasks/{first}", json={"is_completed": True})  # sets updated_at
+
+    # BEFORE: FastAPI's own response_model serialization of ORM objects
+    legacy = FastAPI()
+
+    @legacy.get("/tasks/", response_model=List[task_schemas.Task])
+    def legacy_tasks():
+        return db.query(models.Task).options(joinedload(models.Task.group)).order_by(models.Task.id).all()
+
+    @legacy.get("/tasks/{id}", response_model=task_schemas.Task)
+    def legacy_task(id: int):
+        return db.get(models.Task, id)
+
+    @legacy.get("/groups/", response_model=List[group_schemas.Group])
+    def legacy_groups():
+        return db.query(models.Group).all()
+
+    async with AsyncClient(transport=ASGITransport(app=legacy), base_url="http://test") as legacy_client:
+        for url in ["/tasks/", f"/tasks/{first}", "/groups/"]:
+            expected = await legacy_client.get(url)
+            actual = await auth_client.get(url)
+            assert actual.content == expected.content
+            assert actual.headers["content-type"] == expected.headers["content-type"]
+
+
+async def test_sparse_fieldsets_select_only_requested_columns(auth_client, db):
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    work = (await auth_client.post("/groups/", json={"name": "Work"})).json()["id"]
+    task_id = (await auth_client.post("/tasks/", json={"title": "Report", "description": "Long text", "group_id": work})).json()["id"]
+
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(Engine, "before_cursor_execute", capture)
+    try:
+        resp = await auth_client.get("/tasks/?fields=title,id,is_completed")
+    finally:
+        event.remove(Engine, "before_cursor_execute", capture)
+    assert resp.json() == [{"title": "Report", "is_completed": False, "id": task_id}]
+    page_query = next(s for s in statements if "LIMIT" in s)
+    assert "description" not in page_query and "JOIN" not in page_query
+
+    resp = await auth_client.get(f"/tasks/{task_id}?fields=title&include=group")
+    assert resp.json() == {"title": "Report", "group": {"name": "Work"}}
+    assert (await auth_client.get(f"/tasks/{task_id}?fields=group")).json() == {"group": {"name": "Work"}}
+
+    # Different fieldsets are different representations
+    full = await auth_client.get(f"/tasks/{task_id}")
+    assert set(full.json()) == {"title", "description", "is_completed", "group_id", "id", "user_id", "created_at", "updated_at", "group"}
+    assert full.headers["ETag"] != resp.headers["ETag"]
+
+    resp = await auth_client.get("/tasks/?fields=title,password")
+    assert resp.status_code == 400 and "password" in resp.json()["detail"]
+    assert (await auth_client.get("/tasks/?include=user")).status_code == 400
+    for empty in ["", ",", " , ,"]:
+        assert (await auth_client.get("/tasks/", params={"fields": empty})).status_code == 400
+
+async def test_bulk_writes_need_on_conflict_support(auth_client, db, monkeypatch):
+    from app.utils import sql
+
+    monkeypatch.setattr(sql, "UPSERT_INSERTS", {})  # as on a database without ON CONFLICT
+    resp = await auth_client.post("/tasks/bulk", json={"items": [{"title": "A", "group_id": 1}]})
+    assert resp.status_code == 501 and "not supported" in resp.json()["detail"]
+    assert (await auth_client.post("/tasks/import", content=b'{"title": "A"}\n')).status_code == 501
+    # Everything else keeps working
+    assert (await auth_client.get("/tasks/")).status_code == 200